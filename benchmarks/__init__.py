@@ -0,0 +1,7 @@
+"""Microbenchmarks for zigpy hot paths.
+
+The suite runs offline against a fake `ControllerApplication` and a synthetic network:
+
+    python -m benchmarks --devices 200 --json results.json
+    python -m benchmarks --compare results.json
+"""
@@ -0,0 +1,557 @@
+"""Benchmarks of zigpy hot paths."""
+
+from __future__ import annotations
+
+import contextlib
+import itertools
+import pathlib
+import random
+import tempfile
+
+from benchmarks.network import (
+    MANUFACTURERS,
+    MODELS,
+    SyntheticNetwork,
+    make_app,
+    make_node_desc,
+)
+from benchmarks.runner import BenchmarkConfig, benchmark
+import zigpy.appdb
+from zigpy.config import CONF_DATABASE_LAZY_ATTRIBUTES
+from zigpy.const import (
+    SIG_ENDPOINTS,
+    SIG_EP_INPUT,
+    SIG_EP_OUTPUT,
+    SIG_EP_PROFILE,
+    SIG_EP_TYPE,
+    SIG_MODELS_INFO,
+)
+from zigpy.datastructures import Debouncer
+import zigpy.device
+import zigpy.profiles.zha
+import zigpy.quirks
+import zigpy.quirks.registry
+import zigpy.quirks.v2
+import zigpy.types as t
+from zigpy.zcl import ClusterType, foundation
+from zigpy.zcl.clusters.general import Basic, Identify, LevelControl, OnOff, Ota
+from zigpy.zcl.clusters.measurement import TemperatureMeasurement
+import zigpy.zdo.types as zdo_t
+
+
+def _attribute_report(tsn: int, value: int) -> bytes:
+    """Serialized ZCL attribute report of `TemperatureMeasurement.measured_value`."""
+    hdr = foundation.ZCLHeader.general(
+        tsn=tsn,
+        command_id=foundation.GeneralCommand.Report_Attributes,
+        direction=foundation.Direction.Server_to_Client,
+    )
+    report = foundation.GENERAL_COMMANDS[
+        foundation.GeneralCommand.Report_Attributes
+    ].schema(
+        attribute_reports=[
+            foundation.Attribute(
+                attrid=TemperatureMeasurement.AttributeDefs.measured_value.id,
+                value=foundation.TypeValue(
+                    type=foundation.DataTypeId.int16, value=t.int16s(value)
+                ),
+            )
+        ]
+    )
+
+    return hdr.serialize() + report.serialize()
+
+
+def _packets(network: SyntheticNetwork) -> itertools.cycle[t.ZigbeePacket]:
+    """Attribute reports from every device, with payloads unique enough to never be
+    filtered as duplicates.
+    """
+    return itertools.cycle(
+        [
+            t.ZigbeePacket(
+                src=t.AddrModeAddress(addr_mode=t.AddrMode.NWK, address=dev.nwk),
+                src_ep=1,
+                dst=t.AddrModeAddress(addr_mode=t.AddrMode.NWK, address=0x0000),
+                dst_ep=1,
+                tsn=value,
+                profile_id=zigpy.profiles.zha.PROFILE_ID,
+                cluster_id=TemperatureMeasurement.cluster_id,
+                data=t.SerializableBytes(_attribute_report(value, 100 * value)),
+                lqi=200,
+                rssi=-60,
+            )
+            for value in range(256)
+            for dev in network.devices
+        ]
+    )
+
+
+@benchmark("application.packet_received")
+async def application_packet_received(config: BenchmarkConfig):
+    app = make_app()
+    network = SyntheticNetwork.build(app, size=config.devices, seed=config.seed)
+    packets = _packets(network)
+
+    yield lambda: app.packet_received(next(packets))
+
+
+@benchmark("application.packet_received.listeners")
+async def application_packet_received_listeners(config: BenchmarkConfig):
+    app = make_app()
+    network = SyntheticNetwork.build(app, size=config.devices, seed=config.seed)
+    packets = _packets(network)
+
+    with contextlib.ExitStack() as stack:
+        for index in range(config.listeners):
+            dev = network.devices[index % len(network.devices)]
+            stack.enter_context(
+                app.wait_for_response(
+                    dev,
+                    [
+                        Ota.commands_by_name["query_next_image"].schema(
+                            manufacturer_code=index
+                        )
+                    ],
+                )
+            )
+
+        yield lambda: app.packet_received(next(packets))
+
+
+@benchmark("device.packet_received.duplicate_flood")
+async def device_packet_received_duplicate_flood(config: BenchmarkConfig):
+    """A single device repeating a few reports, as a misbehaving device would."""
+    app = make_app()
+    network = SyntheticNetwork.build(app, size=config.devices, seed=config.seed)
+    dev = network.devices[0]
+    packets = itertools.cycle(
+        [
+            t.ZigbeePacket(
+                src=t.AddrModeAddress(addr_mode=t.AddrMode.NWK, address=dev.nwk),
+                src_ep=1,
+                dst=t.AddrModeAddress(addr_mode=t.AddrMode.NWK, address=0x0000),
+                dst_ep=1,
+                tsn=tsn,
+                profile_id=zigpy.profiles.zha.PROFILE_ID,
+                cluster_id=TemperatureMeasurement.cluster_id,
+                data=t.SerializableBytes(_attribute_report(tsn, tsn % 4)),
+                lqi=200,
+                rssi=-60,
+            )
+            for tsn in range(256)
+        ]
+    )
+
+    yield lambda: dev.packet_received(next(packets))
+
+
+@benchmark("datastructures.debouncer.flood")
+async def debouncer_flood(config: BenchmarkConfig):
+    """Filter a flood of unique objects, evicting the oldest once full."""
+    debouncer = Debouncer(max_size=zigpy.device.PACKET_DEBOUNCE_MAX_TRACKED)
+    objs = itertools.count()
+
+    yield lambda: debouncer.filter(
+        next(objs), expire_in=zigpy.device.PACKET_DEBOUNCE_WINDOW
+    )
+
+
+@benchmark("application.get_device.nwk")
+async def application_get_device_nwk(config: BenchmarkConfig):
+    app = make_app()
+    network = SyntheticNetwork.build(app, size=config.devices, seed=config.seed)
+    addresses = itertools.cycle([dev.nwk for dev in network.devices])
+
+    yield lambda: app.get_device(nwk=next(addresses))
+
+
+@benchmark("application.get_device.ieee")
+async def application_get_device_ieee(config: BenchmarkConfig):
+    app = make_app()
+    network = SyntheticNetwork.build(app, size=config.devices, seed=config.seed)
+    addresses = itertools.cycle([dev.ieee for dev in network.devices])
+
+    yield lambda: app.get_device(ieee=next(addresses))
+
+
+@benchmark("types.eui64.convert")
+async def eui64_convert(config: BenchmarkConfig):
+    app = make_app()
+    network = SyntheticNetwork.build(app, size=config.devices, seed=config.seed)
+    ieees = itertools.cycle([str(dev.ieee) for dev in network.devices])
+
+    yield lambda: t.EUI64.convert(next(ieees))
+
+
+@benchmark("types.eui64.hash")
+async def eui64_hash(config: BenchmarkConfig):
+    """Hash EUI64 addresses that were just deserialized, as received in packets."""
+    app = make_app()
+    network = SyntheticNetwork.build(app, size=config.devices, seed=config.seed)
+    data = itertools.cycle([dev.ieee.serialize() for dev in network.devices])
+
+    yield lambda: hash(t.EUI64.deserialize(next(data))[0])
+
+
+@benchmark("types.eui64.dict_lookup")
+async def eui64_dict_lookup(config: BenchmarkConfig):
+    """Look up devices by freshly deserialized EUI64 addresses."""
+    app = make_app()
+    network = SyntheticNetwork.build(app, size=config.devices, seed=config.seed)
+    data = itertools.cycle([dev.ieee.serialize() for dev in network.devices])
+
+    yield lambda: app.devices[t.EUI64.deserialize(next(data))[0]]
+
+
+@benchmark("types.eui64.adapt_ieee")
+async def eui64_adapt_ieee(config: BenchmarkConfig):
+    """Adapt EUI64 addresses into SQLite parameters."""
+    app = make_app()
+    network = SyntheticNetwork.build(app, size=config.devices, seed=config.seed)
+    ieees = itertools.cycle([dev.ieee for dev in network.devices])
+    zigpy.appdb._register_sqlite_adapters()
+
+    yield lambda: zigpy.appdb.sqlite3.adapt(next(ieees))
+
+
+@benchmark("struct.construct.node_descriptor")
+async def struct_construct(config: BenchmarkConfig):
+    node_desc = make_node_desc(zdo_t.LogicalType.Router)
+    fields = node_desc.as_dict()
+
+    yield lambda: zdo_t.NodeDescriptor(**fields)
+
+
+@benchmark("struct.serialize.node_descriptor")
+async def struct_serialize(config: BenchmarkConfig):
+    node_desc = make_node_desc(zdo_t.LogicalType.Router)
+
+    yield node_desc.serialize
+
+
+@benchmark("struct.deserialize.node_descriptor")
+async def struct_deserialize(config: BenchmarkConfig):
+    data = make_node_desc(zdo_t.LogicalType.Router).serialize()
+
+    yield lambda: zdo_t.NodeDescriptor.deserialize(data)
+
+
+@benchmark("struct.deserialize.zcl_header")
+async def zcl_header_deserialize(config: BenchmarkConfig):
+    data = _attribute_report(tsn=0x12, value=2150)
+
+    yield lambda: foundation.ZCLHeader.deserialize(data)
+
+
+@benchmark("cluster.deserialize.report_attributes")
+async def cluster_deserialize(config: BenchmarkConfig):
+    app = make_app()
+    network = SyntheticNetwork.build(app, size=1, seed=config.seed)
+    cluster = network.devices[0].endpoints[1].temperature
+    data = _attribute_report(tsn=0x12, value=2150)
+
+    yield lambda: cluster.deserialize(data)
+
+
+@benchmark("cluster.deserialize.cluster_command")
+async def cluster_deserialize_command(config: BenchmarkConfig):
+    app = make_app()
+    network = SyntheticNetwork.build(app, size=1, seed=config.seed)
+    cluster = network.devices[0].endpoints[1].on_off
+    data = (
+        foundation.ZCLHeader.cluster(
+            tsn=0x12, command_id=OnOff.ServerCommandDefs.toggle.id
+        ).serialize()
+        + OnOff.ServerCommandDefs.toggle.schema().serialize()
+    )
+
+    yield lambda: cluster.deserialize(data)
+
+
+@benchmark("zdo.deserialize.mgmt_lqi_rsp")
+async def zdo_deserialize_mgmt_lqi_rsp(config: BenchmarkConfig):
+    """A full page of neighbors, as received during topology scans."""
+    app = make_app()
+    network = SyntheticNetwork.build(app, size=config.devices, seed=config.seed)
+    network.populate_topology(seed=config.seed)
+    router, neighbors = next(
+        (ieee, neighbors)
+        for ieee, neighbors in app.topology.neighbors.items()
+        if neighbors
+    )
+    neighbors = neighbors[:3]
+
+    data = (
+        zdo_t.ZDOHeader(command_id=zdo_t.ZDOCmd.Mgmt_Lqi_rsp, tsn=0x12).serialize()
+        + zdo_t.Status.SUCCESS.serialize()
+        + zdo_t.Neighbors(
+            Entries=len(neighbors), StartIndex=0, NeighborTableList=neighbors
+        ).serialize()
+    )
+    zdo = app.get_device(ieee=router).zdo
+
+    yield lambda: zdo.deserialize(zdo_t.ZDOCmd.Mgmt_Lqi_rsp, data)
+
+
+@benchmark("cluster.deserialize.ota_image_block_response")
+async def cluster_deserialize_ota_image_block_response(config: BenchmarkConfig):
+    app = make_app()
+    network = SyntheticNetwork.build(app, size=1, seed=config.seed)
+    cluster = network.devices[0].endpoints[1].add_output_cluster(Ota.cluster_id)
+    command = Ota.ClientCommandDefs.image_block_response
+    data = (
+        foundation.ZCLHeader.cluster(
+            tsn=0x12,
+            command_id=command.id,
+            direction=foundation.Direction.Server_to_Client,
+        ).serialize()
+        + command.schema(
+            status=foundation.Status.SUCCESS,
+            manufacturer_code=0x1234,
+            image_type=0x5678,
+            file_version=0x00000001,
+            file_offset=0x00001000,
+            image_data=bytes(range(48)),
+        ).serialize()
+    )
+
+    yield lambda: cluster.deserialize(data)
+
+
+def _make_quirks(
+    count: int, *, generic: bool = False
+) -> list[type[zigpy.quirks.CustomDevice]]:
+    """Quirks matching the synthetic network models, differing only by signature.
+    Generic quirks do not specify a model or manufacturer at all.
+    """
+    quirks = []
+
+    for index in range(count):
+        manufacturer = MANUFACTURERS[index % len(MANUFACTURERS)]
+        model = MODELS[index % len(MODELS)]
+
+        quirks.append(
+            type(
+                f"BenchmarkQuirk{index}",
+                (zigpy.quirks.CustomDevice,),
+                {
+                    "signature": {
+                        **(
+                            {}
+                            if generic
+                            else {SIG_MODELS_INFO: [(manufacturer, model)]}
+                        ),
+                        SIG_ENDPOINTS: {
+                            1: {
+                                SIG_EP_PROFILE: zigpy.profiles.zha.PROFILE_ID,
+                                SIG_EP_TYPE: index,
+                                SIG_EP_INPUT: [Basic.cluster_id, index],
+                                SIG_EP_OUTPUT: [Ota.cluster_id],
+                            }
+                        },
+                    },
+                    "replacement": {
+                        SIG_ENDPOINTS: {
+                            1: {
+                                SIG_EP_INPUT: [Basic.cluster_id, OnOff.cluster_id],
+                                SIG_EP_OUTPUT: [Ota.cluster_id],
+                            }
+                        },
+                    },
+                },
+            )
+        )
+
+    return quirks
+
+
+@benchmark("quirks.registry.get_device")
+async def quirks_registry_get_device(config: BenchmarkConfig):
+    app = make_app()
+    network = SyntheticNetwork.build(app, size=config.devices, seed=config.seed)
+    registry = zigpy.quirks.registry.DeviceRegistry()
+
+    for quirk in _make_quirks(count=10 * len(MODELS)):
+        registry.add_to_registry(quirk)
+
+    devices = itertools.cycle(network.devices)
+
+    yield lambda: registry.get_device(next(devices))
+
+
+@benchmark("quirks.registry.get_device.generic")
+async def quirks_registry_get_device_generic(config: BenchmarkConfig):
+    app = make_app()
+    network = SyntheticNetwork.build(app, size=config.devices, seed=config.seed)
+    registry = zigpy.quirks.registry.DeviceRegistry()
+
+    for quirk in _make_quirks(count=1000, generic=True):
+        registry.add_to_registry(quirk)
+
+    devices = itertools.cycle(network.devices)
+
+    yield lambda: registry.get_device(next(devices))
+
+
+@benchmark("quirks.v2.create_device")
+async def quirks_v2_create_device(config: BenchmarkConfig):
+    app = make_app()
+    network = SyntheticNetwork.build(app, size=config.devices, seed=config.seed)
+    network.populate_attributes()
+
+    class BenchmarkOnOff(zigpy.quirks.CustomCluster, OnOff):
+        pass
+
+    class BenchmarkLevelControl(zigpy.quirks.CustomCluster, LevelControl):
+        pass
+
+    entry = (
+        zigpy.quirks.v2.QuirkBuilder(
+            MANUFACTURERS[0],
+            MODELS[0],
+            registry=zigpy.quirks.registry.DeviceRegistry(),
+        )
+        .adds(Identify.cluster_id)
+        .adds(Basic.cluster_id, cluster_type=ClusterType.Client)
+        .replaces(BenchmarkOnOff)
+        .replace_cluster_occurrences(BenchmarkLevelControl)
+        .removes(TemperatureMeasurement.cluster_id)
+        .enum(
+            OnOff.AttributeDefs.start_up_on_off.name,
+            OnOff.StartUpOnOff,
+            OnOff.cluster_id,
+            translation_key="start_up_on_off",
+            fallback_name="Start up on/off",
+        )
+        .add_to_registry()
+    )
+    devices = itertools.cycle(network.devices)
+
+    yield lambda: entry.create_device(next(devices))
+
+
+@benchmark("topology.build_source_route_to")
+async def topology_build_source_route_to(config: BenchmarkConfig):
+    app = make_app()
+    network = SyntheticNetwork.build(app, size=config.devices, seed=config.seed)
+    network.populate_topology(seed=config.seed)
+    devices = itertools.cycle(network.devices)
+
+    def build_source_route_to() -> None:
+        app.topology.invalidate_source_routes()
+        app.topology.build_source_route_to(next(devices))
+
+    yield build_source_route_to
+
+
+@benchmark("topology.build_source_route_to.cached")
+async def topology_build_source_route_to_cached(config: BenchmarkConfig):
+    app = make_app()
+    network = SyntheticNetwork.build(app, size=config.devices, seed=config.seed)
+    network.populate_topology(seed=config.seed)
+    devices = itertools.cycle(network.devices)
+
+    yield lambda: app.topology.build_source_route_to(next(devices))
+
+
+@benchmark("device.get_sequence.concurrent")
+async def device_get_sequence_concurrent(config: BenchmarkConfig):
+    """Allocate TSNs with most of every device's TSNs used by pending requests."""
+    app = make_app()
+    network = SyntheticNetwork.build(app, size=config.devices, seed=config.seed)
+    rng = random.Random(config.seed)
+    devices = itertools.cycle(network.devices)
+
+    # Responses arrive out of order, pending requests complete at random
+    in_flight: dict[zigpy.device.Device, list[int]] = {}
+
+    for dev in network.devices:
+        in_flight[dev] = []
+
+        # Leave only a few of the 256 TSNs free
+        for _ in range(240):
+            sequence = dev.get_sequence()
+            dev._pending[sequence] = None
+            in_flight[dev].append(sequence)
+
+    def get_sequence() -> None:
+        dev = next(devices)
+        pending = in_flight[dev]
+
+        del dev._pending[pending.pop(rng.randrange(len(pending)))]
+
+        sequence = dev.get_sequence()
+        dev._pending[sequence] = None
+        pending.append(sequence)
+
+    yield get_sequence
+
+
+@contextlib.asynccontextmanager
+async def _database(config: BenchmarkConfig, *, populated: bool):
+    with tempfile.TemporaryDirectory() as tmpdir:
+        database_file = str(pathlib.Path(tmpdir) / "zigbee.db")
+
+        if populated:
+            app = make_app(database_file)
+            await app._load_db()
+
+            network = SyntheticNetwork.build(app, size=config.devices, seed=config.seed)
+
+            for dev in network.devices:
+                app.device_initialized(dev)
+
+            network.populate_attributes()
+            await app._dblistener._callback_handlers.join()
+            await app.shutdown()
+
+        yield database_file
+
+
+@benchmark("appdb.attribute_updated")
+async def appdb_attribute_updated(config: BenchmarkConfig):
+    async with _database(config, populated=True) as database_file:
+        app = make_app(database_file)
+        await app._load_db()
+
+        clusters = itertools.cycle(
+            [dev.endpoints[1].temperature for dev in app.devices.values()]
+        )
+        values = itertools.count()
+
+        async def update_and_flush() -> None:
+            for _ in range(100):
+                next(clusters).update_attribute(
+                    TemperatureMeasurement.AttributeDefs.measured_value.id,
+                    next(values) % 10000,
+                )
+
+            await app._dblistener._callback_handlers.join()
+
+        yield update_and_flush
+
+        await app.shutdown()
+
+
+@benchmark("appdb.load")
+async def appdb_load(config: BenchmarkConfig):
+    async with _database(config, populated=True) as database_file:
+
+        async def load() -> None:
+            app = make_app(database_file)
+            await app._load_db()
+            await app.shutdown()
+
+        yield load
+
+
+@benchmark("appdb.load.lazy_attributes")
+async def appdb_load_lazy_attributes(config: BenchmarkConfig):
+    async with _database(config, populated=True) as database_file:
+
+        async def load() -> None:
+            app = make_app(database_file, **{CONF_DATABASE_LAZY_ATTRIBUTES: True})
+            await app._load_db()
+            await app.shutdown()
+
+        yield load
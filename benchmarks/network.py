@@ -0,0 +1,226 @@
+"""Fake controller application and synthetic networks for benchmarks."""
+
+from __future__ import annotations
+
+import dataclasses
+import random
+import typing
+
+import zigpy.application
+from zigpy.config import (
+    CONF_DATABASE,
+    CONF_DEVICE,
+    CONF_DEVICE_PATH,
+    CONF_OTA,
+    CONF_OTA_ENABLED,
+)
+import zigpy.device
+import zigpy.endpoint
+import zigpy.profiles.zha
+import zigpy.state as app_state
+import zigpy.types as t
+from zigpy.zcl.clusters.general import Basic, LevelControl, OnOff, Ota
+from zigpy.zcl.clusters.measurement import TemperatureMeasurement
+import zigpy.zdo.types as zdo_t
+
+COORDINATOR_IEEE = t.EUI64.convert("aa:11:22:bb:33:44:be:ef")
+
+MANUFACTURERS = ["IKEA of Sweden", "LUMI", "Philips", "_TZ3000_abcdefgh", "SONOFF"]
+MODELS = ["TRADFRI bulb", "lumi.sensor_ht", "LCT001", "TS0601", "SNZB-02"]
+
+
+class FakeControllerApplication(zigpy.application.ControllerApplication):
+    """Controller application that never touches a radio."""
+
+    async def send_packet(self, packet: t.ZigbeePacket) -> None:
+        pass
+
+    async def connect(self) -> None:
+        pass
+
+    async def disconnect(self) -> None:
+        pass
+
+    async def start_network(self) -> None:
+        pass
+
+    async def force_remove(self, dev: zigpy.device.Device) -> None:
+        pass
+
+    async def add_endpoint(self, descriptor: zdo_t.SimpleDescriptor) -> None:
+        pass
+
+    async def permit_ncp(self, time_s: int = 60) -> None:
+        pass
+
+    async def permit_with_link_key(
+        self, node: t.EUI64, link_key: t.KeyData, time_s: int = 60
+    ) -> None:
+        pass
+
+    async def reset_network_info(self) -> None:
+        pass
+
+    async def write_network_info(
+        self, *, network_info: app_state.NetworkInfo, node_info: app_state.NodeInfo
+    ) -> None:
+        pass
+
+    async def load_network_info(self, *, load_devices: bool = False) -> None:
+        pass
+
+
+def make_app(
+    database_file: str | None = None, **config: typing.Any
+) -> FakeControllerApplication:
+    """Create a fake controller application, optionally backed by a database."""
+    app = FakeControllerApplication(
+        {
+            CONF_DATABASE: database_file,
+            CONF_DEVICE: {CONF_DEVICE_PATH: "/dev/null"},
+            CONF_OTA: {CONF_OTA_ENABLED: False},
+            **config,
+        }
+    )
+    app.state.node_info = app_state.NodeInfo(
+        nwk=t.NWK(0x0000),
+        ieee=COORDINATOR_IEEE,
+        logical_type=zdo_t.LogicalType.Coordinator,
+    )
+
+    return app
+
+
+def make_node_desc(logical_type: zdo_t.LogicalType) -> zdo_t.NodeDescriptor:
+    return zdo_t.NodeDescriptor(
+        logical_type=logical_type,
+        complex_descriptor_available=0,
+        user_descriptor_available=0,
+        reserved=0,
+        aps_flags=0,
+        frequency_band=zdo_t.NodeDescriptor.FrequencyBand.Freq2400MHz,
+        mac_capability_flags=zdo_t.NodeDescriptor.MACCapabilityFlags.AllocateAddress,
+        manufacturer_code=4174,
+        maximum_buffer_size=82,
+        maximum_incoming_transfer_size=82,
+        server_mask=0,
+        maximum_outgoing_transfer_size=82,
+        descriptor_capability_field=zdo_t.NodeDescriptor.DescriptorCapability.NONE,
+    )
+
+
+@dataclasses.dataclass
+class SyntheticNetwork:
+    """A reproducible network of initialized devices."""
+
+    app: FakeControllerApplication
+    devices: list[zigpy.device.Device]
+
+    @classmethod
+    def build(
+        cls,
+        app: FakeControllerApplication,
+        *,
+        size: int,
+        seed: int = 0,
+    ) -> SyntheticNetwork:
+        """Populate `app` with `size` initialized devices. The same seed always
+        produces the same network.
+        """
+        rng = random.Random(seed)
+        devices = []
+
+        for index in range(size):
+            ieee = t.EUI64(rng.getrandbits(64).to_bytes(8, "little"))
+            nwk = t.NWK(0x0001 + index)
+
+            dev = app.add_device(nwk=nwk, ieee=ieee)
+            dev.node_desc = make_node_desc(
+                rng.choice(
+                    [zdo_t.LogicalType.Router, zdo_t.LogicalType.EndDevice],
+                )
+            )
+            dev.manufacturer = rng.choice(MANUFACTURERS)
+            dev.model = rng.choice(MODELS)
+
+            ep = dev.add_endpoint(1)
+            ep.status = zigpy.endpoint.Status.ZDO_INIT
+            ep.profile_id = zigpy.profiles.zha.PROFILE_ID
+            ep.device_type = zigpy.profiles.zha.DeviceType.ON_OFF_LIGHT
+
+            for cluster in (Basic, OnOff, LevelControl, TemperatureMeasurement):
+                ep.add_input_cluster(cluster.cluster_id)
+
+            ep.add_output_cluster(Ota.cluster_id)
+            devices.append(dev)
+
+        return cls(app=app, devices=devices)
+
+    def populate_attributes(self) -> None:
+        """Fill every device's attribute cache with a few values."""
+        for dev in self.devices:
+            ep = dev.endpoints[1]
+            ep.basic.update_attribute(Basic.AttributeDefs.app_version.id, 1)
+            ep.basic.update_attribute(
+                Basic.AttributeDefs.manufacturer.id, dev.manufacturer
+            )
+            ep.basic.update_attribute(Basic.AttributeDefs.model.id, dev.model)
+            ep.on_off.update_attribute(OnOff.AttributeDefs.on_off.id, t.Bool.true)
+            ep.level.update_attribute(LevelControl.AttributeDefs.current_level.id, 254)
+            ep.temperature.update_attribute(
+                TemperatureMeasurement.AttributeDefs.measured_value.id, 2150
+            )
+
+    def populate_topology(self, *, links: int = 4, seed: int = 0) -> None:
+        """Fill the neighbor tables with a connected mesh. Every router is linked to
+        the coordinator or an earlier router and to `links` random routers, and every
+        end device is the child of a random router.
+        """
+        rng = random.Random(seed)
+        topology = self.app.topology
+
+        coordinator = self.app.add_device(nwk=t.NWK(0x0000), ieee=COORDINATOR_IEEE)
+        coordinator.node_desc = make_node_desc(zdo_t.LogicalType.Coordinator)
+        routers = [coordinator]
+
+        def add_link(
+            router: zigpy.device.Device,
+            device: zigpy.device.Device,
+            relationship: zdo_t.Neighbor.Relationship,
+        ) -> None:
+            topology.neighbors[router.ieee].append(
+                zdo_t.Neighbor(
+                    extended_pan_id=t.ExtendedPanId(COORDINATOR_IEEE),
+                    ieee=device.ieee,
+                    nwk=device.nwk,
+                    device_type=zdo_t.Neighbor.DeviceType(
+                        int(device.node_desc.logical_type)
+                    ),
+                    rx_on_when_idle=int(not device.node_desc.is_end_device),
+                    relationship=relationship,
+                    reserved1=0,
+                    permit_joining=0,
+                    reserved2=0,
+                    depth=1,
+                    lqi=rng.randint(100, 255),
+                )
+            )
+
+        for dev in self.devices:
+            parent = rng.choice(routers)
+
+            if dev.node_desc.is_end_device:
+                add_link(parent, dev, zdo_t.Neighbor.Relationship.Child)
+                continue
+
+            add_link(parent, dev, zdo_t.Neighbor.Relationship.Sibling)
+            add_link(dev, parent, zdo_t.Neighbor.Relationship.Sibling)
+            routers.append(dev)
+
+        for router in routers[1:]:
+            for other in rng.sample(routers, k=min(links, len(routers))):
+                if other is not router:
+                    add_link(router, other, zdo_t.Neighbor.Relationship.Sibling)
+                    add_link(other, router, zdo_t.Neighbor.Relationship.Sibling)
+
+        topology.invalidate_source_routes()
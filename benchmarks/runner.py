@@ -0,0 +1,261 @@
+"""Benchmark registry, timing, reporting and baseline comparison."""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+from collections.abc import AsyncIterator
+import contextlib
+import dataclasses
+import fnmatch
+import inspect
+import json
+import pathlib
+import platform
+import statistics
+import sys
+import time
+import typing
+
+BenchmarkFunc = typing.Callable[[], typing.Any]
+BenchmarkFactory = typing.Callable[["BenchmarkConfig"], AsyncIterator[BenchmarkFunc]]
+
+BENCHMARKS: dict[str, BenchmarkFactory] = {}
+
+
+def benchmark(name: str) -> typing.Callable[[BenchmarkFactory], BenchmarkFactory]:
+    """Register a benchmark.
+
+    The decorated async generator performs its setup, yields the function to time
+    (synchronous or a coroutine function) and then tears down.
+    """
+
+    def decorator(factory: BenchmarkFactory) -> BenchmarkFactory:
+        if name in BENCHMARKS:
+            raise ValueError(f"Benchmark {name!r} is already registered")
+
+        BENCHMARKS[name] = factory
+        return factory
+
+    return decorator
+
+
+@dataclasses.dataclass(frozen=True)
+class BenchmarkConfig:
+    devices: int = 100
+    listeners: int = 1000
+    seed: int = 0
+    repeat: int = 5
+    min_time: float = 0.1
+    max_number: int = 100_000
+
+
+@dataclasses.dataclass(frozen=True)
+class BenchmarkResult:
+    name: str
+    number: int
+    timings: list[float]
+
+    @property
+    def min(self) -> float:
+        return min(self.timings)
+
+    @property
+    def median(self) -> float:
+        return statistics.median(self.timings)
+
+    @property
+    def stdev(self) -> float:
+        return statistics.stdev(self.timings) if len(self.timings) > 1 else 0.0
+
+    def as_dict(self) -> dict[str, typing.Any]:
+        return {
+            "number": self.number,
+            "timings": self.timings,
+            "min": self.min,
+            "median": self.median,
+            "stdev": self.stdev,
+        }
+
+
+async def _time(func: BenchmarkFunc, number: int) -> float:
+    """Return the average time of a single call of `func`, in seconds."""
+
+    if inspect.iscoroutinefunction(func):
+        start = time.perf_counter()
+
+        for _ in range(number):
+            await func()
+
+        return (time.perf_counter() - start) / number
+
+    start = time.perf_counter()
+
+    for _ in range(number):
+        func()
+
+    return (time.perf_counter() - start) / number
+
+
+async def run_benchmark(name: str, config: BenchmarkConfig) -> BenchmarkResult:
+    """Run a single registered benchmark."""
+    factory = contextlib.asynccontextmanager(BENCHMARKS[name])
+
+    async with factory(config) as func:
+        # Calibrate the number of calls so that a single repeat takes `min_time`
+        number = 1
+
+        while number < config.max_number:
+            if await _time(func, number) * number >= config.min_time:
+                break
+
+            number = min(number * 10, config.max_number)
+
+        timings = [await _time(func, number) for _ in range(config.repeat)]
+
+    return BenchmarkResult(name=name, number=number, timings=timings)
+
+
+async def run_benchmarks(
+    config: BenchmarkConfig, patterns: list[str] | None = None
+) -> list[BenchmarkResult]:
+    """Run all benchmarks whose names match any of the glob `patterns`."""
+    import benchmarks.cases  # noqa: F401
+
+    results = []
+
+    for name in BENCHMARKS:
+        if patterns and not any(fnmatch.fnmatch(name, p) for p in patterns):
+            continue
+
+        results.append(await run_benchmark(name, config))
+
+    return results
+
+
+def results_to_json(
+    config: BenchmarkConfig, results: list[BenchmarkResult]
+) -> dict[str, typing.Any]:
+    return {
+        "metadata": {
+            "python": platform.python_version(),
+            "implementation": platform.python_implementation(),
+            "platform": platform.platform(),
+            "config": dataclasses.asdict(config),
+        },
+        "benchmarks": {result.name: result.as_dict() for result in results},
+    }
+
+
+def compare(
+    baseline: dict[str, typing.Any],
+    results: list[BenchmarkResult],
+    *,
+    threshold: float,
+) -> tuple[list[str], list[str]]:
+    """Compare results against a baseline, returning report lines and the names of
+    benchmarks whose median time regressed by more than `threshold`.
+    """
+    lines = []
+    regressions = []
+
+    for result in results:
+        old = baseline["benchmarks"].get(result.name)
+
+        if old is None:
+            lines.append(f"{result.name:<40} {'new':>12}")
+            continue
+
+        ratio = result.median / old["median"]
+
+        if ratio > 1 + threshold:
+            status = "SLOWER"
+            regressions.append(result.name)
+        elif ratio < 1 - threshold:
+            status = "faster"
+        else:
+            status = ""
+
+        lines.append(
+            f"{result.name:<40} {_format_time(old['median']):>12}"
+            f" -> {_format_time(result.median):>12} {ratio:>7.2f}x {status}".rstrip()
+        )
+
+    return lines, regressions
+
+
+def _format_time(seconds: float) -> str:
+    for unit, scale in (("s", 1), ("ms", 1e-3), ("us", 1e-6)):
+        if seconds >= scale:
+            return f"{seconds / scale:.2f} {unit}"
+
+    return f"{seconds / 1e-9:.0f} ns"
+
+
+def _write(text: str) -> None:
+    sys.stdout.write(text + "\n")
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(
+        prog="python -m benchmarks", description="Run zigpy microbenchmarks"
+    )
+    parser.add_argument("patterns", nargs="*", help="Glob patterns of benchmarks")
+    parser.add_argument("--list", action="store_true", help="List benchmarks")
+    parser.add_argument("--devices", type=int, default=BenchmarkConfig.devices)
+    parser.add_argument("--listeners", type=int, default=BenchmarkConfig.listeners)
+    parser.add_argument("--seed", type=int, default=BenchmarkConfig.seed)
+    parser.add_argument("--repeat", type=int, default=BenchmarkConfig.repeat)
+    parser.add_argument("--min-time", type=float, default=BenchmarkConfig.min_time)
+    parser.add_argument("--json", type=pathlib.Path, help="Write results as JSON")
+    parser.add_argument(
+        "--compare", type=pathlib.Path, help="Compare against a JSON baseline"
+    )
+    parser.add_argument(
+        "--threshold",
+        type=float,
+        default=0.10,
+        help="Relative slowdown reported as a regression when comparing",
+    )
+    args = parser.parse_args(argv)
+
+    if args.list:
+        import benchmarks.cases  # noqa: F401
+
+        _write("\n".join(BENCHMARKS))
+        return 0
+
+    config = BenchmarkConfig(
+        devices=args.devices,
+        listeners=args.listeners,
+        seed=args.seed,
+        repeat=args.repeat,
+        min_time=args.min_time,
+    )
+    results = asyncio.run(run_benchmarks(config, args.patterns))
+
+    for result in results:
+        _write(
+            f"{result.name:<40} {_format_time(result.median):>12}"
+            f" (min {_format_time(result.min)}, stdev {_format_time(result.stdev)},"
+            f" {result.number} loops)"
+        )
+
+    if args.json is not None:
+        args.json.write_text(json.dumps(results_to_json(config, results), indent=2))
+
+    if args.compare is None:
+        return 0
+
+    lines, regressions = compare(
+        json.loads(args.compare.read_text()), results, threshold=args.threshold
+    )
+
+    _write("")
+    _write("\n".join(lines))
+
+    if regressions:
+        _write(f"\n{len(regressions)} regression(s): {', '.join(regressions)}")
+        return 1
+
+    return 0
@@ -0,0 +1,228 @@
+from __future__ import annotations
+
+import os
+import pathlib
+from unittest.mock import patch
+
+from tests.ota.test_ota_matching import SelfContainedProvider
+from tests.ota.test_ota_providers import SelfContainedOtaImageMetadata, make_device
+from zigpy import config
+import zigpy.ota
+from zigpy.ota.image import FieldControl
+from zigpy.ota.store import OtaImageStore
+from zigpy.zcl.clusters.general import Ota
+
+
+def make_image(
+    file_version: int, data: bytes, min_hardware_version: int | None = None
+) -> bytes:
+    header = zigpy.ota.image.OTAImageHeader(
+        upgrade_file_id=zigpy.ota.image.OTAImageHeader.MAGIC_VALUE,
+        file_version=file_version,
+        image_type=0xABCD,
+        manufacturer_id=0x1234,
+        header_version=256,
+        header_length=56,
+        field_control=0,
+        stack_version=2,
+        header_string="This is a test header!",
+        image_size=56 + 2 + 4 + len(data),
+    )
+
+    if min_hardware_version is not None:
+        header = header.replace(
+            header_length=56 + 4,
+            field_control=FieldControl.HARDWARE_VERSIONS_PRESENT,
+            minimum_hardware_version=min_hardware_version,
+            maximum_hardware_version=0xFFFF,
+            image_size=header.image_size + 4,
+        )
+
+    return zigpy.ota.image.OTAImage(
+        header=header,
+        subelements=[zigpy.ota.image.SubElement(tag_id=0x0000, data=data)],
+    ).serialize()
+
+
+async def test_ota_store_persists_images(tmp_path: pathlib.Path) -> None:
+    device = make_device(model="device model", manufacturer_id=0x1234)
+
+    query_cmd = Ota.ServerCommandDefs.query_next_image.schema(
+        field_control=FieldControl.HARDWARE_VERSIONS_PRESENT,
+        manufacturer_code=0x1234,
+        image_type=0xABCD,
+        current_file_version=1,
+        hardware_version=1,
+    )
+
+    meta = SelfContainedOtaImageMetadata(
+        file_version=2,
+        manufacturer_id=0x1234,
+        test_data=make_image(file_version=2, data=b"Firmware 1"),
+    )
+
+    def make_ota() -> zigpy.ota.OTA:
+        ota = zigpy.ota.OTA(
+            config={
+                config.CONF_OTA_ENABLED: False,
+                config.CONF_OTA_CACHE_DIR: str(tmp_path / "cache"),
+            },
+            application=None,
+        )
+        ota.register_provider(SelfContainedProvider([meta]))
+
+        return ota
+
+    ota = make_ota()
+
+    with patch.object(
+        SelfContainedOtaImageMetadata,
+        "_fetch",
+        autospec=True,
+        side_effect=SelfContainedOtaImageMetadata._fetch,
+    ) as fetch:
+        images1 = await ota.get_ota_images(device, query_cmd)
+        images2 = await ota.get_ota_images(device, query_cmd)
+
+    # The image is downloaded once and then loaded from disk, never kept in memory
+    assert len(fetch.mock_calls) == 1
+    assert images1 == images2
+    assert images1.upgrades[0].firmware.serialize() == meta.test_data
+    assert ota._image_cache[meta].firmware is None
+    assert ota._image_cache[meta].header == images1.upgrades[0].firmware.header
+
+    # The cache survives a restart
+    with patch.object(SelfContainedOtaImageMetadata, "_fetch", autospec=True) as fetch:
+        images3 = await make_ota().get_ota_images(device, query_cmd)
+
+    assert len(fetch.mock_calls) == 0
+    assert images3 == images1
+
+    # Corrupted files are discarded and downloaded again
+    (path,) = (tmp_path / "cache").glob("*.ota")
+    path.write_bytes(meta.test_data[:-1])
+
+    with patch.object(
+        SelfContainedOtaImageMetadata,
+        "_fetch",
+        autospec=True,
+        side_effect=SelfContainedOtaImageMetadata._fetch,
+    ) as fetch:
+        images4 = await make_ota().get_ota_images(device, query_cmd)
+
+    assert len(fetch.mock_calls) == 1
+    assert images4 == images1
+    assert path.read_bytes() == meta.test_data
+
+
+async def test_ota_store_eviction(tmp_path: pathlib.Path) -> None:
+    images = [
+        SelfContainedOtaImageMetadata(
+            file_version=version,
+            test_data=make_image(file_version=version, data=b"Firmware"),
+        )
+        for version in range(3)
+    ]
+
+    size = len(images[0].test_data)
+    store = OtaImageStore(path=tmp_path, max_size=2 * size)
+
+    await store.put(images[0], images[0].test_data)
+    await store.put(images[1], images[1].test_data)
+
+    # Make sure the first image is the least recently used, then read it
+    index = store._load_index()
+    os.utime(store._image_path(index[store._key(images[0])]), (0, 0))
+    os.utime(store._image_path(index[store._key(images[1])]), (1, 1))
+    assert await store.get(images[0]) == images[0].test_data
+
+    # The second image is evicted when the third one is added
+    await store.put(images[2], images[2].test_data)
+
+    assert await store.get(images[0]) == images[0].test_data
+    assert await store.get(images[1]) is None
+    assert await store.get(images[2]) == images[2].test_data
+    assert len(list(tmp_path.glob("*.ota"))) == 2
+
+    # Identical contents are stored only once
+    duplicate = images[2].replace(source="Other")
+    await store.put(duplicate, images[2].test_data)
+
+    assert await store.get(duplicate) == images[2].test_data
+    assert len(list(tmp_path.glob("*.ota"))) == 2
+
+
+async def test_ota_store_keeps_headers(tmp_path: pathlib.Path) -> None:
+    device = make_device(model="device model", manufacturer_id=0x1234)
+
+    query_cmd = Ota.ServerCommandDefs.query_next_image.schema(
+        field_control=FieldControl.HARDWARE_VERSIONS_PRESENT,
+        manufacturer_code=0x1234,
+        image_type=0xABCD,
+        current_file_version=1,
+        hardware_version=1,
+    )
+
+    # Only the firmware itself restricts the hardware version
+    meta = SelfContainedOtaImageMetadata(
+        file_version=2,
+        manufacturer_id=0x1234,
+        test_data=make_image(file_version=2, data=b"Firmware", min_hardware_version=5),
+    )
+
+    ota = zigpy.ota.OTA(
+        config={
+            config.CONF_OTA_ENABLED: False,
+            config.CONF_OTA_CACHE_DIR: str(tmp_path / "cache"),
+        },
+        application=None,
+    )
+    ota.register_provider(SelfContainedProvider([meta]))
+
+    with patch.object(ota._image_store, "get", wraps=ota._image_store.get) as store_get:
+        images1 = await ota.get_ota_images(device, query_cmd)
+        images2 = await ota.get_ota_images(device, query_cmd)
+
+    # The image is only known to be incompatible once its header has been read, which
+    # is not read from the store again
+    assert images1.upgrades
+    assert not images2.upgrades
+    assert len(store_get.mock_calls) == 1
+
+
+async def test_ota_store_skips_local_images(tmp_path: pathlib.Path) -> None:
+    device = make_device(model="device model", manufacturer_id=0x1234)
+
+    query_cmd = Ota.ServerCommandDefs.query_next_image.schema(
+        field_control=FieldControl.HARDWARE_VERSIONS_PRESENT,
+        manufacturer_code=0x1234,
+        image_type=0xABCD,
+        current_file_version=1,
+        hardware_version=1,
+    )
+
+    path = tmp_path / "image.ota"
+    path.write_bytes(make_image(file_version=2, data=b"Firmware 1"))
+
+    meta = zigpy.ota.providers.LocalOtaImageMetadata(
+        path=path, file_version=2, manufacturer_id=0x1234
+    )
+
+    ota = zigpy.ota.OTA(
+        config={
+            config.CONF_OTA_ENABLED: False,
+            config.CONF_OTA_CACHE_DIR: str(tmp_path / "cache"),
+        },
+        application=None,
+    )
+    ota.register_provider(SelfContainedProvider([meta]))
+
+    images1 = await ota.get_ota_images(device, query_cmd)
+    assert images1.upgrades[0].firmware.serialize() == path.read_bytes()
+
+    # Replacing the file is picked up
+    path.write_bytes(make_image(file_version=2, data=b"Firmware 2"))
+
+    images2 = await ota.get_ota_images(device, query_cmd)
+    assert images2.upgrades[0].firmware.serialize() == path.read_bytes()
+    assert not list((tmp_path / "cache").glob("*.ota"))
@@ -1,6 +1,7 @@
 import asyncio
 import contextlib
 from datetime import datetime, timedelta, timezone
+import logging
 import pathlib
 import sqlite3
 import sys
@@ -25,7 +26,7 @@ import zigpy.ota
 from zigpy.quirks import CustomDevice
 import zigpy.types as t
 import zigpy.zcl
-from zigpy.zcl.clusters.general import Basic
+from zigpy.zcl.clusters.general import Basic, LevelControl, OnOff
 from zigpy.zcl.foundation import Status as ZCLStatus
 from zigpy.zdo import types as zdo_t
 
@@ -50,11 +51,11 @@ def auto_kill_aiosqlite():
         thread._running = False
 
 
-async def make_app_with_db(database_file):
+async def make_app_with_db(database_file, **config):
     if isinstance(database_file, pathlib.Path):
         database_file = str(database_file)
 
-    app = make_app({conf.CONF_DATABASE: database_file})
+    app = make_app({conf.CONF_DATABASE: database_file, **config})
     await app._load_db()
 
     return app
@@ -637,6 +638,94 @@ async def test_topology(tmp_path):
     await app2.shutdown()
 
 
+async def test_topology_persists_diffs(tmp_path):
+    """Test that unchanged neighbor and route rows are not rewritten."""
+
+    ieee = make_ieee(0)
+    neighbor1, neighbor2, neighbor3 = (
+        zdo_t.Neighbor(
+            extended_pan_id=t.ExtendedPanId.convert("aa:bb:cc:dd:ee:ff:01:02"),
+            ieee=make_ieee(i),
+            nwk=0x1110 + i,
+            device_type=zdo_t.Neighbor.DeviceType.EndDevice,
+            rx_on_when_idle=1,
+            relationship=zdo_t.Neighbor.Relationship.Child,
+            reserved1=0,
+            permit_joining=0,
+            reserved2=0,
+            depth=15,
+            lqi=250,
+        )
+        for i in (1, 2, 3)
+    )
+    route = zdo_t.Route(
+        DstNWK=0x1234,
+        RouteStatus=zdo_t.RouteStatus.Active,
+        MemoryConstrained=0,
+        ManyToOne=0,
+        RouteRecordRequired=0,
+        Reserved=0,
+        NextHop=0x6789,
+    )
+
+    db = tmp_path / "test.db"
+    app = await make_app_with_db(db)
+
+    dev = app.add_device(nwk=0x9876, ieee=ieee)
+    dev.node_desc = make_node_desc(logical_type=zdo_t.LogicalType.Router)
+
+    ep = dev.add_endpoint(1)
+    ep.status = zigpy.endpoint.Status.ZDO_INIT
+    ep.profile_id = 260
+    ep.device_type = profiles.zha.DeviceType.PUMP
+    app.device_initialized(dev)
+
+    async def neighbor_rows() -> dict[int, t.EUI64]:
+        await app._dblistener._callback_handlers.join()
+
+        async with app._dblistener.execute(
+            f"SELECT rowid, ieee FROM neighbors{zigpy.appdb.DB_V}"
+        ) as cursor:
+            return dict(await cursor.fetchall())
+
+    app._dblistener.neighbors_updated(ieee, [neighbor1, neighbor2])
+    app._dblistener.routes_updated(ieee, [route])
+    rows = await neighbor_rows()
+    assert sorted(rows.values()) == [neighbor1.ieee, neighbor2.ieee]
+
+    # Reordered entries are left alone
+    with patch.object(app._dblistener, "_commit", wraps=app._dblistener._commit) as c:
+        app._dblistener.neighbors_updated(ieee, [neighbor2, neighbor1])
+        app._dblistener.routes_updated(ieee, [route])
+        assert await neighbor_rows() == rows
+
+    assert len(c.mock_calls) == 0
+
+    # Only the changed entries are replaced
+    app._dblistener.neighbors_updated(
+        ieee, [neighbor1.replace(lqi=100), neighbor2, neighbor3]
+    )
+    app._dblistener.routes_updated(ieee, [])
+    new_rows = await neighbor_rows()
+
+    assert len(new_rows) == 3
+    assert {rowid for rowid, n in rows.items() if n == neighbor2.ieee} <= set(new_rows)
+    assert {rowid for rowid, n in rows.items() if n == neighbor1.ieee}.isdisjoint(
+        new_rows
+    )
+
+    await app.shutdown()
+
+    app2 = await make_app_with_db(db)
+    assert sorted(app2.topology.neighbors[ieee], key=lambda n: n.nwk) == [
+        neighbor1.replace(lqi=100),
+        neighbor2,
+        neighbor3,
+    ]
+    assert not app2.topology.routes[ieee]
+    await app2.shutdown()
+
+
 @patch("zigpy.device.Device.schedule_initialize", new=mock_dev_init(True))
 async def test_device_rejoin(tmp_path):
     db = tmp_path / "test.db"
@@ -1175,3 +1264,421 @@ async def test_appdb_attribute_clear(tmp_path):
     dev3 = app3.get_device(ieee=dev.ieee)
     assert Basic.AttributeDefs.zcl_version.id not in dev3.endpoints[1].basic._attr_cache
     await app3.shutdown()
+
+
+BATCHING_CONFIG = {
+    conf.CONF_DATABASE_BATCH_SIZE: 100,
+    conf.CONF_DATABASE_FLUSH_INTERVAL: 0.01,
+}
+
+
+async def test_appdb_batching_coalesces(tmp_path):
+    db = tmp_path / "test.db"
+    app = await make_app_with_db(db, **BATCHING_CONFIG)
+
+    dev = app.add_device(nwk=0x1234, ieee=t.EUI64.convert("aa:bb:cc:dd:11:22:33:44"))
+    dev.node_desc = make_node_desc(logical_type=zdo_t.LogicalType.Router)
+
+    ep = dev.add_endpoint(1)
+    ep.status = zigpy.endpoint.Status.ZDO_INIT
+    ep.profile_id = 260
+    ep.device_type = profiles.zha.DeviceType.PUMP
+
+    basic = ep.add_input_cluster(Basic.cluster_id)
+    app.device_initialized(dev)
+    await app._dblistener._callback_handlers.join()
+
+    with (
+        patch.object(
+            app._dblistener, "_save_attributes", wraps=app._dblistener._save_attributes
+        ) as save_attributes,
+        patch.object(
+            app._dblistener._db, "commit", wraps=app._dblistener._db.commit
+        ) as commit,
+    ):
+        for value in range(10):
+            basic.update_attribute(Basic.AttributeDefs.zcl_version.id, value)
+            basic.update_attribute(Basic.AttributeDefs.app_version.id, value + 100)
+
+        await app._dblistener._callback_handlers.join()
+
+    # Only the last value of every attribute was written, in one transaction
+    assert save_attributes.await_count == 1
+    assert len(save_attributes.await_args.args[0]) == 2
+    assert commit.await_count == 1
+
+    counters = app.state.counters["database"]
+    assert counters["events_coalesced"] == 18
+    assert counters["events"].value >= 20
+
+    await app.shutdown()
+
+    app2 = await make_app_with_db(db)
+    basic2 = app2.get_device(ieee=dev.ieee).endpoints[1].basic
+    assert basic2._attr_cache[Basic.AttributeDefs.zcl_version.id] == 9
+    assert basic2._attr_cache[Basic.AttributeDefs.app_version.id] == 109
+    await app2.shutdown()
+
+
+async def test_appdb_batching_bad_row(tmp_path):
+    """A row that fails to be written does not drop the rest of the batch."""
+    db = tmp_path / "test.db"
+    app = await make_app_with_db(db, **BATCHING_CONFIG)
+
+    dev = app.add_device(nwk=0x1234, ieee=t.EUI64.convert("aa:bb:cc:dd:11:22:33:44"))
+    dev.node_desc = make_node_desc(logical_type=zdo_t.LogicalType.Router)
+
+    ep = dev.add_endpoint(1)
+    ep.status = zigpy.endpoint.Status.ZDO_INIT
+    ep.profile_id = 260
+    ep.device_type = profiles.zha.DeviceType.PUMP
+
+    basic = ep.add_input_cluster(Basic.cluster_id)
+    app.device_initialized(dev)
+    await app._dblistener._callback_handlers.join()
+
+    basic.update_attribute(Basic.AttributeDefs.zcl_version.id, 0x12)
+
+    # The device of this attribute does not exist
+    app._dblistener.enqueue(
+        "_save_attribute",
+        t.EUI64.convert("aa:bb:cc:dd:11:22:33:55"),
+        1,
+        zigpy.zcl.ClusterType.Server,
+        Basic.cluster_id,
+        Basic.AttributeDefs.zcl_version.id,
+        0x34,
+        datetime.now(timezone.utc),
+    )
+
+    basic.update_attribute(Basic.AttributeDefs.app_version.id, 0x56)
+    await app.shutdown()
+
+    app2 = await make_app_with_db(db)
+    basic2 = app2.get_device(ieee=dev.ieee).endpoints[1].basic
+    assert basic2._attr_cache[Basic.AttributeDefs.zcl_version.id] == 0x12
+    assert basic2._attr_cache[Basic.AttributeDefs.app_version.id] == 0x56
+    await app2.shutdown()
+
+
+async def test_appdb_batching_preserves_order(tmp_path):
+    db = tmp_path / "test.db"
+    app = await make_app_with_db(db, **BATCHING_CONFIG)
+
+    dev = app.add_device(nwk=0x1234, ieee=t.EUI64.convert("aa:bb:cc:dd:11:22:33:44"))
+    dev.node_desc = make_node_desc(logical_type=zdo_t.LogicalType.Router)
+
+    ep = dev.add_endpoint(1)
+    ep.status = zigpy.endpoint.Status.ZDO_INIT
+    ep.profile_id = 260
+    ep.device_type = profiles.zha.DeviceType.PUMP
+
+    basic = ep.add_input_cluster(Basic.cluster_id)
+    app.device_initialized(dev)
+
+    # The attribute is written, cleared, and then written again in the same batch
+    basic.update_attribute(Basic.AttributeDefs.zcl_version.id, 0x12)
+    basic.update_attribute(Basic.AttributeDefs.app_version.id, 0x34)
+    basic.update_attribute(Basic.AttributeDefs.zcl_version.id, None)
+    basic.update_attribute(Basic.AttributeDefs.app_version.id, 0x56)
+    await app.shutdown()
+
+    app2 = await make_app_with_db(db)
+    basic2 = app2.get_device(ieee=dev.ieee).endpoints[1].basic
+    assert Basic.AttributeDefs.zcl_version.id not in basic2._attr_cache
+    assert basic2._attr_cache[Basic.AttributeDefs.app_version.id] == 0x56
+    await app2.shutdown()
+
+
+@patch("zigpy.appdb.MIN_UPDATE_DELTA", 0)
+async def test_appdb_batching_last_seen(tmp_path):
+    db = tmp_path / "test.db"
+    app = await make_app_with_db(db, **BATCHING_CONFIG)
+
+    dev = app.add_device(nwk=0x1234, ieee=t.EUI64.convert("aa:bb:cc:dd:11:22:33:44"))
+    dev.node_desc = make_node_desc(logical_type=zdo_t.LogicalType.Router)
+    dev.last_seen = 1000
+    ep = dev.add_endpoint(1)
+    ep.status = zigpy.endpoint.Status.ZDO_INIT
+    ep.profile_id = 260
+    ep.device_type = profiles.zha.DeviceType.PUMP
+    ep.add_input_cluster(Basic.cluster_id)
+    app.device_initialized(dev)
+    await app._dblistener._callback_handlers.join()
+
+    with patch.object(
+        app._dblistener,
+        "_save_devices_last_seen",
+        wraps=app._dblistener._save_devices_last_seen,
+    ) as save_last_seen:
+        for last_seen in range(2000, 2010):
+            dev.last_seen = last_seen
+
+        await app.shutdown()
+
+    assert save_last_seen.await_count == 1
+    assert save_last_seen.await_args.args[0] == [
+        (dev.ieee, datetime.fromtimestamp(2009, timezone.utc))
+    ]
+
+    app2 = await make_app_with_db(db)
+    assert app2.get_device(ieee=dev.ieee).last_seen == 2009
+    await app2.shutdown()
+
+
+async def test_load_pipelined(tmp_path, caplog):
+    """Test that tables are loaded in bulk with a timing breakdown per phase."""
+    db = tmp_path / "test.db"
+    app = await make_app_with_db(db)
+
+    dev = app.add_device(nwk=0x1234, ieee=t.EUI64.convert("aa:bb:cc:dd:11:22:33:44"))
+    dev.node_desc = make_node_desc(logical_type=zdo_t.LogicalType.Router)
+    ep = dev.add_endpoint(1)
+    ep.status = zigpy.endpoint.Status.ZDO_INIT
+    ep.profile_id = 260
+    ep.device_type = profiles.zha.DeviceType.PUMP
+    ep.add_input_cluster(Basic.cluster_id)
+    app.device_initialized(dev)
+    ep.basic.update_attribute(Basic.AttributeDefs.model.id, "Model")
+    await app.shutdown()
+
+    with caplog.at_level(logging.DEBUG, logger="zigpy.appdb"):
+        app2 = await make_app_with_db(db)
+
+    assert "Loaded application state in" in caplog.text
+    assert "clusters: " in caplog.text
+    assert "attributes: " in caplog.text
+
+    dev2 = app2.get_device(ieee=dev.ieee)
+    assert dev2.node_desc == dev.node_desc
+    assert dev2.model == "Model"
+    assert dev2.endpoints[1].basic._attr_last_updated[Basic.AttributeDefs.model.id]
+
+    await app2.shutdown()
+
+
+async def test_load_failure(tmp_path):
+    """Test that a failing load does not leave pending reads behind."""
+    db = tmp_path / "test.db"
+    app = await make_app_with_db(db)
+    await app.shutdown()
+
+    listener = await zigpy.appdb.PersistingListener.new(str(db), app)
+
+    load_patch = patch.object(
+        listener, "_load_endpoints", side_effect=RuntimeError("Uh oh")
+    )
+
+    with load_patch, pytest.raises(RuntimeError):
+        await listener.load()
+
+    # The connection is still usable
+    async with listener.execute(
+        f"SELECT count(*) FROM devices{zigpy.appdb.DB_V}"
+    ) as cursor:
+        assert await cursor.fetchone() == (0,)
+
+    await listener.shutdown()
+
+
+async def _populate_lazy_db(db: pathlib.Path) -> t.EUI64:
+    app = await make_app_with_db(db)
+
+    dev = app.add_device(nwk=0x1234, ieee=t.EUI64.convert("aa:bb:cc:dd:11:22:33:44"))
+    dev.node_desc = make_node_desc(logical_type=zdo_t.LogicalType.Router)
+    ep = dev.add_endpoint(1)
+    ep.status = zigpy.endpoint.Status.ZDO_INIT
+    ep.profile_id = 260
+    ep.device_type = profiles.zha.DeviceType.PUMP
+    ep.add_input_cluster(Basic.cluster_id)
+    ep.add_input_cluster(OnOff.cluster_id)
+    ep.add_input_cluster(LevelControl.cluster_id)
+    app.device_initialized(dev)
+
+    ep.basic.update_attribute(Basic.AttributeDefs.manufacturer.id, "Manufacturer")
+    ep.basic.update_attribute(Basic.AttributeDefs.model.id, "Model")
+    ep.on_off.update_attribute(OnOff.AttributeDefs.on_off.id, t.Bool.true)
+    ep.level.update_attribute(LevelControl.AttributeDefs.current_level.id, 100)
+    await app.shutdown()
+
+    return dev.ieee
+
+
+async def test_load_lazy_attributes(tmp_path):
+    """Test loading attribute caches on first access."""
+    db = tmp_path / "test.db"
+    ieee = await _populate_lazy_db(db)
+
+    app = await make_app_with_db(db, **{conf.CONF_DATABASE_LAZY_ATTRIBUTES: True})
+    lazy_attributes = app._dblistener._lazy_attributes
+    dev = app.get_device(ieee=ieee)
+
+    # Quirks can still be applied
+    assert dev.manufacturer == "Manufacturer"
+    assert dev.model == "Model"
+
+    assert "_attr_cache" not in dev.endpoints[1].on_off.__dict__
+    assert "_attr_cache" not in dev.endpoints[1].level.__dict__
+    assert len(lazy_attributes) == 0
+
+    success, failure = await dev.endpoints[1].on_off.read_attributes(
+        ["on_off"], allow_cache=True, only_cache=True
+    )
+    assert success == {"on_off": t.Bool.true}
+    assert not failure
+    assert dev.endpoints[1].on_off._attr_last_updated[OnOff.AttributeDefs.on_off.id]
+
+    assert "_attr_cache" in dev.endpoints[1].on_off.__dict__
+    assert "_attr_cache" not in dev.endpoints[1].level.__dict__
+    assert lazy_attributes.loads == 1
+
+    # Synchronous access does not block on the database, the cache is filled in later
+    assert dev.endpoints[1].basic.get("model") is None
+    assert lazy_attributes.loads == 2
+
+    await lazy_attributes.preload(dev.endpoints[1].basic)
+    assert dev.endpoints[1].basic.get("model") == "Model"
+    assert lazy_attributes.loads == 2
+
+    await app.shutdown()
+
+    # Caches that were never loaded are still persisted
+    app2 = await make_app_with_db(db)
+    dev2 = app2.get_device(ieee=ieee)
+    assert dev2.endpoints[1].level.get("current_level") == 100
+    await app2.shutdown()
+
+
+async def test_load_lazy_attributes_eviction(tmp_path):
+    """Test evicting the least recently used attribute caches."""
+    db = tmp_path / "test.db"
+    ieee = await _populate_lazy_db(db)
+
+    app = await make_app_with_db(
+        db,
+        **{
+            conf.CONF_DATABASE_LAZY_ATTRIBUTES: True,
+            conf.CONF_DATABASE_LAZY_ATTRIBUTES_MAX_CLUSTERS: 1,
+        },
+    )
+    lazy_attributes = app._dblistener._lazy_attributes
+    ep = app.get_device(ieee=ieee).endpoints[1]
+
+    ep.on_off.update_attribute(OnOff.AttributeDefs.on_off.id, t.Bool.false)
+    await lazy_attributes.preload(ep.on_off)
+    await lazy_attributes.preload(ep.level)
+    assert ep.level.get("current_level") == 100
+    assert len(lazy_attributes) == 2
+
+    # The pending write is persisted before the cache is evicted
+    await lazy_attributes._eviction_task
+
+    assert len(lazy_attributes) == 1
+    assert lazy_attributes.evictions == 1
+    assert "_attr_cache" not in ep.on_off.__dict__
+    assert "_attr_cache" in ep.level.__dict__
+
+    await lazy_attributes.preload(ep.on_off)
+    assert ep.on_off.get("on_off") == t.Bool.false
+    assert lazy_attributes.loads == 3
+
+    await app.shutdown()
+
+
+async def test_load_lazy_attributes_eviction_timestamps(tmp_path):
+    """Test that attribute update times do not go back after an eviction."""
+    db = tmp_path / "test.db"
+    ieee = await _populate_lazy_db(db)
+
+    app = await make_app_with_db(
+        db,
+        **{
+            conf.CONF_DATABASE_LAZY_ATTRIBUTES: True,
+            conf.CONF_DATABASE_LAZY_ATTRIBUTES_MAX_CLUSTERS: 1,
+        },
+    )
+    lazy_attributes = app._dblistener._lazy_attributes
+    ep = app.get_device(ieee=ieee).endpoints[1]
+    attr_id = OnOff.AttributeDefs.on_off.id
+
+    # An unchanged value within `MIN_UPDATE_DELTA` only updates the timestamp in memory
+    await lazy_attributes.preload(ep.on_off)
+    ep.on_off.update_attribute(attr_id, t.Bool.true)
+    last_updated = ep.on_off._attr_last_updated[attr_id]
+    await app._dblistener._callback_handlers.join()
+
+    await lazy_attributes.preload(ep.level)
+    await lazy_attributes._eviction_task
+    assert "_attr_cache" not in ep.on_off.__dict__
+
+    await lazy_attributes.preload(ep.on_off)
+    assert ep.on_off.get("on_off") == t.Bool.true
+    assert ep.on_off._attr_last_updated[attr_id] == last_updated
+
+    await app.shutdown()
+
+
+async def test_load_lazy_attributes_preload(tmp_path):
+    """Test that reading attributes loads the attribute cache asynchronously."""
+    db = tmp_path / "test.db"
+    ieee = await _populate_lazy_db(db)
+
+    app = await make_app_with_db(db, **{conf.CONF_DATABASE_LAZY_ATTRIBUTES: True})
+    lazy_attributes = app._dblistener._lazy_attributes
+    ep = app.get_device(ieee=ieee).endpoints[1]
+
+    with patch.object(lazy_attributes, "load", wraps=lazy_attributes.load) as load:
+        success, failure = await ep.on_off.read_attributes(
+            ["on_off"], allow_cache=True, only_cache=True
+        )
+
+    assert success == {"on_off": t.Bool.true}
+    assert not failure
+    assert len(load.mock_calls) == 0
+    assert lazy_attributes.loads == 1
+
+    await app.shutdown()
+
+
+async def test_load_lazy_attributes_initialized(tmp_path):
+    """Test that attribute caches are loaded before a device is signalled ready."""
+    db = tmp_path / "test.db"
+    ieee = await _populate_lazy_db(db)
+
+    app = await make_app_with_db(db, **{conf.CONF_DATABASE_LAZY_ATTRIBUTES: True})
+    lazy_attributes = app._dblistener._lazy_attributes
+    dev = app.get_device(ieee=ieee)
+
+    def device_initialized(device):
+        assert device.endpoints[1].on_off.__dict__["_attr_cache"] == {
+            OnOff.AttributeDefs.on_off.id: t.Bool.true
+        }
+        assert device.endpoints[1].level.__dict__["_attr_cache"] == {
+            LevelControl.AttributeDefs.current_level.id: 100
+        }
+
+    with patch.object(
+        app, "device_initialized", side_effect=device_initialized
+    ) as mock_initialized:
+        await dev.schedule_initialize()
+
+    assert mock_initialized.mock_calls == [call(dev)]
+    assert lazy_attributes.loads == 3
+
+    # Everything is loaded, the device is signalled immediately
+    with patch.object(app, "device_initialized") as mock_initialized:
+        assert dev.schedule_initialize() is None
+
+    assert mock_initialized.mock_calls == [call(dev)]
+
+    await app.shutdown()
+
+
+async def test_load_lazy_attributes_in_memory():
+    """Test that in-memory databases can load attribute caches lazily."""
+    app = await make_app_with_db(
+        ":memory:", **{conf.CONF_DATABASE_LAZY_ATTRIBUTES: True}
+    )
+    assert app._dblistener._lazy_attributes is not None
+
+    await app.shutdown()
@@ -8,6 +8,7 @@ import pytest
 
 import zigpy.application
 import zigpy.config as conf
+import zigpy.device
 from zigpy.exceptions import (
     DeliveryError,
     NetworkNotFormed,
@@ -139,6 +140,36 @@ async def test_remove(app, ieee):
         assert remove_device.await_count == 1
 
 
+async def test_remove_invalidates_source_routes(app, ieee):
+    """Test that removing a device discards source routes through it."""
+
+    with patch.object(
+        app.topology,
+        "invalidate_source_routes",
+        wraps=app.topology.invalidate_source_routes,
+    ) as invalidate_source_routes:
+        await _remove(app, ieee, [0])
+
+    assert invalidate_source_routes.call_count == 2
+
+
+async def test_remove_forgets_round_trip_times(app, ieee):
+    app._concurrency_controller = MagicMock()
+
+    await _remove(app, ieee, [0])
+
+    app._concurrency_controller.forget.assert_called_once_with(ieee)
+
+
+async def test_known_device_left_invalidates_source_routes(app, ieee):
+    app.add_device(ieee, 0x1234)
+
+    with patch.object(app.topology, "invalidate_source_routes") as invalidate:
+        app.handle_leave(0x1234, ieee)
+
+    assert invalidate.call_count == 1
+
+
 async def test_remove_with_failed_zdo(app, ieee):
     """Test remove with unsuccessful zdo status."""
 
@@ -200,6 +231,98 @@ def test_get_device_missing(app, ieee):
         app.get_device(nwk=8)
 
 
+def test_get_device_nwk_changed(app, ieee):
+    dev = app.add_device(ieee, 8)
+    dev.nwk = 9
+
+    assert app.get_device(nwk=9) is dev
+
+    with pytest.raises(KeyError):
+        app.get_device(nwk=8)
+
+    assert app.devices.check_nwk_index() == []
+
+
+def test_get_device_nwk_removed(app, ieee):
+    dev = app.add_device(ieee, 8)
+    app.devices.pop(dev.ieee)
+
+    with pytest.raises(KeyError):
+        app.get_device(nwk=8)
+
+    # Changing the NWK of a device that is no longer tracked does nothing
+    dev.nwk = 9
+
+    with pytest.raises(KeyError):
+        app.get_device(nwk=9)
+
+    assert app.devices.check_nwk_index() == []
+
+
+def test_get_device_nwk_replaced(app, ieee):
+    dev1 = app.add_device(ieee, 8)
+    dev2 = zigpy.device.Device(app, ieee, 9)
+    app.devices[ieee] = dev2
+
+    assert app.get_device(nwk=9) is dev2
+
+    with pytest.raises(KeyError):
+        app.get_device(nwk=8)
+
+    # The old device object is no longer indexed
+    dev1.nwk = 10
+
+    with pytest.raises(KeyError):
+        app.get_device(nwk=10)
+
+    assert app.devices.check_nwk_index() == []
+
+
+def test_get_device_nwk_conflict(app):
+    dev1 = app.add_device(make_ieee(1), 8)
+    dev2 = app.add_device(make_ieee(2), 8)
+
+    assert app.get_device(nwk=8) is dev1
+
+    del app.devices[dev1.ieee]
+    assert app.get_device(nwk=8) is dev2
+
+    app.devices.clear()
+
+    with pytest.raises(KeyError):
+        app.get_device(nwk=8)
+
+
+def test_device_dict_index_consistency(app):
+    dev1 = app.add_device(make_ieee(1), 8)
+    dev2 = app.add_device(make_ieee(2), 9)
+    assert app.devices.check_nwk_index() == []
+
+    # Bypass the index entirely
+    dev1._nwk = t.NWK(10)
+    dict.pop(app.devices, dev2.ieee)
+
+    assert len(app.devices.check_nwk_index()) == 3
+
+    app.devices.rebuild_nwk_index()
+    assert app.devices.check_nwk_index() == []
+    assert app.get_device(nwk=10) is dev1
+
+
+def test_get_device_nwk_does_not_scan(app):
+    devices = [
+        app.add_device(t.EUI64(i.to_bytes(8, "little")), i + 1) for i in range(10000)
+    ]
+
+    with patch.object(
+        zigpy.device.DeviceDict, "values", side_effect=AssertionError("scan")
+    ):
+        for dev in devices[::100]:
+            assert app.get_device(nwk=dev.nwk) is dev
+
+    assert app.devices.check_nwk_index() == []
+
+
 def test_device_property(app):
     app.add_device(nwk=0x0000, ieee=NCP_IEEE)
     assert app._device is app.get_device(ieee=NCP_IEEE)
@@ -704,6 +827,45 @@ async def test_relays_received_device_does_not_exist(app):
     app._discover_unknown_device.assert_called_once_with(nwk=0x1234)
 
 
+@patch("zigpy.application.DISCOVERY_BACKOFF_INITIAL_S", 0.05)
+@patch("zigpy.application.DISCOVERY_BROADCAST_BUDGET", 3)
+async def test_discover_unknown_device_suppressed(app):
+    release = asyncio.Event()
+
+    async def send_packet(packet: t.ZigbeePacket) -> None:
+        await release.wait()
+
+    app.send_packet = AsyncMock(side_effect=send_packet)
+
+    # Concurrent discoveries of a device are coalesced
+    first = asyncio.create_task(app._discover_unknown_device(nwk=0x1234))
+    second = asyncio.create_task(app._discover_unknown_device(nwk=0x1234))
+    await asyncio.sleep(0)
+    release.set()
+
+    assert await first is True
+    assert await second is False
+    assert app.send_packet.call_count == 1
+
+    # Repeated discoveries back off exponentially
+    assert await app._discover_unknown_device(nwk=0x1234) is False
+    await asyncio.sleep(0.06)
+    assert await app._discover_unknown_device(nwk=0x1234) is True
+    await asyncio.sleep(0.06)
+    assert await app._discover_unknown_device(nwk=0x1234) is False
+
+    # All devices share the broadcast budget
+    assert await app._discover_unknown_device(nwk=0x5678) is True
+    assert await app._discover_unknown_device(nwk=0xABCD) is False
+    assert app.send_packet.call_count == 3
+
+    counters = app.state.counters["device_discovery"]
+    assert counters["broadcasts"].value == 3
+    assert counters["coalesced"].value == 1
+    assert counters["backed_off"].value == 2
+    assert counters["over_budget"].value == 1
+
+
 async def test_request_concurrency():
     current_concurrency = 0
     peak_concurrency = 0
@@ -859,6 +1021,18 @@ def test_build_source_route_no_relays(app):
     assert app.build_source_route_to(device) is None
 
 
+def test_build_source_route_topology(app):
+    device = MagicMock()
+    device.relays = [0x1234, 0x5678]
+
+    with patch.object(
+        app.topology, "build_source_route_to", return_value=[0xABCD]
+    ) as build_source_route_to:
+        assert app.build_source_route_to(device) == [0xABCD]
+
+    build_source_route_to.assert_called_once_with(device)
+
+
 async def test_send_mrequest(app, packet):
     status, msg = await app.mrequest(
         group_id=0xABCD,
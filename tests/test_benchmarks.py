@@ -0,0 +1,82 @@
+"""Make sure the benchmark suite keeps working."""
+
+import json
+
+import pytest
+
+from benchmarks import runner
+import benchmarks.cases  # noqa: F401
+
+CONFIG = runner.BenchmarkConfig(devices=5, listeners=10, repeat=2, min_time=0)
+
+
+@pytest.mark.parametrize("name", list(runner.BENCHMARKS))
+async def test_benchmark(name):
+    result = await runner.run_benchmark(name, CONFIG)
+
+    assert result.name == name
+    assert result.number == 1
+    assert len(result.timings) == CONFIG.repeat
+    assert result.min > 0
+
+
+async def test_benchmark_compare():
+    results = await runner.run_benchmarks(
+        CONFIG, ["struct.serialize.*", "struct.deserialize.*"]
+    )
+    assert {result.name for result in results} == {
+        "struct.serialize.node_descriptor",
+        "struct.deserialize.node_descriptor",
+        "struct.deserialize.zcl_header",
+    }
+
+    baseline = json.loads(json.dumps(runner.results_to_json(CONFIG, results)))
+    baseline["benchmarks"]["struct.deserialize.zcl_header"]["median"] /= 10
+    del baseline["benchmarks"]["struct.serialize.node_descriptor"]
+
+    lines, regressions = runner.compare(baseline, results, threshold=0.5)
+
+    assert regressions == ["struct.deserialize.zcl_header"]
+    assert lines[0].split() == ["struct.serialize.node_descriptor", "new"]
+
+
+def test_benchmark_main(tmp_path, capsys):
+    baseline = tmp_path / "baseline.json"
+
+    assert runner.main(["--list"]) == 0
+    assert "appdb.load" in capsys.readouterr().out.splitlines()
+
+    assert (
+        runner.main(
+            [
+                "struct.serialize.*",
+                "--repeat",
+                "1",
+                "--min-time",
+                "0",
+                "--json",
+                str(baseline),
+            ]
+        )
+        == 0
+    )
+    assert (
+        "struct.serialize.node_descriptor"
+        in json.loads(baseline.read_text())["benchmarks"]
+    )
+
+    # `main` runs its own event loop
+    assert (
+        runner.main(
+            [
+                "struct.serialize.*",
+                "--min-time",
+                "0",
+                "--compare",
+                str(baseline),
+                "--threshold",
+                "1000",
+            ]
+        )
+        == 0
+    )
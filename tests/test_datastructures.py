@@ -1,9 +1,12 @@
 import asyncio
+import gc
 from unittest.mock import Mock, patch
 
 import pytest
 
 from zigpy import datastructures
+from zigpy.exceptions import ControllerException
+from zigpy.state import CounterGroup
 
 
 async def test_dynamic_bounded_semaphore_simple_locking():
@@ -345,3 +348,128 @@ async def test_debouncer_low_resolution_clock():
         # The two objects cannot be compared
         with pytest.raises(TypeError):
             obj1 < obj2  # noqa: B015
+
+
+async def test_debouncer_expiration_order():
+    """Test that objects expire in order, regardless of insertion order."""
+
+    loop = asyncio.get_running_loop()
+    now = loop.time()
+
+    debouncer = datastructures.Debouncer()
+
+    with patch.object(loop, "time", return_value=now):
+        objs = [object() for _ in range(5)]
+
+        for obj, expire_in in zip(objs, [5, 1, 4, 2, 3]):
+            debouncer.filter(obj, expire_in=expire_in)
+
+    debouncer.clean(now + 2.5)
+    assert not debouncer.is_filtered(objs[1], now=now + 2.5)
+    assert not debouncer.is_filtered(objs[3], now=now + 2.5)
+    assert debouncer.is_filtered(objs[0], now=now + 2.5)
+    assert debouncer.is_filtered(objs[2], now=now + 2.5)
+    assert debouncer.is_filtered(objs[4], now=now + 2.5)
+    assert repr(debouncer) == "<Debouncer [tracked:3]>"
+
+
+async def test_debouncer_max_size():
+    """Test that the debouncer evicts the objects closest to expiring when full."""
+
+    counters = CounterGroup("debouncer")
+    debouncer = datastructures.Debouncer(max_size=3, get_counters=lambda: counters)
+
+    assert not debouncer.filter("a", expire_in=10)
+    assert not debouncer.filter("b", expire_in=1)
+    assert not debouncer.filter("c", expire_in=5)
+    assert debouncer.filter("a", expire_in=10)
+    assert counters["hits"] == 1
+    assert counters["evictions"] == 0
+
+    # `b` expires first and is evicted
+    assert not debouncer.filter("d", expire_in=10)
+    assert counters["evictions"] == 1
+    assert repr(debouncer) == "<Debouncer [tracked:3]>"
+
+    assert not debouncer.is_filtered("b")
+    assert debouncer.is_filtered("a")
+    assert debouncer.is_filtered("c")
+    assert debouncer.is_filtered("d")
+
+
+async def test_debouncer_pool():
+    """Test that debouncers sharing a pool are bounded in total."""
+
+    pool = datastructures.DebouncerPool(max_size=3)
+    debouncer1 = datastructures.Debouncer(max_size=2, pool=pool)
+    debouncer2 = datastructures.Debouncer(max_size=2, pool=pool)
+
+    assert not debouncer1.filter("a", expire_in=1)
+    assert not debouncer1.filter("b", expire_in=10)
+    assert not debouncer2.filter("c", expire_in=5)
+    assert pool.size == 3
+
+    # The object closest to expiring in any debouncer is evicted
+    assert not debouncer2.filter("d", expire_in=10)
+    assert pool.size == 3
+    assert not debouncer1.is_filtered("a")
+    assert debouncer1.is_filtered("b")
+    assert debouncer2.is_filtered("c")
+    assert repr(pool) == "<DebouncerPool [tracked:3/3]>"
+
+    # Objects of debouncers that are gone no longer count
+    del debouncer1
+    gc.collect()
+    assert pool.size == 2
+
+
+def test_sequence_allocator():
+    """Test that TSNs are allocated in order, skipping the ones in use."""
+
+    pending = {2: object(), 3: object()}
+    counters = CounterGroup("sequence_allocator")
+    allocator = datastructures.SequenceAllocator(
+        in_use=pending, reuse_after=10, get_counters=lambda: counters
+    )
+
+    assert allocator.allocate(now=0) == 1
+    assert allocator.allocate(now=0) == 4
+    assert counters["collisions"] == 2
+    assert repr(allocator) == "<SequenceAllocator [sequence:4]>"
+
+    # The counter wraps around
+    assert [allocator.allocate(now=1) for _ in range(251)] == list(range(5, 256))
+    assert allocator.allocate(now=1) == 0
+    assert counters["early_reuses"] == 0
+
+    # Skipped TSNs are allocated after the others, once they are no longer pending
+    del pending[3]
+    assert allocator.allocate(now=2) == 1
+    assert allocator.allocate(now=3) == 3
+    assert counters["collisions"] == 3
+
+    # Only `1` had been allocated before, within `reuse_after`
+    assert counters["early_reuses"] == 1
+
+
+def test_sequence_allocator_exhausted():
+    """Test that allocation fails when every TSN is pending."""
+
+    pending = {}
+    counters = CounterGroup("sequence_allocator")
+    allocator = datastructures.SequenceAllocator(
+        in_use=pending, get_counters=lambda: counters
+    )
+
+    for _ in range(256):
+        pending[allocator.allocate()] = object()
+
+    assert len(pending) == 256
+
+    with pytest.raises(ControllerException):
+        allocator.allocate()
+
+    assert counters["exhausted"] == 1
+
+    del pending[100]
+    assert allocator.allocate() == 100
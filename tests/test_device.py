@@ -19,6 +19,7 @@ from zigpy.zcl.clusters.general import Basic, Ota
 from zigpy.zdo import types as zdo_t
 
 from .async_mock import ANY, AsyncMock, MagicMock, int_sentinel, patch, sentinel
+from .conftest import make_ieee
 
 
 @pytest.fixture
@@ -974,6 +975,82 @@ async def test_debouncing(dev):
             dev.packet_received(new_packet)
 
     assert len(packet_received.mock_calls) == 1
+    assert dev.application.state.counters["packet_debouncer"]["hits"] == 9
+
+    # Packets that differ in any other field are not duplicates
+    with dev.application.callback_for_response(
+        src=dev,
+        filters=[lambda hdr, cmd: True],
+        callback=packet_received,
+    ):
+        dev.packet_received(packet.replace(radius=5))
+        dev.packet_received(packet.replace(source_route=[0x1234]))
+        dev.packet_received(packet.replace(data=t.SerializableBytes(b"\t6\x02\x00")))
+
+    assert len(packet_received.mock_calls) == 4
+
+
+async def test_debouncing_bounded(dev):
+    """Test that packet deduplication memory is bounded per device."""
+
+    ep = dev.add_endpoint(1)
+    cluster = ep.add_input_cluster(0xEF00)
+
+    packet_received = MagicMock()
+
+    with dev.application.callback_for_response(
+        src=dev,
+        filters=[lambda hdr, cmd: True],
+        callback=packet_received,
+    ):
+        for i in range(3 * device.PACKET_DEBOUNCE_MAX_TRACKED):
+            dev.packet_received(
+                t.ZigbeePacket(
+                    src=t.AddrModeAddress(addr_mode=t.AddrMode.NWK, address=dev.nwk),
+                    src_ep=1,
+                    dst=t.AddrModeAddress(addr_mode=t.AddrMode.NWK, address=0x0000),
+                    dst_ep=1,
+                    tsn=i % 256,
+                    profile_id=260,
+                    cluster_id=cluster.cluster_id,
+                    data=t.SerializableBytes(
+                        b"\x09" + bytes([i % 256]) + b"\x00" + i.to_bytes(2, "little")
+                    ),
+                )
+            )
+
+    assert len(packet_received.mock_calls) == 3 * device.PACKET_DEBOUNCE_MAX_TRACKED
+    assert len(dev._packet_debouncer._queue) == device.PACKET_DEBOUNCE_MAX_TRACKED
+    counters = dev.application.state.counters["packet_debouncer"]
+    assert counters["evictions"] == 2 * device.PACKET_DEBOUNCE_MAX_TRACKED
+
+
+async def test_debouncing_bounded_globally(app_mock):
+    """Test that packet deduplication memory is bounded across devices."""
+
+    app_mock._packet_debouncer_pool.max_size = 10
+    devices = [app_mock.add_device(nwk=0x1000 + i, ieee=make_ieee(i)) for i in range(4)]
+
+    for dev in devices:
+        dev.add_endpoint(1).add_input_cluster(0xEF00)
+
+        for i in range(5):
+            dev.packet_received(
+                t.ZigbeePacket(
+                    src=t.AddrModeAddress(addr_mode=t.AddrMode.NWK, address=dev.nwk),
+                    src_ep=1,
+                    dst=t.AddrModeAddress(addr_mode=t.AddrMode.NWK, address=0x0000),
+                    dst_ep=1,
+                    tsn=i,
+                    profile_id=260,
+                    cluster_id=0xEF00,
+                    data=t.SerializableBytes(b"\x09" + bytes([i]) + b"\x00\x00\x00"),
+                )
+            )
+
+    assert app_mock._packet_debouncer_pool.size == 10
+    assert sum(len(dev._packet_debouncer._queue) for dev in devices) == 10
+    assert app_mock.state.counters["packet_debouncer"]["evictions"] == 10
 
 
 async def test_device_concurrency(dev: device.Device) -> None:
@@ -1048,3 +1125,20 @@ async def test_device_concurrency(dev: device.Device) -> None:
         t.PacketPriority.NORMAL,
         t.PacketPriority.LOW,
     ]
+
+
+async def test_get_sequence_skips_pending(dev):
+    """Test that TSNs of pending requests are not allocated again."""
+
+    assert dev.get_sequence() == 0x01
+
+    with dev._pending.new(0x02), dev._pending.new(0x03):
+        assert dev.get_sequence() == 0x04
+
+    # TSNs are otherwise reused as late as possible
+    assert [dev.get_sequence() for _ in range(252)] == [*range(0x05, 0x100), 0]
+    assert dev.get_sequence() == 0x01
+    assert dev.get_sequence() == 0x02
+
+    counters = dev._application.state.counters["device_sequence_allocator"]
+    assert counters["collisions"] == 2
@@ -16,6 +16,7 @@ def ep():
     dev = MagicMock()
     dev.request = AsyncMock()
     dev.reply = AsyncMock()
+    dev.read_batch_window = None
     return endpoint.Endpoint(dev, 1)
 
 
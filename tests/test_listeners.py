@@ -192,3 +192,100 @@ async def test_listener_callback_zdo(caplog):
         assert not listener.resolve(zdo_hdr, zdo_cmd)
 
     assert caplog.text == ""
+
+
+async def test_listener_index():
+    index = listeners.ListenerIndex()
+    assert not index
+
+    on_listener = listeners.FutureListener(
+        matchers=(on(),),
+        future=asyncio.get_running_loop().create_future(),
+    )
+    func_listener = listeners.CallbackListener(
+        matchers=(lambda hdr, cmd: True,),
+        callback=mock.Mock(),
+    )
+    on_off_listener = listeners.FutureListener(
+        matchers=(on(), off()),
+        future=asyncio.get_running_loop().create_future(),
+    )
+
+    index.append(on_listener)
+    index.append(func_listener)
+    index.append(on_off_listener)
+    assert len(index) == 3
+    assert list(index) == [on_listener, func_listener, on_off_listener]
+
+    # Candidates preserve registration order
+    assert index.candidates(on()) == [on_listener, func_listener, on_off_listener]
+    assert index.candidates(off()) == [func_listener, on_off_listener]
+    assert index.candidates(toggle()) == [func_listener]
+    assert index.candidates([zdo_t.Status.SUCCESS]) == [func_listener]
+
+    index.remove(func_listener)
+    assert index.candidates(on()) == [on_listener, on_off_listener]
+    assert index.candidates(toggle()) == []
+
+    index.remove(on_listener)
+    index.remove(on_off_listener)
+    assert not index
+    assert index._by_schema == {}
+    assert repr(index) == "<ListenerIndex [listeners:0]>"
+
+
+async def test_listener_index_duplicate():
+    index = listeners.ListenerIndex()
+
+    on_listener = listeners.FutureListener(
+        matchers=(on(),),
+        future=asyncio.get_running_loop().create_future(),
+    )
+    func_listener = listeners.CallbackListener(
+        matchers=(lambda hdr, cmd: True,),
+        callback=mock.Mock(),
+    )
+
+    index.append(on_listener)
+    index.append(func_listener)
+    index.append(on_listener)
+    assert index.candidates(on()) == [on_listener, func_listener, on_listener]
+
+    # Like a list, only the first registration is removed
+    index.remove(on_listener)
+    assert index.candidates(on()) == [func_listener, on_listener]
+
+    index.remove(on_listener)
+    assert index.candidates(on()) == [func_listener]
+
+    index.remove(func_listener)
+    assert not index
+    assert index._seqs == {}
+    assert index._by_schema == {}
+
+    with pytest.raises(KeyError):
+        index.remove(on_listener)
+
+
+async def test_listener_index_schema_subclass():
+    class CustomOn(on):
+        pass
+
+    index = listeners.ListenerIndex()
+
+    base_listener = listeners.FutureListener(
+        matchers=(on(),),
+        future=asyncio.get_running_loop().create_future(),
+    )
+    custom_listener = listeners.FutureListener(
+        matchers=(CustomOn(),),
+        future=asyncio.get_running_loop().create_future(),
+    )
+
+    index.append(base_listener)
+    index.append(custom_listener)
+
+    # `Struct.matches` works with subclasses in either direction
+    assert index.candidates(on()) == [base_listener, custom_listener]
+    assert index.candidates(CustomOn()) == [base_listener, custom_listener]
+    assert index.candidates(off()) == []
@@ -163,17 +163,141 @@ def test_model_manuf_device_sig(real_device):
         }
     }
 
+    # Signatures modified in place are not noticed for already resolved devices
     TestDevice.signature[SIG_MODEL] = "x"
+    registry = _dev_reg(TestDevice)
     assert registry.get_device(real_device) is real_device
 
     TestDevice.signature[SIG_MODEL] = "model"
     TestDevice.signature[SIG_MANUFACTURER] = "x"
+    registry = _dev_reg(TestDevice)
     assert registry.get_device(real_device) is real_device
 
     TestDevice.signature[SIG_MANUFACTURER] = "manufacturer"
+    registry = _dev_reg(TestDevice)
     assert isinstance(registry.get_device(real_device), TestDevice)
 
 
+def test_signature_fingerprint(real_device):
+    signature = {
+        SIG_ENDPOINTS: {
+            1: {
+                SIG_EP_PROFILE: 260,
+                SIG_EP_INPUT: [3, 3],
+                SIG_EP_OUTPUT: [6],
+            }
+        }
+    }
+
+    # Profiles and device types are not part of the fingerprint
+    assert zigpy.quirks.signature_fingerprint(
+        signature
+    ) == zigpy.quirks.device_fingerprint(real_device)
+    assert zigpy.quirks.signature_fingerprint({}) is None
+    assert zigpy.quirks.signature_fingerprint(
+        {SIG_ENDPOINTS: {1: {SIG_EP_INPUT: [3]}}}
+    ) != zigpy.quirks.device_fingerprint(real_device)
+
+    # The ZDO endpoint is ignored
+    real_device.add_endpoint(0)
+    assert zigpy.quirks.signature_fingerprint(
+        signature
+    ) == zigpy.quirks.device_fingerprint(real_device)
+
+
+def test_get_device_fingerprint_index(real_device):
+    def make_quirk(input_clusters):
+        class TestDevice:
+            signature = {
+                SIG_ENDPOINTS: {
+                    1: {SIG_EP_INPUT: input_clusters, SIG_EP_OUTPUT: [6]},
+                }
+            }
+
+            def __init__(*args, **kwargs):
+                pass
+
+        return TestDevice
+
+    quirk1 = make_quirk([3])
+    quirk2 = make_quirk([3, 4])
+    quirk3 = make_quirk([3])
+
+    registry = DeviceRegistry()
+    registry.add_to_registry(quirk1)
+    registry.add_to_registry(quirk2)
+    assert isinstance(registry.get_device(real_device), quirk1)
+
+    # Later registrations take priority
+    registry.add_to_registry(quirk3)
+    assert isinstance(registry.get_device(real_device), quirk3)
+    assert registry._candidates(None, None, frozenset()) == []
+    assert [
+        candidate
+        for candidate, _ in registry._candidates(
+            None, None, zigpy.quirks.device_fingerprint(real_device)
+        )
+    ] == [quirk3, quirk1]
+
+    registry.remove(quirk3)
+    assert isinstance(registry.get_device(real_device), quirk1)
+
+    registry.remove(quirk1)
+    assert registry.get_device(real_device) is real_device
+
+
+def test_get_device_resolution_cache(real_device, real_device_2):
+    class TestDevice:
+        signature = {
+            SIG_MODELS_INFO: [("manufacturer", "model")],
+            SIG_ENDPOINTS: {1: {SIG_EP_INPUT: [3], SIG_EP_OUTPUT: [6]}},
+        }
+
+        def __init__(*args, **kwargs):
+            pass
+
+    registry = DeviceRegistry()
+    registry.add_to_registry(TestDevice)
+
+    with patch.object(registry, "_resolve", wraps=registry._resolve) as resolve:
+        assert isinstance(registry.get_device(real_device), TestDevice)
+        assert isinstance(registry.get_device(real_device), TestDevice)
+        assert len(resolve.mock_calls) == 1
+
+        # A different manufacturer is a different signature
+        assert registry.get_device(real_device_2) is real_device_2
+        assert registry.get_device(real_device_2) is real_device_2
+        assert len(resolve.mock_calls) == 2
+
+        assert registry.resolution_cache_hits == 2
+        assert registry.resolution_cache_misses == 2
+
+        # Changing the endpoint layout changes the signature
+        real_device[1].device_type = 0x1234
+        assert isinstance(registry.get_device(real_device), TestDevice)
+        assert len(resolve.mock_calls) == 3
+
+        # Modifying a registered signature in place is only noticed on a cache miss
+        TestDevice.signature[SIG_ENDPOINTS][1][SIG_EP_INPUT] = [4]
+        assert isinstance(registry.get_device(real_device), TestDevice)
+        assert len(resolve.mock_calls) == 3
+
+        real_device[1].device_type = 0x5678
+        assert registry.get_device(real_device) is real_device
+        assert len(resolve.mock_calls) == 4
+
+        # The cache was cleared
+        real_device[1].device_type = 0x1234
+        assert registry.get_device(real_device) is real_device
+        assert len(resolve.mock_calls) == 5
+
+        # Modifying the registry clears the cache
+        registry.remove(TestDevice)
+        assert registry.get_device(real_device) is real_device
+        assert len(resolve.mock_calls) == 6
+        assert registry.resolution_cache_misses == 6
+
+
 def test_custom_devices():
     def _check_range(cluster):
         for left, right in zcl.Cluster._registry_range:
@@ -392,6 +516,7 @@ async def test_read_attributes_uncached():
     epmock = MagicMock()
     epmock._device.get_sequence.return_value = 123
     epmock.device.get_sequence.return_value = 123
+    epmock.device.read_batch_window = None
     cluster = TestCluster(epmock, True)
     cluster2 = TestCluster2(epmock, True)
 
@@ -484,6 +609,7 @@ async def test_read_attributes_default_response():
     epmock = MagicMock()
     epmock._device.get_sequence.return_value = 123
     epmock.device.get_sequence.return_value = 123
+    epmock.device.read_batch_window = None
     cluster = TestCluster(epmock, True)
 
     async def mockrequest(
@@ -542,6 +668,7 @@ def manuf_cluster():
 
     ep = MagicMock()
     ep.manufacturer_id = sentinel.manufacturer_id
+    ep.device.read_batch_window = None
     return ManufacturerSpecificCluster.from_id(ep, 0x2222)
 
 
@@ -555,6 +682,7 @@ def manuf_cluster2():
 
     ep = MagicMock()
     ep.manufacturer_id = sentinel.manufacturer_id2
+    ep.device.read_batch_window = None
     cluster = ManufCluster2(ep)
     cluster.cluster_id = 0xFC00
     return cluster
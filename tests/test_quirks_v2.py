@@ -1,7 +1,7 @@
 """Tests for the quirks v2 module."""
 
 from typing import Final
-from unittest.mock import AsyncMock
+from unittest.mock import AsyncMock, patch
 
 import pytest
 
@@ -1132,3 +1132,141 @@ async def test_quirks_v2_no_friendly_name(device_mock: Device) -> None:
     )
 
     assert entry.friendly_name is None
+
+
+async def test_quirks_v2_device_template(device_mock: Device) -> None:
+    """Test that devices built from a template match replaying the quirk metadata."""
+    from zigpy.quirks.v2 import _DEVICE_TEMPLATES, _device_layout
+
+    registry = DeviceRegistry()
+
+    device_mock[1].add_input_cluster(Groups.cluster_id)
+    device_mock[1].add_input_cluster(Scenes.cluster_id)
+    device_mock[1].add_input_cluster(Alarms.cluster_id)
+    device_mock[1].alarms.update_attribute(Alarms.AttributeDefs.alarm_count.id, 10)
+    device_mock[1].groups.update_attribute(Groups.AttributeDefs.name_support.id, 0)
+
+    device_mock.add_endpoint(2)
+    device_mock[2].profile_id = 255
+    device_mock[2].device_type = 255
+    device_mock[2].add_output_cluster(Identify.cluster_id)
+
+    class CustomOnOffCluster(CustomCluster, OnOff):
+        """Custom on off cluster for testing quirks v2."""
+
+    class CustomIdentifyCluster(CustomCluster, Identify):
+        """Custom identify cluster for testing quirks v2."""
+
+    class CustomScenesCluster(CustomCluster, Scenes):
+        """Custom scenes cluster for testing quirks v2."""
+
+    entry = (
+        QuirkBuilder(device_mock.manufacturer, device_mock.model, registry=registry)
+        .adds(CustomOnOffCluster, constant_attributes={OnOff.AttributeDefs.on_off: 1})
+        .adds(Basic.cluster_id)
+        .adds(LevelControl.cluster_id, cluster_type=ClusterType.Client)
+        .removes(Groups.cluster_id)
+        .replaces(CustomScenesCluster)
+        .replace_cluster_occurrences(CustomIdentifyCluster)
+        .enum(
+            OnOff.AttributeDefs.start_up_on_off.name,
+            OnOff.StartUpOnOff,
+            OnOff.cluster_id,
+            translation_key="start_up_on_off",
+            fallback_name="Start up on/off",
+        )
+        .add_to_registry()
+    )
+
+    # The first device is built by replaying the metadata, the rest from its result
+    with patch.object(
+        CustomDeviceV2, "_apply_template", autospec=True
+    ) as apply_template:
+        replayed: CustomDeviceV2 = registry.get_device(device_mock)
+
+    assert len(apply_template.mock_calls) == 0
+    assert _device_layout(device_mock) in _DEVICE_TEMPLATES[entry]
+
+    with patch.object(
+        CustomDeviceV2, "_apply_metadata", autospec=True
+    ) as apply_metadata:
+        templated: CustomDeviceV2 = registry.get_device(device_mock)
+
+    assert len(apply_metadata.mock_calls) == 0
+
+    def layout(device: CustomDeviceV2) -> list:
+        return [
+            (
+                endpoint_id,
+                type(endpoint),
+                endpoint.profile_id,
+                endpoint.device_type,
+                [
+                    (cluster.cluster_id, type(cluster), cluster.is_server)
+                    for cluster in clusters.values()
+                ],
+                [cluster._attr_cache for cluster in clusters.values()],
+                [
+                    getattr(cluster, "_CONSTANT_ATTRIBUTES", None)
+                    for cluster in clusters.values()
+                ],
+                {
+                    name: (cluster.cluster_id, type(cluster), cluster.is_server)
+                    for name, cluster in endpoint._cluster_attr.items()
+                },
+            )
+            for endpoint_id, endpoint in device.endpoints.items()
+            if endpoint_id != 0
+            for clusters in (endpoint.in_clusters, endpoint.out_clusters)
+        ]
+
+    assert layout(templated) == layout(replayed)
+    assert templated.exposes_metadata == replayed.exposes_metadata
+    assert templated[1].profile_id == replayed[1].profile_id == 255
+    assert templated[1].on_off._CONSTANT_ATTRIBUTES == {"on_off": 1}
+    assert templated[1].alarms._attr_cache == {Alarms.AttributeDefs.alarm_count.id: 10}
+    assert isinstance(
+        templated[2].out_clusters[Identify.cluster_id], CustomIdentifyCluster
+    )
+
+    # Clusters are not shared between devices
+    assert templated[1].on_off is not replayed[1].on_off
+    assert templated[1].on_off.endpoint is templated[1]
+
+    # Removed clusters are not reachable through endpoint attributes either
+    for device in (templated, replayed):
+        assert Groups.cluster_id not in device[1].in_clusters
+        assert not hasattr(device[1], "groups")
+
+
+async def test_quirks_v2_device_template_cache(device_mock: Device) -> None:
+    """Test that device templates are bounded and dropped along with their quirk."""
+    import gc
+
+    from zigpy.quirks.v2 import (
+        _DEVICE_TEMPLATES,
+        MAX_DEVICE_TEMPLATES_PER_QUIRK,
+        _device_layout,
+    )
+
+    registry = DeviceRegistry()
+    entry = (
+        QuirkBuilder(device_mock.manufacturer, device_mock.model, registry=registry)
+        .adds(Basic.cluster_id)
+        .add_to_registry()
+    )
+
+    layouts = []
+
+    for cluster_id in range(MAX_DEVICE_TEMPLATES_PER_QUIRK + 1):
+        device_mock[1].add_output_cluster(0xFC00 + cluster_id)
+        layouts.append(_device_layout(device_mock))
+        registry.get_device(device_mock)
+
+    assert list(_DEVICE_TEMPLATES[entry]) == layouts[1:]
+
+    registry.remove(entry.create_device(device_mock))
+    del entry
+    gc.collect()
+
+    assert not any(layouts[-1] in templates for templates in _DEVICE_TEMPLATES.values())
@@ -0,0 +1,406 @@
+from __future__ import annotations
+
+import asyncio
+from unittest.mock import patch
+
+import pytest
+
+from tests.conftest import App, make_app, make_ieee, make_node_desc
+import zigpy.config as conf
+from zigpy.datastructures import PriorityDynamicBoundedSemaphore
+import zigpy.exceptions
+from zigpy.scheduler import ConcurrencyController, DestinationClass, RequestScheduler
+import zigpy.state
+import zigpy.zcl
+import zigpy.zdo.types as zdo_t
+
+
+def make_scheduler(**budgets: int | None) -> RequestScheduler:
+    return RequestScheduler(
+        {DestinationClass[name.upper()]: budget for name, budget in budgets.items()},
+        max_queue_time=None,
+        counters=zigpy.state.CounterGroup("request_scheduler"),
+    )
+
+
+async def test_scheduler_budgets() -> None:
+    scheduler = make_scheduler(router=None, end_device=2)
+    peak = {DestinationClass.ROUTER: 0, DestinationClass.END_DEVICE: 0}
+
+    async def send(dest_class: DestinationClass) -> None:
+        async with scheduler.schedule(dest_class):
+            peak[dest_class] = max(peak[dest_class], scheduler.in_flight(dest_class))
+            await asyncio.sleep(0.01)
+
+    await asyncio.gather(
+        *[send(DestinationClass.END_DEVICE) for _ in range(10)],
+        *[send(DestinationClass.ROUTER) for _ in range(10)],
+    )
+
+    # Router requests are not held up by end device requests
+    assert peak == {DestinationClass.ROUTER: 10, DestinationClass.END_DEVICE: 2}
+    assert scheduler.in_flight(DestinationClass.END_DEVICE) == 0
+    assert scheduler.num_waiting(DestinationClass.END_DEVICE) == 0
+
+    assert sum(scheduler.wait_histogram(DestinationClass.ROUTER).values()) == 10
+    assert scheduler.wait_histogram(DestinationClass.ROUTER) == {"wait_le_0.01s": 10}
+    assert sum(scheduler.wait_histogram(DestinationClass.END_DEVICE).values()) == 10
+    assert scheduler.wait_histogram(DestinationClass.BROADCAST) == {}
+
+
+async def test_scheduler_deadline() -> None:
+    scheduler = make_scheduler(broadcast=1)
+    loop = asyncio.get_running_loop()
+
+    async def send(deadline: float | None) -> None:
+        async with scheduler.schedule(DestinationClass.BROADCAST, deadline=deadline):
+            await asyncio.sleep(0.1)
+
+    results = await asyncio.gather(
+        send(deadline=None),
+        send(deadline=loop.time() + 0.05),
+        send(deadline=loop.time() + 0.5),
+        return_exceptions=True,
+    )
+
+    assert results[0] is None
+    assert isinstance(results[1], zigpy.exceptions.SendError)
+    assert results[2] is None
+
+    # Requests with an expired deadline are dropped even when nothing is queued
+    with pytest.raises(zigpy.exceptions.SendError):
+        await send(deadline=loop.time() - 1)
+
+    assert scheduler._counters["broadcast"]["dropped"] == 2
+    assert scheduler.num_waiting(DestinationClass.BROADCAST) == 0
+    assert scheduler.in_flight(DestinationClass.BROADCAST) == 0
+
+
+async def test_application_request_scheduling() -> None:
+    peak_concurrency = 0
+    current_concurrency = 0
+
+    class SlowApp(App):
+        async def send_packet(self, packet):
+            nonlocal current_concurrency, peak_concurrency
+
+            async with self._limit_concurrency():
+                current_concurrency += 1
+                peak_concurrency = max(peak_concurrency, current_concurrency)
+
+                await asyncio.sleep(0.05)
+                current_concurrency -= 1
+
+    app = make_app(
+        {
+            conf.CONF_MAX_CONCURRENT_REQUESTS: 16,
+            conf.CONF_MAX_CONCURRENT_END_DEVICE_REQUESTS: 3,
+            conf.CONF_MAX_REQUEST_QUEUE_TIME: 0.075,
+        },
+        app_base=SlowApp,
+    )
+
+    end_device = app.add_device(nwk=0x1234, ieee=make_ieee(1))
+    end_device.node_desc = make_node_desc(logical_type=zdo_t.LogicalType.EndDevice)
+
+    results = await asyncio.gather(
+        *[
+            app.request(end_device, 0x0104, 0x0006, 1, 1, tsn, b"data")
+            for tsn in range(9)
+        ],
+        return_exceptions=True,
+    )
+
+    # Only as many requests as fit in the end device budget before the queue time
+    # expires are sent, the others are dropped
+    assert peak_concurrency == 3
+    assert results.count((zigpy.zcl.foundation.Status.SUCCESS, "")) == 6
+    assert all(
+        isinstance(result, zigpy.exceptions.SendError)
+        for result in results
+        if result != (zigpy.zcl.foundation.Status.SUCCESS, "")
+    )
+    assert app.state.counters["request_scheduler"]["end_device"]["dropped"] == 3
+
+    # Broadcasts are budgeted separately
+    await app.broadcast(0x0104, 0x0006, 1, 1, 0x0000, 0, 0, b"data")
+
+    counters = app.state.counters["request_scheduler"]["broadcast"]
+    assert counters["wait_le_0.01s"] == 1
+
+
+class GlobalLimitApp(App):
+    async def send_packet(self, packet):
+        async with self._limit_concurrency():
+            await asyncio.sleep(0.05)
+
+
+async def test_router_request_deadline_global_limit() -> None:
+    app = make_app(
+        {
+            conf.CONF_MAX_CONCURRENT_REQUESTS: 1,
+            conf.CONF_MAX_REQUEST_QUEUE_TIME: 0.075,
+        },
+        app_base=GlobalLimitApp,
+    )
+
+    router = app.add_device(nwk=0x1234, ieee=make_ieee(1))
+    router.node_desc = make_node_desc(logical_type=zdo_t.LogicalType.Router)
+
+    results = await asyncio.gather(
+        *[app.request(router, 0x0104, 0x0006, 1, 1, tsn, b"data") for tsn in range(3)],
+        return_exceptions=True,
+    )
+
+    # Routers have no budget of their own, the deadline applies to the global limit
+    assert results[:2] == [(zigpy.zcl.foundation.Status.SUCCESS, "")] * 2
+    assert isinstance(results[2], zigpy.exceptions.SendError)
+
+    counters = app.state.counters["request_scheduler"]["router"]
+    assert counters["dropped"] == 1
+    assert app._concurrent_requests_semaphore.value == 1
+
+
+async def test_device_request_rtt_excludes_global_queue() -> None:
+    app = make_app({conf.CONF_MAX_CONCURRENT_REQUESTS: 1}, app_base=GlobalLimitApp)
+
+    routers = []
+
+    for index in range(2):
+        router = app.add_device(nwk=0x1234 + index, ieee=make_ieee(index))
+        router.node_desc = make_node_desc(logical_type=zdo_t.LogicalType.Router)
+        routers.append(router)
+
+    with patch.object(app, "_handle_request_result") as handle_request_result:
+        await asyncio.gather(
+            *[
+                router.request(0x0104, 0x0006, 1, 1, 1, b"data", expect_reply=False)
+                for router in routers
+            ]
+        )
+
+    # The second request waited for the first one to be sent
+    rtts = sorted(c.kwargs["rtt"] for c in handle_request_result.mock_calls)
+    assert rtts[1] < 0.09
+
+
+async def test_unknown_devices_not_budgeted_as_end_devices() -> None:
+    app = make_app({conf.CONF_MAX_CONCURRENT_END_DEVICE_REQUESTS: 1})
+
+    device = app.add_device(nwk=0x1234, ieee=make_ieee(1))
+    assert device.node_desc is None
+    assert DestinationClass.for_device(device) is DestinationClass.UNKNOWN
+
+    async def send_packet(packet):
+        await asyncio.sleep(0.01)
+
+    app.send_packet.side_effect = send_packet
+
+    await asyncio.gather(
+        *[app.request(device, 0x0104, 0x0006, 1, 1, tsn, b"data") for tsn in range(4)]
+    )
+
+    counters = app.state.counters["request_scheduler"]
+    assert counters["unknown"]["wait_le_0.01s"] == 4
+    assert "end_device" not in counters
+
+    device.node_desc = make_node_desc(logical_type=zdo_t.LogicalType.EndDevice)
+    assert DestinationClass.for_device(device) is DestinationClass.END_DEVICE
+
+    device.node_desc = make_node_desc(logical_type=zdo_t.LogicalType.Router)
+    assert DestinationClass.for_device(device) is DestinationClass.ROUTER
+
+
+async def test_endpoint_request_deadline() -> None:
+    app = make_app({})
+
+    device = app.add_device(nwk=0x1234, ieee=make_ieee(1))
+    device.node_desc = make_node_desc(logical_type=zdo_t.LogicalType.Router)
+    ep = device.add_endpoint(1)
+    ep.profile_id = 0x0104
+
+    loop = asyncio.get_running_loop()
+
+    with pytest.raises(zigpy.exceptions.SendError):
+        await ep.request(
+            0x0006, 1, b"data", expect_reply=False, deadline=loop.time() - 1
+        )
+
+    assert app.send_packet.call_count == 0
+    assert app.state.counters["request_scheduler"]["router"]["dropped"] == 1
+
+
+def make_controller(
+    value: int, *, min_value: int = 1, max_value: int = 8, **kwargs
+) -> ConcurrencyController:
+    return ConcurrencyController(
+        PriorityDynamicBoundedSemaphore(value),
+        min_value=min_value,
+        max_value=max_value,
+        counters=zigpy.state.CounterGroup("adaptive_concurrency"),
+        **kwargs,
+    )
+
+
+@patch("zigpy.scheduler.CONCURRENCY_DECREASE_COOLDOWN_S", 0)
+async def test_concurrency_controller_aimd() -> None:
+    controller = make_controller(4, max_value=6, failure_window=4)
+
+    # The limit grows by one after every full window of successful requests
+    for _ in range(4 + 5 + 6 + 6):
+        controller.record_success(rtt=0.1)
+
+    assert controller.limit == 6
+    assert controller._counters["concurrency_increased"] == 2
+
+    # And is halved on failure, down to the floor
+    controller.record_failure()
+    assert controller.limit == 3
+
+    controller.record_failure()
+    controller.record_failure()
+    assert controller.limit == 1
+    assert controller._counters["concurrency_decreased_failure"] == 2
+
+    # Rising round-trip times shrink it as well
+    controller.semaphore.max_value = 4
+
+    for _ in range(10):
+        controller.record_success(rtt=1.0)
+
+    assert controller.limit < 4
+    assert controller._counters["concurrency_decreased_latency"].value > 0
+
+
+@patch("zigpy.scheduler.CONCURRENCY_DECREASE_COOLDOWN_S", 0)
+async def test_concurrency_controller_failure_rate() -> None:
+    controller = make_controller(8, failure_window=20, min_failing_sources=2)
+
+    # Occasional failures are tolerated
+    for _ in range(4):
+        controller.record_success(rtt=0.1, source="a")
+        controller.record_success(rtt=0.1, source="b")
+        controller.record_failure(source="a")
+
+    assert controller.limit == 8
+
+    # As are failures of a single destination, however many there are
+    for _ in range(10):
+        controller.record_failure(source="a")
+
+    assert controller.limit == 8
+
+    # But not once a larger share of the requests to other destinations fails
+    controller.record_failure(source="b")
+    assert controller.limit == 4
+    assert controller._counters["concurrency_decreased_failure"] == 1
+
+    # The window starts over after a decrease
+    controller.record_failure(source="a")
+    controller.record_failure(source="b")
+    assert controller.limit == 4
+
+
+@patch("zigpy.scheduler.CONCURRENCY_DECREASE_COOLDOWN_S", 0)
+async def test_concurrency_controller_rtt_per_source() -> None:
+    controller = make_controller(4)
+
+    # Destinations that are further away do not look congested next to closer ones
+    for _ in range(20):
+        controller.record_success(rtt=0.01, source="near")
+        controller.record_success(rtt=0.5, source="far")
+
+    assert controller.limit == 8
+    assert controller._counters["concurrency_decreased_latency"] == 0
+
+    # Only their own round-trip times rising does
+    for _ in range(10):
+        controller.record_success(rtt=2.0, source="far")
+
+    assert controller.limit < 8
+    assert controller._counters["concurrency_decreased_latency"].value > 0
+
+    controller.forget("far")
+    assert "far" not in controller._rtt
+
+
+async def test_concurrency_controller_cooldown() -> None:
+    controller = make_controller(8, failure_window=1)
+
+    # Failures of a burst of requests only decrease the limit once
+    for _ in range(5):
+        controller.record_failure()
+
+    assert controller.limit == 4
+    assert controller._counters["concurrency_decreased_failure"] == 1
+
+    # Values outside of the bounds are clamped
+    assert make_controller(8, max_value=4).limit == 4
+    assert make_controller(1, min_value=2).limit == 2
+
+
+@patch("zigpy.scheduler.CONCURRENCY_DECREASE_COOLDOWN_S", 0)
+async def test_device_request_adaptive_concurrency() -> None:
+    app = make_app(
+        {
+            conf.CONF_MAX_CONCURRENT_REQUESTS: 4,
+            conf.CONF_ADAPTIVE_CONCURRENCY: True,
+            conf.CONF_ADAPTIVE_DEVICE_CONCURRENCY_MAX: 2,
+        }
+    )
+
+    router = app.add_device(nwk=0x1234, ieee=make_ieee(1))
+    router.node_desc = make_node_desc(logical_type=zdo_t.LogicalType.Router)
+
+    end_device = app.add_device(nwk=0x5678, ieee=make_ieee(2))
+    end_device.node_desc = make_node_desc(logical_type=zdo_t.LogicalType.EndDevice)
+
+    for tsn in range(4):
+        await router.request(0x0104, 0x0006, 1, 1, tsn, b"data", expect_reply=False)
+
+    assert app._concurrent_requests_semaphore.max_value == 5
+    assert router._concurrent_requests_semaphore.max_value == 2
+    assert app.state.device_counters[str(router.ieee)]["concurrency_increased"] == 1
+
+    # Requests dropped by the scheduler are not failures
+    app.send_packet.side_effect = zigpy.exceptions.SendError("Dropped")
+
+    with pytest.raises(zigpy.exceptions.SendError):
+        await router.request(0x0104, 0x0006, 1, 1, 4, b"data", expect_reply=False)
+
+    assert router._concurrent_requests_semaphore.max_value == 2
+
+    # Failures of a single router only lower its own limit
+    app.send_packet.side_effect = zigpy.exceptions.DeliveryError("Failure")
+
+    for tsn in range(5, 10):
+        with pytest.raises(zigpy.exceptions.DeliveryError):
+            await router.request(0x0104, 0x0006, 1, 1, tsn, b"data", expect_reply=False)
+
+    assert app._concurrent_requests_semaphore.max_value == 5
+    assert router._concurrent_requests_semaphore.max_value == 1
+    assert (
+        app.state.device_counters[str(router.ieee)]["concurrency_decreased_failure"]
+        == 1
+    )
+
+    # The global limit is halved once requests to other routers fail as well
+    other_router = app.add_device(nwk=0x4321, ieee=make_ieee(3))
+    other_router.node_desc = make_node_desc(logical_type=zdo_t.LogicalType.Router)
+
+    with pytest.raises(zigpy.exceptions.DeliveryError):
+        await other_router.request(
+            0x0104, 0x0006, 1, 1, 10, b"data", expect_reply=False
+        )
+
+    assert app._concurrent_requests_semaphore.max_value == 2
+    assert (
+        app.state.counters["adaptive_concurrency"]["concurrency_decreased_failure"] == 1
+    )
+
+    # Failures of sleepy end devices are not a sign of congestion
+    with pytest.raises(zigpy.exceptions.DeliveryError):
+        await end_device.request(0x0104, 0x0006, 1, 1, 6, b"data", expect_reply=False)
+
+    assert app._concurrent_requests_semaphore.max_value == 2
+    assert end_device._concurrency_controller is None
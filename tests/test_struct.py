@@ -1,11 +1,13 @@
 from __future__ import annotations
 
 import enum
+import random
 from unittest import mock
 
 import pytest
 
 import zigpy.types as t
+from zigpy.types.struct import _pack_bitfields, _unpack_bitfields
 from zigpy.zcl.foundation import Status
 import zigpy.zdo.types as zdo_t
 
@@ -210,6 +212,25 @@ def test_struct_init():
     assert ts4.serialize() != ts2.serialize()
 
 
+def test_struct_init_arguments():
+    class TestStruct(t.Struct):
+        a: t.uint8_t
+        b: t.uint16_t
+
+    assert TestStruct(1, 2) == TestStruct(a=1, b=2)
+    assert TestStruct(1, b=2) == TestStruct(a=1, b=2)
+    assert TestStruct(b=2).a is None
+
+    with pytest.raises(TypeError):
+        TestStruct(1, 2, 3)
+
+    with pytest.raises(TypeError):
+        TestStruct(1, a=1)
+
+    with pytest.raises(TypeError):
+        TestStruct(c=1)
+
+
 def test_struct_string_is_none():
     class TestStruct(t.Struct):
         a: t.CharacterString
@@ -701,6 +722,79 @@ def test_bitstruct_complex():
     assert neighbor2.serialize() == data
 
 
+class int4s(t.int_t, bits=4):
+    pass
+
+
+@pytest.mark.parametrize(
+    "types",
+    [
+        [t.uint4_t, t.uint4_t],
+        [t.uint1_t, t.uint3_t, t.uint1_t, t.uint3_t],
+        [t.uint1_t, t.uint8_t, t.uint7_t],
+        [t.uint4_t, t.uint16_t, t.uint4_t],
+        [int4s, t.uint2_t, int4s, t.uint6_t],
+        [zdo_t.LogicalType, t.uint1_t, t.uint1_t, t.uint3_t],
+        [t.bitmap4, t.enum2, t.uint2_t, t.uint24_t],
+    ],
+)
+def test_bitfield_codec_golden(types):
+    """The integer bitfield codec matches packing individual bits."""
+    rng = random.Random(0)
+
+    for _ in range(200):
+        values = [
+            typ(rng.randint(typ.min_value, typ.max_value))
+            if not issubclass(typ, enum.Enum)
+            else typ(rng.randint(0, 2**typ._bits - 1))
+            for typ in types
+        ]
+
+        packed = _pack_bitfields(values)
+        assert packed == t.Bits.from_bitfields(values).serialize()
+
+        bits, _ = t.Bits.deserialize(packed)
+        expected = []
+
+        for typ in types:
+            value, bits = typ.from_bits(bits)
+            expected.append(value)
+
+        unpacked = _unpack_bitfields(types, packed)
+        assert unpacked == expected == values
+        assert [type(v) for v in unpacked] == [type(v) for v in expected]
+
+
+def test_struct_layout():
+    class StaticStruct(t.Struct):
+        foo: t.uint4_t
+        bar: t.uint4_t
+        baz: t.uint16_t
+
+    class DynamicStruct(t.Struct):
+        foo: t.uint4_t
+        bar: t.uint4_t
+        baz: t.uint16_t = t.StructField(requires=lambda s: True)
+
+    assert StaticStruct._layout is not None
+    assert DynamicStruct._layout is None
+
+    data = b"\xa5\x34\x12"
+
+    static, rest = StaticStruct.deserialize(data + b"\xff")
+    dynamic, rest2 = DynamicStruct.deserialize(data + b"\xff")
+
+    assert rest == rest2 == b"\xff"
+    assert static.as_dict() == dynamic.as_dict() == {"foo": 5, "bar": 10, "baz": 0x1234}
+    assert static.serialize() == dynamic.serialize() == data
+
+    with pytest.raises(ValueError):
+        StaticStruct(foo=1, baz=2).serialize()
+
+    with pytest.raises(ValueError):
+        StaticStruct.deserialize(b"\xa5\x34")
+
+
 def test_int_struct():
     class NonIntegralStruct(t.Struct):
         foo: t.uint8_t
@@ -956,3 +1050,22 @@ def test_frozen_struct():
         frozen,
         frozen.replace(a=2),
     }
+
+
+def test_deserialize_from_offset():
+    class TestStruct(t.Struct):
+        foo: t.uint4_t
+        bar: t.uint4_t
+        baz: t.LVBytes
+        qux: t.uint16_t = t.StructField(optional=True)
+
+    data = b"\xff\x21\x03abc\x34\x12\x21\x00"
+
+    assert TestStruct.deserialize_from(data, 1) == (
+        TestStruct(foo=0x1, bar=0x2, baz=b"abc", qux=0x1234),
+        8,
+    )
+    assert TestStruct.deserialize_from(data, 8) == (
+        TestStruct(foo=0x1, bar=0x2, baz=b""),
+        10,
+    )
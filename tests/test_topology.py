@@ -6,7 +6,13 @@ from unittest import mock
 
 import pytest
 
-from tests.conftest import App, make_ieee, make_neighbor, make_route
+from tests.conftest import (
+    App,
+    make_ieee,
+    make_neighbor,
+    make_neighbor_from_device,
+    make_route,
+)
 import zigpy.config as conf
 import zigpy.device
 import zigpy.endpoint
@@ -47,7 +53,9 @@ def patch_device_tables(
     neighbors: list | BaseException | zdo_t.Status,
     routes: list | BaseException | zdo_t.Status,
 ):
-    def mgmt_lqi_req(StartIndex: t.uint8_t):
+    def mgmt_lqi_req(StartIndex: t.uint8_t, *, priority: int):
+        assert priority == t.PacketPriority.LOW
+
         status = zdo_t.Status.SUCCESS
         entries = 0
         start_index = 0
@@ -73,7 +81,9 @@ def patch_device_tables(
             }.values()
         )
 
-    def mgmt_rtg_req(StartIndex: t.uint8_t):
+    def mgmt_rtg_req(StartIndex: t.uint8_t, *, priority: int):
+        assert priority == t.PacketPriority.LOW
+
         status = zdo_t.Status.SUCCESS
         entries = 0
         start_index = 0
@@ -246,6 +256,237 @@ async def test_scan_router_many(topology, make_initialized_device) -> None:
     ]
 
 
+async def test_scan_concurrent_routers(topology, make_initialized_device) -> None:
+    topology._app.config[conf.CONF_TOPO_SCAN_CONCURRENCY] = 2
+    devices = [make_initialized_device(topology._app) for _ in range(6)]
+
+    concurrency = 0
+    max_concurrency = 0
+
+    async def scan_router(
+        device: zigpy.device.Device, *, incremental: bool = False
+    ) -> bool:
+        nonlocal concurrency
+        nonlocal max_concurrency
+
+        concurrency += 1
+        max_concurrency = max(concurrency, max_concurrency)
+
+        try:
+            await asyncio.sleep(0.01)
+        finally:
+            concurrency -= 1
+
+        # One router fails to be scanned
+        return device is not devices[0]
+
+    with mock.patch.object(topology, "_scan_router", side_effect=scan_router) as scan:
+        await topology.scan()
+
+    assert {c.args[0] for c in scan.mock_calls} == set(devices)
+    assert max_concurrency == 2
+
+    assert topology.last_scan.routers == 6
+    assert topology.last_scan.scanned == 5
+    assert topology.last_scan.failed == 1
+    assert topology.last_scan.coverage == 5 / 6
+    assert topology.last_scan.duration > 0
+
+    counters = topology._app.state.counters["topology"]
+    assert counters["scans"].value == 1
+    assert counters["routers_scanned"].value == 5
+    assert counters["routers_failed"].value == 1
+
+
+async def test_scan_spread_branches(topology, make_initialized_device) -> None:
+    topology._app.config[conf.CONF_TOPO_SCAN_CONCURRENCY] = 2
+
+    branch1 = make_initialized_device(topology._app)
+    branch1_child1 = make_initialized_device(topology._app)
+    branch1_child1.relays = [branch1.nwk]
+    branch1_child2 = make_initialized_device(topology._app)
+    branch1_child2.relays = [0xABCD, branch1.nwk]
+    branch2 = make_initialized_device(topology._app)
+
+    order = []
+
+    async def scan_router(
+        device: zigpy.device.Device, *, incremental: bool = False
+    ) -> bool:
+        order.append(device)
+        await asyncio.sleep(0.01)
+        return True
+
+    with mock.patch.object(topology, "_scan_router", side_effect=scan_router):
+        await topology.scan(devices=[branch1_child1, branch1_child2, branch1, branch2])
+
+    # The second branch is scanned alongside the first one
+    assert order[:2] == [branch1_child1, branch2]
+    assert set(order[2:]) == {branch1_child2, branch1}
+
+
+async def test_scan_incremental_backoff(topology, make_initialized_device) -> None:
+    topology._app.config[conf.CONF_TOPO_SCAN_MAX_BACKOFF] = 4
+
+    dev = make_initialized_device(topology._app)
+    neighbor = make_neighbor(ieee=make_ieee(2), nwk=0x2222)
+    route = make_route(dest_nwk=0x1234, next_hop=0x5678)
+
+    listener = mock.Mock()
+    topology.add_listener(listener)
+
+    scanned = []
+
+    with patch_device_tables(dev, neighbors=[neighbor], routes=[route]):
+        for index in range(12):
+            await topology.scan(incremental=True)
+
+            if dev.zdo.Mgmt_Lqi_req.mock_calls:
+                scanned.append(index)
+                dev.zdo.Mgmt_Lqi_req.reset_mock()
+
+    # Scans back off exponentially while the links are stable, up to the limit
+    assert scanned == [0, 1, 3, 7, 11]
+    assert topology.last_scan.skipped == 0
+
+    # Unchanged tables are only emitted once
+    assert listener.neighbors_updated.mock_calls == [mock.call(dev.ieee, [neighbor])]
+    assert listener.routes_updated.mock_calls == [mock.call(dev.ieee, [route])]
+
+    counters = topology._app.state.counters["topology"]
+    assert counters["routers_scanned"].value == 5
+    assert counters["routers_skipped"].value == 7
+
+    # Full scans are not affected
+    with patch_device_tables(dev, neighbors=[neighbor], routes=[route]):
+        await topology.scan()
+
+        assert len(dev.zdo.Mgmt_Lqi_req.mock_calls) == 1
+
+    assert len(listener.neighbors_updated.mock_calls) == 2
+
+
+async def test_scan_incremental_changes(topology, make_initialized_device) -> None:
+    dev1 = make_initialized_device(topology._app)
+    dev2 = make_initialized_device(topology._app)
+    child = make_neighbor(ieee=make_ieee(2), nwk=0x2222)
+
+    # Both routers have stable links
+    tables1 = patch_device_tables(dev1, neighbors=[child], routes=[])
+    tables2 = patch_device_tables(dev2, neighbors=[], routes=[])
+
+    with tables1, tables2:
+        await topology.scan(incremental=True)
+        await topology.scan(incremental=True)
+        await topology.scan(incremental=True)
+
+    assert topology.last_scan.routers == 1
+    assert topology.last_scan.skipped == 1
+
+    # The child moves from the first router to the second one
+    topology.handle_join(child.ieee, dev2.nwk)
+
+    tables1 = patch_device_tables(dev1, neighbors=[], routes=[])
+    tables2 = patch_device_tables(dev2, neighbors=[child], routes=[])
+
+    with tables1, tables2:
+        await topology.scan(incremental=True)
+
+    assert topology.last_scan.routers == 2
+    assert topology.neighbors[dev1.ieee] == []
+    assert topology.neighbors[dev2.ieee] == [child]
+
+    # Routers whose links changed are scanned again on the next scan
+    tables1 = patch_device_tables(dev1, neighbors=[], routes=[])
+    tables2 = patch_device_tables(dev2, neighbors=[child], routes=[])
+
+    with tables1, tables2:
+        await topology.scan(incremental=True)
+
+    assert topology.last_scan.routers == 2
+    assert topology.last_scan.skipped == 0
+
+    # Routers are flagged when their children leave
+    topology.handle_leave(child.ieee)
+    assert topology._changed == {dev2.ieee}
+
+
+async def test_scan_incremental_lqi(topology, make_initialized_device) -> None:
+    dev = make_initialized_device(topology._app)
+    neighbor = make_neighbor(ieee=make_ieee(2), nwk=0x2222)
+
+    listener = mock.Mock()
+    topology.add_listener(listener)
+
+    with patch_device_tables(dev, neighbors=[neighbor], routes=[]):
+        await topology.scan(incremental=True)
+
+    # Link quality fluctuations that keep the link cost are ignored
+    with patch_device_tables(dev, neighbors=[neighbor.replace(lqi=240)], routes=[]):
+        await topology.scan(incremental=True)
+
+    assert topology.neighbors[dev.ieee] == [neighbor]
+    assert listener.neighbors_updated.mock_calls == [mock.call(dev.ieee, [neighbor])]
+    assert topology._unchanged_scans[dev.ieee] == 1
+
+    # A worse link is not
+    topology._changed.add(dev.ieee)
+
+    with patch_device_tables(dev, neighbors=[neighbor.replace(lqi=100)], routes=[]):
+        await topology.scan(incremental=True)
+
+    assert topology.neighbors[dev.ieee] == [neighbor.replace(lqi=100)]
+    assert listener.neighbors_updated.mock_calls[-1] == mock.call(
+        dev.ieee, [neighbor.replace(lqi=100)]
+    )
+
+
+async def test_build_source_route_to(topology, make_initialized_device) -> None:
+    coordinator = topology._app._device
+    router1 = make_initialized_device(topology._app)
+    router2 = make_initialized_device(topology._app)
+    router3 = make_initialized_device(topology._app)
+    end_device = make_initialized_device(topology._app)
+    end_device.node_desc.logical_type = zdo_t.LogicalType.EndDevice
+
+    topology.neighbors[coordinator.ieee] = [
+        make_neighbor_from_device(router1),
+        # The direct link to the second router is worse than going through the first
+        make_neighbor_from_device(router2).replace(lqi=100),
+        make_neighbor_from_device(end_device),
+    ]
+    topology.neighbors[router1.ieee] = [make_neighbor_from_device(router2)]
+    topology.neighbors[router3.ieee] = [make_neighbor_from_device(end_device)]
+
+    assert topology.build_source_route_to(router1) == []
+    assert topology.build_source_route_to(router2) == [router1.nwk]
+    assert topology.build_source_route_to(end_device) == []
+
+    # End devices do not relay packets
+    assert topology.build_source_route_to(router3) is None
+
+    # Routes are cached until the topology changes
+    topology.routes[router2.ieee] = [
+        make_route(dest_nwk=0x0000, next_hop=router3.nwk),
+    ]
+    assert topology.build_source_route_to(router3) is None
+
+    topology.invalidate_source_routes()
+    assert topology.build_source_route_to(router3) == [router1.nwk, router2.nwk]
+
+    # Scans invalidate routes when the tables change
+    with patch_device_tables(router1, neighbors=[], routes=[]):
+        await topology.scan(devices=[router1])
+
+    assert topology.build_source_route_to(router2) == []
+    assert topology.build_source_route_to(router3) == [router2.nwk]
+
+    # Devices leaving invalidate routes
+    topology.handle_leave(router2.ieee)
+    assert topology._source_route_parents is None
+    assert topology.build_source_route_to(router3) == [router2.nwk]
+
+
 async def test_scan_skip_coordinator(topology, make_initialized_device) -> None:
     coordinator = topology._app._device
     assert coordinator.nwk == 0x0000
@@ -290,7 +531,10 @@ async def test_scan_coordinator(topology) -> None:
     ]
 
 
-@mock.patch("zigpy.application.ControllerApplication._discover_unknown_device")
+@mock.patch(
+    "zigpy.application.ControllerApplication._discover_unknown_device",
+    return_value=True,
+)
 async def test_discover_new_devices(
     discover_unknown_device, topology, make_initialized_device
 ) -> None:
@@ -338,7 +582,7 @@ async def test_scan_start_concurrent(mock_scan, topology):
     concurrency = 0
     max_concurrency = 0
 
-    async def _scan(_):
+    async def _scan(_, *, incremental=False):
         nonlocal concurrency
         nonlocal max_concurrency
 
@@ -394,7 +638,7 @@ async def test_periodic_scan_failure(mock_scan, topology):
 
 
 async def test_periodic_scan_priority(topology):
-    async def _scan(_):
+    async def _scan(_, *, incremental=False):
         await asyncio.sleep(0.5)
 
     with mock.patch.object(topology, "_scan", side_effect=_scan) as mock_scan:
@@ -1,5 +1,7 @@
+import copy
 import itertools
 import math
+import pickle
 import struct
 
 import pytest
@@ -616,6 +618,70 @@ def test_eui64_convert():
     assert t.EUI64.convert(None) is None
 
 
+def test_eui64_deserialize_too_short():
+    with pytest.raises(ValueError):
+        t.EUI64.deserialize(b"\x01\x02\x03\x04\x05\x06\x07")
+
+
+def test_eui64_hash():
+    ieee1 = t.EUI64.convert("08:07:06:05:04:03:02:01")
+    ieee2, _ = t.EUI64.deserialize(b"\x01\x02\x03\x04\x05\x06\x07\x08")
+    ieee3 = t.EUI64([1, 2, 3, 4, 5, 6, 7, 8])
+
+    assert ieee1 == ieee2 == ieee3
+    assert hash(ieee1) == hash(ieee2) == hash(ieee3)
+    assert len({ieee1: 1, ieee2: 2, ieee3: 3}) == 1
+    assert isinstance(ieee1, list)
+    assert not hasattr(ieee1, "__dict__")
+    assert all(isinstance(b, t.uint8_t) for b in ieee2)
+
+
+def test_eui64_pickle():
+    ieee = t.EUI64.convert("08:07:06:05:04:03:02:01")
+    hash(ieee)
+
+    # Hashes are randomized per process, simulate unpickling in another one
+    ieee._hash = hash(ieee) + 1
+    unpickled = pickle.loads(pickle.dumps(ieee))
+
+    assert unpickled == ieee
+    assert type(unpickled) is t.EUI64
+    assert all(isinstance(b, t.uint8_t) for b in unpickled)
+    assert {t.EUI64.convert("08:07:06:05:04:03:02:01"): 1}.get(unpickled) == 1
+    assert copy.deepcopy(unpickled) == unpickled
+
+
+def test_eui64_mutation():
+    ieee = t.EUI64.convert("08:07:06:05:04:03:02:01")
+    old_hash = hash(ieee)
+    assert ieee.serialize() == b"\x01\x02\x03\x04\x05\x06\x07\x08"
+
+    ieee[0] = t.uint8_t(0xAA)
+    assert repr(ieee) == "08:07:06:05:04:03:02:aa"
+    assert ieee.serialize() == b"\xaa\x02\x03\x04\x05\x06\x07\x08"
+    assert hash(ieee) != old_hash
+    assert hash(ieee) == hash(t.EUI64.convert("08:07:06:05:04:03:02:aa"))
+
+    ieee.reverse()
+    assert repr(ieee) == "aa:02:03:04:05:06:07:08"
+
+    ieee.pop()
+    assert repr(ieee) == "02:03:04:05:06:07:08"
+
+    with pytest.raises(ValueError):
+        ieee.serialize()
+
+
+def test_eui64_invalid_values():
+    ieee = t.EUI64([0x100, 2, 3, 4, 5, 6, 7, 8])
+
+    assert repr(ieee) == "08:07:06:05:04:03:02:100"
+    assert hash(ieee) == hash(t.EUI64([0x100, 2, 3, 4, 5, 6, 7, 8]))
+
+    with pytest.raises(ValueError):
+        ieee.serialize()
+
+
 def test_keydata():
     data = b"\x00\x01\x02\x03\x04\x05\x06\x07\x08\x09\x0a\x0b\x0c\x0d\x0e\x0f"
     extra = b"extra"
@@ -830,3 +896,41 @@ def test_serializable_bytes():
 
     with pytest.raises(ValueError):
         t.SerializableBytes([1, 2, 3])
+
+
+def test_deserialize_from():
+    data = b"\xaa\x03abc\x02\x34\x12\x78\x56\xbb"
+
+    s, offset = t.deserialize_from(t.CharacterString, data, 1)
+    assert (s, offset) == ("abc", 5)
+    assert s.raw == b"abc"
+
+    lst, offset = t.deserialize_from(t.LVList[t.uint16_t], data, offset)
+    assert (lst, offset) == ([0x1234, 0x5678], 10)
+
+    # Buffers other than `bytes` can be used
+    value, offset = t.deserialize_from(t.uint8_t, memoryview(data), offset)
+    assert (value, offset) == (0xBB, 11)
+
+    with pytest.raises(ValueError):
+        t.deserialize_from(t.uint16_t, data, offset - 1)
+
+
+def test_deserialize_from_legacy_types():
+    class Legacy(t.uint8_t):
+        @classmethod
+        def deserialize(cls, data):
+            value, data = super().deserialize(data)
+            return cls(value + 1), data
+
+    class Legacy2(Legacy):
+        pass
+
+    # Overriding only `deserialize` takes precedence over inherited implementations
+    for legacy_type in (Legacy, Legacy2):
+        lst, rest = t.LVList[legacy_type].deserialize(b"\x02\x01\x02\x03")
+        assert (lst, rest) == ([0x02, 0x03], b"\x03")
+
+    value, offset = t.deserialize_from(t.NoData, b"\x01\x02", 1)
+    assert isinstance(value, t.NoData)
+    assert offset == 1
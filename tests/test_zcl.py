@@ -7,7 +7,9 @@ from unittest.mock import AsyncMock, MagicMock, patch, sentinel
 
 import pytest
 
+from tests.conftest import make_app, make_ieee
 from zigpy import zcl
+import zigpy.config as conf
 import zigpy.device
 import zigpy.endpoint
 import zigpy.types as t
@@ -72,6 +74,69 @@ def test_deserialize_cluster_command_unknown(endpoint):
     assert hdr.direction == foundation.Direction.Client_to_Server
 
 
+def test_command_table(endpoint):
+    cluster = endpoint.in_clusters[3]
+    table = type(cluster)._command_table
+
+    assert (
+        table[
+            foundation.FrameType.CLUSTER_COMMAND,
+            foundation.Direction.Client_to_Server,
+            0x00,
+        ]
+        is cluster.server_commands[0x00]
+    )
+    assert (
+        table[
+            foundation.FrameType.CLUSTER_COMMAND,
+            foundation.Direction.Server_to_Client,
+            0x00,
+        ]
+        is cluster.client_commands[0x00]
+    )
+    assert (
+        table[
+            foundation.FrameType.GLOBAL_COMMAND,
+            foundation.Direction.Server_to_Client,
+            foundation.GeneralCommand.Read_Attributes,
+        ]
+        is foundation.GENERAL_COMMANDS[foundation.GeneralCommand.Read_Attributes]
+    )
+
+
+@pytest.mark.parametrize(
+    ("cluster_id", "data"),
+    [
+        (0, b"\x00\x01\x00\x04\x00"),
+        (0, b"\x18\x01\x01\x04\x00\x00\x42\x03abc"),
+        (0, b"\x00\x01\xff\x12"),
+        (0, b"\x01\x01\xff\x12"),
+        (3, b"\x09\x01\x00AB"),
+        (3, b"\x01\x01\x00\x05\x00trailing"),
+    ],
+)
+def test_deserialize_payload(endpoint, cluster_id, data):
+    hdr1, args1 = endpoint.deserialize(cluster_id, data)
+
+    hdr2, offset = t.deserialize_from(foundation.ZCLHeader, data)
+    hdr2, args2 = endpoint._deserialize_payload(cluster_id, hdr2, data, offset)
+
+    assert hdr1 == hdr2
+    assert args1 == args2
+
+
+def test_deserialize_payload_custom_cluster(endpoint):
+    cluster = endpoint.in_clusters[0]
+    cluster.deserialize = MagicMock(return_value=(sentinel.hdr, sentinel.args))
+
+    hdr, offset = t.deserialize_from(foundation.ZCLHeader, b"\x00\x01\x00")
+    assert endpoint._deserialize_payload(0, hdr, b"\x00\x01\x00", offset) == (
+        sentinel.hdr,
+        sentinel.args,
+    )
+    assert cluster.deserialize.mock_calls == [mock.call(b"\x00\x01\x00")]
+
+
 def test_unknown_cluster():
     c = zcl.Cluster.from_id(None, 999)
     assert isinstance(c, zcl.Cluster)
@@ -95,6 +160,7 @@ def cluster_by_id():
         epmock = MagicMock()
         epmock._device.get_sequence.return_value = DEFAULT_TSN
         epmock.device.get_sequence.return_value = DEFAULT_TSN
+        epmock.device.read_batch_window = None
         epmock.request = AsyncMock()
         epmock.reply = AsyncMock()
         return zcl.Cluster.from_id(epmock, cluster_id)
@@ -408,6 +474,293 @@ async def test_read_attributes_default_response(cluster):
     assert failure == {0: 0xC1, 5: 0xC1, 23: 0xC1}
 
 
+async def test_read_attributes_coalesced(cluster):
+    """Concurrent reads of the same attributes share a request."""
+
+    reply = asyncio.Event()
+
+    async def mockrequest(
+        foundation, command, schema, args, manufacturer=None, **kwargs
+    ):
+        await reply.wait()
+        return [[_mk_rar(attrid, f"v{attrid}") for attrid in args if attrid != 6]]
+
+    cluster.request = AsyncMock(side_effect=mockrequest)
+    listener = MagicMock()
+    cluster.add_listener(listener)
+
+    reads = [
+        asyncio.create_task(cluster.read_attributes([4, 5, 6])),
+        asyncio.create_task(cluster.read_attributes(["model"])),
+        asyncio.create_task(cluster.read_attributes([4, 0x4000])),
+        asyncio.create_task(cluster.read_attributes([5], manufacturer=0x1234)),
+    ]
+    await asyncio.sleep(0.01)
+
+    # The second read is joined entirely, the third only reads `sw_build_id`
+    assert [c.args[3] for c in cluster.request.mock_calls] == [
+        [4, 5, 6],
+        [0x4000],
+        [5],
+    ]
+
+    # Cancelling one of the callers does not affect the others
+    reads.pop(1).cancel()
+
+    reply.set()
+    results = await asyncio.gather(*reads)
+
+    assert results == [
+        ({4: "v4", 5: "v5"}, {}),
+        ({4: "v4", 0x4000: "v16384"}, {}),
+        ({5: "v5"}, {}),
+    ]
+    assert cluster._pending_reads == []
+
+    # Every attribute is only updated once per request
+    assert len(listener.attribute_updated.mock_calls) == 4
+
+    # Later reads are sent again
+    await cluster.read_attributes([4])
+    assert len(cluster.request.mock_calls) == 4
+
+
+async def test_read_attributes_cancelled(cluster):
+    """Cancelling the only caller cancels its read."""
+
+    sent = asyncio.Event()
+    cancelled = asyncio.Event()
+
+    async def mockrequest(
+        foundation, command, schema, args, manufacturer=None, **kwargs
+    ):
+        sent.set()
+
+        try:
+            await asyncio.Future()
+        except asyncio.CancelledError:
+            cancelled.set()
+            raise
+
+    cluster.request = AsyncMock(side_effect=mockrequest)
+
+    read = asyncio.create_task(cluster.read_attributes([4]))
+    await sent.wait()
+    read.cancel()
+
+    with pytest.raises(asyncio.CancelledError):
+        await read
+
+    assert cancelled.is_set()
+    assert cluster._pending_reads == []
+
+
+async def test_read_attributes_joined_read_cancelled(cluster):
+    """Callers that joined a read send it themselves when its caller is cancelled."""
+
+    async def mockrequest(
+        foundation, command, schema, args, manufacturer=None, **kwargs
+    ):
+        if len(cluster.request.mock_calls) == 1:
+            await asyncio.Future()
+
+        return [[_mk_rar(attrid, f"v{attrid}") for attrid in args]]
+
+    cluster.request = AsyncMock(side_effect=mockrequest)
+
+    first = asyncio.create_task(cluster.read_attributes([4, 5]))
+    await asyncio.sleep(0)
+    second = asyncio.create_task(cluster.read_attributes([4]))
+    await asyncio.sleep(0)
+
+    first.cancel()
+
+    assert await second == ({4: "v4"}, {})
+    assert [c.args[3] for c in cluster.request.mock_calls] == [[4, 5], [4]]
+
+    with pytest.raises(asyncio.CancelledError):
+        await first
+
+
+async def test_read_attributes_batch_cancelled(cluster):
+    """A batch is cancelled once every read waiting for it is cancelled."""
+
+    cluster.request = AsyncMock(return_value=[[]])
+    cluster._endpoint.device.read_batch_window = 0.01
+
+    reads = [
+        asyncio.create_task(cluster.read_attributes([4])),
+        asyncio.create_task(cluster.read_attributes([5])),
+    ]
+    await asyncio.sleep(0)
+
+    (batch,) = cluster._read_batches
+    reads[0].cancel()
+    await asyncio.sleep(0)
+    assert not batch.task.done()
+
+    reads[1].cancel()
+    await asyncio.gather(*reads, return_exceptions=True)
+    await asyncio.sleep(0)
+
+    assert batch.task.cancelled()
+    assert cluster._read_batches == []
+    assert cluster.request.mock_calls == []
+
+
+async def test_read_attributes_batched(cluster):
+    """Reads made within the batch window are sent as a single request."""
+
+    async def mockrequest(
+        foundation, command, schema, args, manufacturer=None, **kwargs
+    ):
+        return [[_mk_rar(attrid, f"v{attrid}") for attrid in args]]
+
+    cluster.request = AsyncMock(side_effect=mockrequest)
+    cluster._endpoint.device.read_batch_window = 0.01
+
+    results = await asyncio.gather(
+        cluster.read_attributes([4]),
+        cluster.read_attributes(["model", 4]),
+        cluster.read_attributes([0]),
+        cluster.read_attributes([4], manufacturer=0x1234),
+    )
+
+    assert results == [
+        ({4: "v4"}, {}),
+        ({"model": "v5", 4: "v4"}, {}),
+        ({0: "v0"}, {}),
+        ({4: "v4"}, {}),
+    ]
+
+    # Reads with a different manufacturer code are batched separately
+    assert [c.args[3] for c in cluster.request.mock_calls] == [[4, 5, 0], [4]]
+    assert cluster._read_batches == []
+    assert cluster._pending_reads == []
+
+
+async def test_read_attributes_batched_app_config():
+    """Batching is enabled by the application config."""
+
+    async def mockrequest(
+        foundation, command, schema, args, manufacturer=None, **kwargs
+    ):
+        return [[_mk_rar(attrid, f"v{attrid}") for attrid in args]]
+
+    assert make_app({}).add_device(make_ieee(1), 0x1234).read_batch_window is None
+
+    app = make_app({conf.CONF_ATTRIBUTE_READ_BATCH_WINDOW: 0.01})
+    device = app.add_device(make_ieee(1), 0x1234)
+    cluster = device.add_endpoint(1).add_input_cluster(0)
+    cluster.request = AsyncMock(side_effect=mockrequest)
+
+    results = await asyncio.gather(
+        cluster.read_attributes([4]), cluster.read_attributes([5])
+    )
+
+    assert results == [({4: "v4"}, {}), ({5: "v5"}, {})]
+    assert [c.args[3] for c in cluster.request.mock_calls] == [[4, 5]]
+
+
+async def test_read_attributes_batched_split(cluster):
+    """Batched reads are split to keep responses within a single APS frame."""
+
+    async def mockrequest(
+        foundation, command, schema, args, manufacturer=None, **kwargs
+    ):
+        return [[_mk_rar(attrid, 1) for attrid in args]]
+
+    cluster.request = AsyncMock(side_effect=mockrequest)
+    cluster._endpoint.device.read_batch_window = 0.01
+
+    # Strings are assumed to be variable length, the others are single bytes
+    attrs = [0x0000, 0x0001, 0x0002, 0x0003, 0x0004, 0x0005, 0x0006, 0x0007]
+    results = await asyncio.gather(*(cluster.read_attributes([a]) for a in attrs))
+
+    assert [set(success) for success, _ in results] == [{a} for a in attrs]
+    assert [c.args[3] for c in cluster.request.mock_calls] == [
+        [0x0000, 0x0001, 0x0002, 0x0003, 0x0004],
+        [0x0005, 0x0006, 0x0007],
+    ]
+
+
+async def test_read_attributes_batched_timeout(cluster):
+    """Devices that only time out on batched reads are read separately from then on."""
+
+    async def mockrequest(
+        foundation, command, schema, args, manufacturer=None, **kwargs
+    ):
+        if len(args) > 1:
+            raise asyncio.TimeoutError
+
+        return [[_mk_rar(attrid, f"v{attrid}") for attrid in args]]
+
+    cluster.request = AsyncMock(side_effect=mockrequest)
+    cluster._endpoint.device.read_batch_window = 0.01
+
+    # The batched read fails like any other read, without being sent again
+    results = await asyncio.gather(
+        cluster.read_attributes(["manufacturer"]),
+        cluster.read_attributes(["model"]),
+        return_exceptions=True,
+    )
+
+    assert all(isinstance(r, asyncio.TimeoutError) for r in results)
+    assert not cluster._read_batching_unsupported
+
+    # The next reads are sent separately and batching is disabled once they succeed
+    results = await asyncio.gather(
+        cluster.read_attributes(["manufacturer"]),
+        cluster.read_attributes(["model"]),
+    )
+
+    assert results == [({"manufacturer": "v4"}, {}), ({"model": "v5"}, {})]
+    assert cluster._read_batching_unsupported
+
+    # A caller's own multi-attribute read still fails
+    with pytest.raises(asyncio.TimeoutError):
+        await cluster.read_attributes(["manufacturer", "model"])
+
+    assert [c.args[3] for c in cluster.request.mock_calls] == [
+        [4, 5],
+        [4],
+        [5],
+        [4, 5],
+    ]
+
+
+async def test_read_attributes_batched_timeout_unreachable(cluster):
+    """Batching is kept when the device does not respond to separate reads either."""
+
+    cluster.request = AsyncMock(side_effect=asyncio.TimeoutError)
+    cluster._endpoint.device.read_batch_window = 0.01
+
+    for _ in range(2):
+        results = await asyncio.gather(
+            cluster.read_attributes(["manufacturer"]),
+            cluster.read_attributes(["model"]),
+            return_exceptions=True,
+        )
+        assert all(isinstance(r, asyncio.TimeoutError) for r in results)
+
+    assert not cluster._read_batching_unsupported
+    assert not cluster._read_batch_timed_out
+
+    # Reads are batched again
+    await asyncio.gather(
+        cluster.read_attributes(["manufacturer"]),
+        cluster.read_attributes(["model"]),
+        return_exceptions=True,
+    )
+
+    assert [c.args[3] for c in cluster.request.mock_calls] == [
+        [4, 5],
+        [4],
+        [5],
+        [4, 5],
+    ]
+
+
 async def test_item_access_attributes(cluster):
     cluster._attr_cache[5] = sentinel.model
 
@@ -1105,8 +1458,6 @@ async def test_zcl_reply_direction(app_mock):
         nwk=0x1234,
     )
 
-    dev._send_sequence = DEFAULT_TSN
-
     ep = dev.add_endpoint(1)
     ep.add_input_cluster(zcl.clusters.general.OnOff.cluster_id)
 
@@ -53,6 +53,70 @@ async def test_request(zdo_f):
         assert get_sequence.call_count == 1
 
 
+async def test_request_coalesced(zdo_f):
+    reply = asyncio.Event()
+
+    async def mock_request(*args, **kwargs):
+        await reply.wait()
+        return sentinel.reply
+
+    zdo_f.device.request.side_effect = mock_request
+
+    requests = [
+        zdo_f.Node_Desc_req(0x1234),
+        zdo_f.Node_Desc_req(0x1234),
+        zdo_f.Node_Desc_req(0x5678),
+        zdo_f.Simple_Desc_req(0x1234, 1),
+        zdo_f.Mgmt_Lqi_req(0),
+        zdo_f.Mgmt_Lqi_req(0),
+    ]
+    tasks = [asyncio.create_task(request) for request in requests]
+    await asyncio.sleep(0.01)
+
+    # Identical descriptor requests are only sent once
+    assert zdo_f.device.request.call_count == 5
+
+    reply.set()
+    assert await asyncio.gather(*tasks) == [sentinel.reply] * 6
+    assert zdo_f._pending_requests == {}
+
+
+async def test_request_coalesced_cancelled(zdo_f):
+    sent = asyncio.Event()
+    cancelled = asyncio.Event()
+
+    async def mock_request(*args, **kwargs):
+        if zdo_f.device.request.call_count > 1:
+            return sentinel.reply
+
+        sent.set()
+
+        try:
+            await asyncio.Future()
+        except asyncio.CancelledError:
+            cancelled.set()
+            raise
+
+    zdo_f.device.request.side_effect = mock_request
+
+    first = asyncio.create_task(zdo_f.Node_Desc_req(0x1234))
+    await sent.wait()
+    second = asyncio.create_task(zdo_f.Node_Desc_req(0x1234))
+    await asyncio.sleep(0)
+
+    # Cancelling the caller that sent the request cancels it, the other caller sends
+    # it again
+    first.cancel()
+
+    with pytest.raises(asyncio.CancelledError):
+        await first
+
+    assert cancelled.is_set()
+    assert await second is sentinel.reply
+    assert zdo_f.device.request.call_count == 2
+    assert zdo_f._pending_requests == {}
+
+
 async def test_bind(zdo_f):
     cluster = MagicMock()
     cluster.endpoint.endpoint_id = 1
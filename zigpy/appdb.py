@@ -1,13 +1,16 @@
 from __future__ import annotations
 
 import asyncio
+import collections
 import contextlib
 from datetime import datetime, timedelta, timezone
 import json
 import logging
 import re
+import threading
+import time
 import types
-from typing import Any
+from typing import Any, Callable
 
 import aiosqlite
 
@@ -38,6 +41,13 @@ DB_V_REGEX = re.compile(r"(?:_v\d+)?$")
 
 MIN_UPDATE_DELTA = timedelta(seconds=30).total_seconds()
 
+# Attributes required to apply quirks
+DEVICE_INFO = f"""
+        cluster_type={ClusterType.Server}
+    AND cluster_id={Basic.cluster_id}
+    AND attr_id IN ({Basic.AttributeDefs.manufacturer.id}, {Basic.AttributeDefs.model.id})
+"""
+
 
 def _import_compatible_sqlite3(min_version: tuple[int, int, int]) -> types.ModuleType:
     """Loads an SQLite module with a library version matching the provided constraint."""
@@ -89,11 +99,29 @@ def aiosqlite_connect(
     `sqlite3` module or the imported `pysqlite3` module.
     """
 
-    return aiosqlite.Connection(
-        connector=lambda: sqlite3.connect(str(database), **kwargs),
+    def connector() -> sqlite3.Connection:
+        # The connector runs in the thread of the connection, which is only closed
+        # after `Connection.close` returns
+        connection.worker_thread = threading.current_thread()
+        return sqlite3.connect(str(database), **kwargs)
+
+    connection = aiosqlite.Connection(
+        connector=connector,
         iter_chunk_size=iter_chunk_size,
     )
 
+    return connection  # noqa: RET504
+
+
+def _decode_node_descriptor(
+    row: tuple,
+) -> tuple[t.EUI64, zdo_t.NodeDescriptor]:
+    ieee, *fields = row
+    node_desc = zdo_t.NodeDescriptor(*fields)
+    assert node_desc.is_valid
+
+    return ieee, node_desc
+
 
 def decode_str_attribute(value: str | bytes) -> str:
     if isinstance(value, str):
@@ -102,11 +130,209 @@ def decode_str_attribute(value: str | bytes) -> str:
     return value.split(b"\x00", 1)[0].decode("utf-8")
 
 
+class LazyAttributeCache:
+    """Loads the attribute cache of a cluster from the database when it is first
+    needed, keeping at most `max_clusters` attribute caches in memory.
+
+    Clusters are attached by removing their `_attr_cache` and `_attr_last_updated`
+    instance attributes. `preload` and `preload_device` read them asynchronously
+    before a cluster or a device is used. Otherwise `Cluster.__getattr__` calls `load`
+    on first access, which starts with empty caches and fills in the persisted values
+    in the background.
+    """
+
+    _QUERY = f"""SELECT attr_id, value, last_updated FROM attributes_cache{DB_V}
+        WHERE ieee=? AND endpoint_id=? AND cluster_type=? AND cluster_id=?
+    """
+
+    _DEVICE_QUERY = f"""SELECT endpoint_id, cluster_type, cluster_id, attr_id, value,
+        last_updated FROM attributes_cache{DB_V} WHERE ieee=?
+    """
+
+    def __init__(self, listener: PersistingListener, max_clusters: int) -> None:
+        self._listener = listener
+        self._max_clusters = max_clusters
+
+        # Least recently used attribute caches first, with the time they were used
+        self._resident: collections.OrderedDict[zigpy.typing.ClusterType, int] = (
+            collections.OrderedDict()
+        )
+        self._generation = 0
+        self._eviction_task: asyncio.Task | None = None
+
+        # Caches that were accessed before being loaded, still being filled in
+        self._pending: dict[zigpy.typing.ClusterType, asyncio.Task] = {}
+
+        self.loads = 0
+        self.evictions = 0
+
+    def __len__(self) -> int:
+        return len(self._resident)
+
+    def attach(self, cluster: zigpy.typing.ClusterType) -> None:
+        """Drop the attribute cache of a cluster, to be loaded on first access."""
+        cluster.__dict__.pop("_attr_cache", None)
+        cluster.__dict__.pop("_attr_last_updated", None)
+        cluster._attr_cache_loader = self
+
+    def _params(self, cluster: zigpy.typing.ClusterType) -> tuple:
+        return (
+            cluster.endpoint.device.ieee,
+            cluster.endpoint.endpoint_id,
+            cluster.cluster_type,
+            cluster.cluster_id,
+        )
+
+    async def preload(self, cluster: zigpy.typing.ClusterType) -> None:
+        """Load the attribute cache of a cluster without blocking the event loop."""
+        if cluster in self._pending:
+            await asyncio.shield(self._pending[cluster])
+            return
+
+        if "_attr_cache" in cluster.__dict__:
+            return
+
+        async with self._listener.execute(self._QUERY, self._params(cluster)) as cur:
+            rows = await cur.fetchall()
+
+        self._populate(cluster, rows)
+
+    async def preload_device(self, device: zigpy.typing.DeviceType) -> None:
+        """Load the attribute caches of all clusters of a device with a single query."""
+        clusters = [
+            cluster
+            for ep in device.non_zdo_endpoints
+            for cluster in (*ep.in_clusters.values(), *ep.out_clusters.values())
+            if cluster._attr_cache_loader is self
+            and "_attr_cache" not in cluster.__dict__
+        ]
+
+        if not clusters:
+            return
+
+        async with self._listener.execute(self._DEVICE_QUERY, (device.ieee,)) as cur:
+            rows = await cur.fetchall()
+
+        cluster_rows: dict[tuple, list[tuple]] = collections.defaultdict(list)
+
+        for endpoint_id, cluster_type, cluster_id, *row in rows:
+            cluster_rows[endpoint_id, cluster_type, cluster_id].append(row)
+
+        for cluster in clusters:
+            self._populate(
+                cluster,
+                cluster_rows[
+                    cluster.endpoint.endpoint_id,
+                    cluster.cluster_type,
+                    cluster.cluster_id,
+                ],
+            )
+
+    def load(self, cluster: zigpy.typing.ClusterType) -> None:
+        """Start with an empty attribute cache, filled in from the database later."""
+        self._populate(cluster, [])
+        self._pending[cluster] = asyncio.create_task(self._fill(cluster))
+
+    async def _fill(self, cluster: zigpy.typing.ClusterType) -> None:
+        try:
+            async with self._listener.execute(
+                self._QUERY, self._params(cluster)
+            ) as cur:
+                rows = await cur.fetchall()
+
+            self._populate(cluster, rows)
+        finally:
+            del self._pending[cluster]
+
+    def _populate(self, cluster: zigpy.typing.ClusterType, rows: list[tuple]) -> None:
+        if "_attr_cache" not in cluster.__dict__:
+            cluster._attr_cache = {}
+            cluster._attr_last_updated = {}
+            self.loads += 1
+
+        # Values updated since the cache was accessed are more recent
+        for attr_id, value, last_updated in rows:
+            cluster._attr_cache.setdefault(attr_id, value)
+            cluster._attr_last_updated.setdefault(
+                attr_id, datetime.fromtimestamp(last_updated, timezone.utc)
+            )
+
+        self.touch(cluster)
+
+    def touch(self, cluster: zigpy.typing.ClusterType) -> None:
+        """Mark the attribute cache of a cluster as recently used."""
+        if cluster._attr_cache_loader is not self:
+            return
+
+        self._generation += 1
+        self._resident[cluster] = self._generation
+        self._resident.move_to_end(cluster)
+
+        if len(self._resident) > self._max_clusters and self._eviction_task is None:
+            self._eviction_task = asyncio.create_task(self._evict())
+
+    async def _evict(self) -> None:
+        """Evict the least recently used attribute caches."""
+        generation = self._generation
+
+        try:
+            # Attribute caches are only dropped once their changes are persisted.
+            # Caches used afterwards may have pending changes and are kept.
+            await self._listener._callback_handlers.join()
+
+            evicted = []
+
+            for cluster, used in self._resident.items():
+                if len(self._resident) - len(evicted) <= self._max_clusters:
+                    break
+
+                if used > generation:
+                    break
+
+                # Caches still being filled in are kept
+                if cluster not in self._pending:
+                    evicted.append(cluster)
+
+            # Timestamps of unchanged values are not always written, see
+            # `MIN_UPDATE_DELTA`. Reloading the cache must not make them go back.
+            if evicted:
+                self._listener.enqueue(
+                    "_save_attribute_timestamps",
+                    [
+                        (*self._params(cluster), attr_id, last_updated)
+                        for cluster in evicted
+                        for attr_id, last_updated in cluster._attr_last_updated.items()
+                    ],
+                )
+                await self._listener._callback_handlers.join()
+
+            for cluster in evicted:
+                # Clusters used in the meantime are kept
+                if self._resident.get(cluster, generation + 1) > generation:
+                    continue
+
+                del self._resident[cluster]
+                self.attach(cluster)
+                self.evictions += 1
+        finally:
+            self._eviction_task = None
+
+    def close(self) -> None:
+        if self._eviction_task is not None:
+            self._eviction_task.cancel()
+
+        for task in self._pending.values():
+            task.cancel()
+
+
 class PersistingListener(zigpy.util.CatchingTaskMixin):
     def __init__(
         self,
         connection: aiosqlite.Connection,
         application: zigpy.typing.ControllerApplicationType,
+        *,
+        batch_size: int = 1,
+        flush_interval: float = 0,
     ) -> None:
         _register_sqlite_adapters()
 
@@ -114,6 +340,15 @@ class PersistingListener(zigpy.util.CatchingTaskMixin):
         self._application = application
         self._callback_handlers: asyncio.Queue = asyncio.Queue()
         self.running = False
+
+        # A batch size of 1 commits every event individually
+        self._batch_size = batch_size
+        self._flush_interval = flush_interval
+        self._batching = False
+
+        # Attribute caches are loaded eagerly unless enabled by `new`
+        self._lazy_attributes: LazyAttributeCache | None = None
+
         self._worker_task = asyncio.create_task(self._worker())
 
     async def initialize_tables(self) -> None:
@@ -146,15 +381,27 @@ class PersistingListener(zigpy.util.CatchingTaskMixin):
 
     @classmethod
     async def new(
-        cls, database_file: str, app: zigpy.typing.ControllerApplicationType
+        cls,
+        database_file: str,
+        app: zigpy.typing.ControllerApplicationType,
+        *,
+        batch_size: int = 1,
+        flush_interval: float = 0,
+        lazy_attributes_max_clusters: int | None = None,
     ) -> PersistingListener:
-        """Create an instance of persisting listener."""
+        """Create an instance of persisting listener.
+
+        If `lazy_attributes_max_clusters` is set, attribute caches are loaded on first
+        access instead of at startup and at most that many are kept in memory.
+        """
         sqlite_conn = await aiosqlite_connect(
             database_file,
             detect_types=sqlite3.PARSE_DECLTYPES,
             isolation_level="DEFERRED",  # The default is "", an alias for "DEFERRED"
         )
-        listener = cls(sqlite_conn, app)
+        listener = cls(
+            sqlite_conn, app, batch_size=batch_size, flush_interval=flush_interval
+        )
 
         try:
             await listener.initialize_tables()
@@ -162,29 +409,163 @@ class PersistingListener(zigpy.util.CatchingTaskMixin):
             await listener.shutdown()
             raise
 
+        if lazy_attributes_max_clusters is not None:
+            listener._lazy_attributes = LazyAttributeCache(
+                listener, lazy_attributes_max_clusters
+            )
+
         listener.running = True
         return listener
 
+    @property
+    def queue_depth(self) -> int:
+        """Number of events waiting to be written to the database."""
+        return self._callback_handlers.qsize()
+
     async def _worker(self) -> None:
         """Process request in the received order."""
+        if self._batch_size > 1:
+            await self._batching_worker()
+            return
+
         while True:
             cb_name, args = await self._callback_handlers.get()
-            handler = getattr(self, cb_name)
-            assert handler
+            await self._handle_event(cb_name, args)
+            self._callback_handlers.task_done()
+
+    async def _handle_event(self, cb_name: str, args: tuple) -> None:
+        handler = getattr(self, cb_name)
+        assert handler
+        try:
+            await handler(*args)
+        except sqlite3.Error as exc:
+            LOGGER.debug(
+                "Error handling '%s' event with %s params: %s",
+                cb_name,
+                args,
+                str(exc),
+            )
+        except Exception as ex:  # noqa: BLE001
+            LOGGER.error(
+                "Unexpected error while processing %s(%s): %s", cb_name, args, ex
+            )
+
+    def _drain_queue(self, batch: list[tuple[str, tuple]]) -> None:
+        """Move queued events into the batch, up to the batch size."""
+        while len(batch) < self._batch_size:
+            try:
+                batch.append(self._callback_handlers.get_nowait())
+            except asyncio.QueueEmpty:
+                break
+
+    async def _batching_worker(self) -> None:
+        """Process requests in the received order, committing them in batches."""
+        while True:
+            batch = [await self._callback_handlers.get()]
+            self._drain_queue(batch)
+
+            # Give more events a chance to arrive before the batch is written
+            if len(batch) < self._batch_size and self._flush_interval > 0:
+                await asyncio.sleep(self._flush_interval)
+                self._drain_queue(batch)
+
+            try:
+                await self._process_batch(batch)
+            finally:
+                for _ in batch:
+                    self._callback_handlers.task_done()
+
+    async def _process_batch(self, batch: list[tuple[str, tuple]]) -> None:
+        """Write a batch of events within a single transaction.
+
+        Attribute and `last_seen` updates are coalesced: only the most recent value is
+        written. They are written before any other event, to preserve ordering.
+        """
+        start = time.monotonic()
+        counters = self._application.state.counters["database"]
+
+        attributes: dict[tuple, tuple] = {}
+        last_seen: dict[t.EUI64, datetime] = {}
+        coalesced = 0
+
+        self._batching = True
+
+        try:
+            for cb_name, args in batch:
+                if cb_name == "_save_attribute":
+                    # Keyed by `(ieee, endpoint_id, cluster_type, cluster_id, attrid)`
+                    coalesced += args[:5] in attributes
+                    attributes[args[:5]] = args
+                elif cb_name == "_save_device_last_seen":
+                    ieee, timestamp = args
+                    coalesced += ieee in last_seen
+                    last_seen[ieee] = timestamp
+                else:
+                    await self._flush_coalesced(attributes, last_seen)
+                    await self._handle_event(cb_name, args)
+
+            await self._flush_coalesced(attributes, last_seen)
+
             try:
-                await handler(*args)
+                await self._db.commit()
             except sqlite3.Error as exc:
-                LOGGER.debug(
-                    "Error handling '%s' event with %s params: %s",
-                    cb_name,
-                    args,
-                    str(exc),
-                )
-            except Exception as ex:  # noqa: BLE001
-                LOGGER.error(
-                    "Unexpected error while processing %s(%s): %s", cb_name, args, ex
-                )
-            self._callback_handlers.task_done()
+                LOGGER.warning("Failed to commit %d events: %s", len(batch), exc)
+        finally:
+            self._batching = False
+
+        duration = time.monotonic() - start
+
+        counters["events"].increment(len(batch))
+        counters["events_coalesced"].increment(coalesced)
+        counters["flushes"].increment()
+        counters["flush_time_ms"].increment(int(duration * 1000))
+
+        LOGGER.debug(
+            "Wrote %d events (%d coalesced) in %0.3fs, %d events queued",
+            len(batch),
+            coalesced,
+            duration,
+            self.queue_depth,
+        )
+
+    async def _flush_coalesced(
+        self, attributes: dict[tuple, tuple], last_seen: dict[t.EUI64, datetime]
+    ) -> None:
+        """Write coalesced attribute and `last_seen` updates."""
+        if attributes:
+            rows = list(attributes.values())
+            attributes.clear()
+            await self._save_rows("_save_attributes", rows)
+
+        if last_seen:
+            rows = list(last_seen.items())
+            last_seen.clear()
+            await self._save_rows("_save_devices_last_seen", rows)
+
+    async def _save_rows(self, cb_name: str, rows: list[tuple]) -> None:
+        """Write rows with a single statement. If any row fails, the rows are written
+        one at a time so that only the failing rows are lost.
+        """
+        try:
+            await getattr(self, cb_name)(rows)
+        except sqlite3.Error as exc:
+            LOGGER.debug(
+                "Error writing %d rows with '%s', retrying them individually: %s",
+                len(rows),
+                cb_name,
+                str(exc),
+            )
+
+            # Rows written before the failing one are written again, which is harmless
+            for row in rows:
+                await self._handle_event(cb_name, ([row],))
+        except Exception as ex:  # noqa: BLE001
+            LOGGER.error("Unexpected error while processing %s: %s", cb_name, ex)
+
+    async def _commit(self) -> None:
+        """Commit the current transaction, unless a batch of events is being written."""
+        if not self._batching:
+            await self._db.commit()
 
     async def shutdown(self) -> None:
         """Shutdown connection."""
@@ -193,6 +574,9 @@ class PersistingListener(zigpy.util.CatchingTaskMixin):
         if not self._worker_task.done():
             self._worker_task.cancel()
 
+        if self._lazy_attributes is not None:
+            self._lazy_attributes.close()
+
         # Delete the journal on shutdown
         await self._set_isolation_level(None)
         await self.execute("PRAGMA wal_checkpoint;")
@@ -201,7 +585,10 @@ class PersistingListener(zigpy.util.CatchingTaskMixin):
         await self._db.close()
 
         # FIXME: aiosqlite's thread won't always be closed immediately
-        await asyncio.get_running_loop().run_in_executor(None, self._db.join)
+        thread = getattr(self._db, "worker_thread", None)
+
+        if thread is not None:
+            await asyncio.get_running_loop().run_in_executor(None, thread.join)
 
     def enqueue(self, cb_name: str, *args) -> None:
         """Enqueue an async callback handler action."""
@@ -232,7 +619,7 @@ class PersistingListener(zigpy.util.CatchingTaskMixin):
 
     async def _update_device_nwk(self, ieee: t.EUI64, nwk: t.NWK) -> None:
         await self.execute(f"UPDATE devices{DB_V} SET nwk=? WHERE ieee=?", (nwk, ieee))
-        await self._db.commit()
+        await self._commit()
 
     def device_initialized(self, device: zigpy.typing.DeviceType) -> None:
         pass
@@ -247,18 +634,26 @@ class PersistingListener(zigpy.util.CatchingTaskMixin):
         self.enqueue("_save_device_last_seen", device.ieee, last_seen)
 
     async def _save_device_last_seen(self, ieee: t.EUI64, last_seen: datetime) -> None:
+        await self._save_devices_last_seen([(ieee, last_seen)])
+        await self._commit()
+
+    async def _save_devices_last_seen(
+        self, devices: list[tuple[t.EUI64, datetime]]
+    ) -> None:
         q = f"""UPDATE devices{DB_V}
                     SET last_seen=:ts
                     WHERE ieee=:ieee AND :ts - last_seen > :min_update_delta"""
-        await self.execute(
+        await self._db.executemany(
             q,
-            {
-                "ts": last_seen.timestamp(),
-                "ieee": ieee,
-                "min_update_delta": MIN_UPDATE_DELTA,
-            },
+            [
+                {
+                    "ts": last_seen.timestamp(),
+                    "ieee": ieee,
+                    "min_update_delta": MIN_UPDATE_DELTA,
+                }
+                for ieee, last_seen in devices
+            ],
         )
-        await self._db.commit()
 
     def device_relays_updated(
         self, device: zigpy.typing.DeviceType, relays: t.Relays | None
@@ -275,7 +670,7 @@ class PersistingListener(zigpy.util.CatchingTaskMixin):
                         DO UPDATE SET relays=excluded.relays WHERE relays != :relays"""
             await self.execute(q, {"ieee": ieee, "relays": relays.serialize()})
 
-        await self._db.commit()
+        await self._commit()
 
     def attribute_updated(
         self,
@@ -284,6 +679,9 @@ class PersistingListener(zigpy.util.CatchingTaskMixin):
         value: Any,
         timestamp: datetime,
     ) -> None:
+        if self._lazy_attributes is not None:
+            self._lazy_attributes.touch(cluster)
+
         self.enqueue(
             "_save_attribute",
             cluster.endpoint.device.ieee,
@@ -296,6 +694,9 @@ class PersistingListener(zigpy.util.CatchingTaskMixin):
         )
 
     def attribute_cleared(self, cluster: zigpy.typing.ClusterType, attrid: int) -> None:
+        if self._lazy_attributes is not None:
+            self._lazy_attributes.touch(cluster)
+
         self.enqueue(
             "_clear_attribute",
             cluster.endpoint.device.ieee,
@@ -329,7 +730,7 @@ class PersistingListener(zigpy.util.CatchingTaskMixin):
                    ON CONFLICT (ieee, endpoint_id, cluster_type, cluster_id, attr_id)
                    DO NOTHING"""
         await self.execute(q, (ieee, endpoint_id, cluster_type, cluster_id, attrid))
-        await self._db.commit()
+        await self._commit()
 
     def unsupported_attribute_removed(
         self, cluster: zigpy.typing.ClusterType, attrid: int
@@ -357,7 +758,7 @@ class PersistingListener(zigpy.util.CatchingTaskMixin):
                                                          AND cluster_id = ?
                                                          AND attr_id = ?"""
         await self.execute(q, (ieee, endpoint_id, cluster_type, cluster_id, attrid))
-        await self._db.commit()
+        await self._commit()
 
     def neighbors_updated(self, ieee: t.EUI64, neighbors: list[zdo_t.Neighbor]) -> None:
         """Neighbor update from Mgmt_Lqi_req."""
@@ -366,28 +767,52 @@ class PersistingListener(zigpy.util.CatchingTaskMixin):
     async def _neighbors_updated(
         self, ieee: t.EUI64, neighbors: list[zdo_t.Neighbor]
     ) -> None:
-        await self.execute(f"DELETE FROM neighbors{DB_V} WHERE device_ieee = ?", [ieee])
-
-        rows = [(ieee, *neighbor.as_tuple()) for neighbor in neighbors]
-
-        await self._db.executemany(
-            f"INSERT INTO neighbors{DB_V} VALUES (?,?,?,?,?,?,?,?,?,?,?,?)", rows
+        await self._update_table_rows(
+            f"neighbors{DB_V}", ieee, zdo_t.Neighbor, neighbors
         )
-        await self._db.commit()
 
     def routes_updated(self, ieee: t.EUI64, routes: list[zdo_t.Route]) -> None:
         """Route update from Mgmt_Rtg_req."""
         self.enqueue("_routes_updated", ieee, routes)
 
     async def _routes_updated(self, ieee: t.EUI64, routes: list[zdo_t.Route]) -> None:
-        await self.execute(f"DELETE FROM routes{DB_V} WHERE device_ieee = ?", [ieee])
+        await self._update_table_rows(f"routes{DB_V}", ieee, zdo_t.Route, routes)
+
+    async def _update_table_rows(
+        self,
+        table: str,
+        ieee: t.EUI64,
+        struct: type[t.Struct],
+        entries: list[t.Struct],
+    ) -> None:
+        """Replace the rows of a device's neighbor or routing table, only writing the
+        rows that differ from the stored ones.
+        """
+        added = collections.Counter(entry.as_tuple() for entry in entries)
+        removed = []
 
-        rows = [(ieee, *route.as_tuple()) for route in routes]
+        async with self.execute(
+            f"SELECT rowid, * FROM {table} WHERE device_ieee = ?", [ieee]
+        ) as cursor:
+            async for rowid, _, *values in cursor:
+                row = struct(*values).as_tuple()
+
+                if added[row] > 0:
+                    added[row] -= 1
+                else:
+                    removed.append((rowid,))
 
+        if not removed and not +added:
+            return
+
+        await self._db.executemany(f"DELETE FROM {table} WHERE rowid = ?", removed)
+
+        placeholders = ",".join("?" * (len(struct.fields) + 1))
         await self._db.executemany(
-            f"INSERT INTO routes{DB_V} VALUES (?,?,?,?,?,?,?,?)", rows
+            f"INSERT INTO {table} VALUES ({placeholders})",
+            [(ieee, *row) for row in (+added).elements()],
         )
-        await self._db.commit()
+        await self._commit()
 
     def group_added(self, group: zigpy.group.Group) -> None:
         """Group is added."""
@@ -398,7 +823,7 @@ class PersistingListener(zigpy.util.CatchingTaskMixin):
                     ON CONFLICT (group_id)
                     DO UPDATE SET name=excluded.name"""
         await self.execute(q, (group.group_id, group.name))
-        await self._db.commit()
+        await self._commit()
 
     def group_member_added(
         self, group: zigpy.group.Group, ep: zigpy.typing.EndpointType
@@ -413,7 +838,7 @@ class PersistingListener(zigpy.util.CatchingTaskMixin):
                     ON CONFLICT
                     DO NOTHING"""
         await self.execute(q, (group.group_id, *ep.unique_id))
-        await self._db.commit()
+        await self._commit()
 
     def group_member_removed(
         self, group: zigpy.group.Group, ep: zigpy.typing.EndpointType
@@ -428,7 +853,7 @@ class PersistingListener(zigpy.util.CatchingTaskMixin):
                                                 AND ieee=?
                                                 AND endpoint_id=?"""
         await self.execute(q, (group.group_id, *ep.unique_id))
-        await self._db.commit()
+        await self._commit()
 
     def group_removed(self, group: zigpy.group.Group) -> None:
         """Called when a group is removed."""
@@ -437,14 +862,14 @@ class PersistingListener(zigpy.util.CatchingTaskMixin):
     async def _group_removed(self, group: zigpy.group.Group) -> None:
         q = f"DELETE FROM groups{DB_V} WHERE group_id=?"
         await self.execute(q, (group.group_id,))
-        await self._db.commit()
+        await self._commit()
 
     def device_removed(self, device: zigpy.typing.DeviceType) -> None:
         self.enqueue("_remove_device", device)
 
     async def _remove_device(self, device: zigpy.typing.DeviceType) -> None:
         await self.execute(f"DELETE FROM devices{DB_V} WHERE ieee = ?", (device.ieee,))
-        await self._db.commit()
+        await self._commit()
 
     def raw_device_initialized(self, device: zigpy.typing.DeviceType) -> None:
         self.enqueue("_save_device", device)
@@ -471,7 +896,7 @@ class PersistingListener(zigpy.util.CatchingTaskMixin):
             await self._save_node_descriptor(device)
 
         if isinstance(device, zigpy.quirks.BaseCustomDevice):
-            await self._db.commit()
+            await self._commit()
             return
 
         await self._save_endpoints(device)
@@ -479,7 +904,7 @@ class PersistingListener(zigpy.util.CatchingTaskMixin):
             await self._save_clusters(ep)
             await self._save_attribute_cache(ep)
             await self._save_unsupported_attributes(ep)
-        await self._db.commit()
+        await self._commit()
 
     async def _save_endpoints(self, device: zigpy.typing.DeviceType) -> None:
         rows = [
@@ -584,6 +1009,52 @@ class PersistingListener(zigpy.util.CatchingTaskMixin):
         attrid: int,
         value: Any,
         timestamp: datetime,
+    ) -> None:
+        await self._save_attributes(
+            [(ieee, endpoint_id, cluster_type, cluster_id, attrid, value, timestamp)]
+        )
+        await self._commit()
+
+    async def _save_attribute_timestamps(
+        self, timestamps: list[tuple[t.EUI64, int, ClusterType, int, int, datetime]]
+    ) -> None:
+        """Persist attribute update times that are newer than the stored ones."""
+        if not timestamps:
+            return
+
+        await self._db.executemany(
+            f"""UPDATE attributes_cache{DB_V} SET last_updated=:timestamp
+                WHERE
+                    ieee=:ieee
+                    AND endpoint_id=:endpoint_id
+                    AND cluster_type=:cluster_type
+                    AND cluster_id=:cluster_id
+                    AND attr_id=:attr_id
+                    AND last_updated < :timestamp""",
+            [
+                {
+                    "ieee": ieee,
+                    "endpoint_id": endpoint_id,
+                    "cluster_type": cluster_type,
+                    "cluster_id": cluster_id,
+                    "attr_id": attr_id,
+                    "timestamp": timestamp.timestamp(),
+                }
+                for (
+                    ieee,
+                    endpoint_id,
+                    cluster_type,
+                    cluster_id,
+                    attr_id,
+                    timestamp,
+                ) in timestamps
+            ],
+        )
+        await self._commit()
+
+    async def _save_attributes(
+        self,
+        attributes: list[tuple[t.EUI64, int, ClusterType, int, int, Any, datetime]],
     ) -> None:
         q = f"""
             INSERT INTO attributes_cache{DB_V}
@@ -594,20 +1065,30 @@ class PersistingListener(zigpy.util.CatchingTaskMixin):
                     value != excluded.value
                     OR :timestamp - last_updated > :min_update_delta
             """
-        await self.execute(
+        await self._db.executemany(
             q,
-            {
-                "ieee": ieee,
-                "endpoint_id": endpoint_id,
-                "cluster_type": cluster_type,
-                "cluster_id": cluster_id,
-                "attr_id": attrid,
-                "value": value,
-                "timestamp": timestamp.timestamp(),
-                "min_update_delta": MIN_UPDATE_DELTA,
-            },
+            [
+                {
+                    "ieee": ieee,
+                    "endpoint_id": endpoint_id,
+                    "cluster_type": cluster_type,
+                    "cluster_id": cluster_id,
+                    "attr_id": attrid,
+                    "value": value,
+                    "timestamp": timestamp.timestamp(),
+                    "min_update_delta": MIN_UPDATE_DELTA,
+                }
+                for (
+                    ieee,
+                    endpoint_id,
+                    cluster_type,
+                    cluster_id,
+                    attrid,
+                    value,
+                    timestamp,
+                ) in attributes
+            ],
         )
-        await self._db.commit()
 
     async def _clear_attribute(
         self,
@@ -637,7 +1118,7 @@ class PersistingListener(zigpy.util.CatchingTaskMixin):
                 "attr_id": attrid,
             },
         )
-        await self._db.commit()
+        await self._commit()
 
     def network_backup_created(self, backup: zigpy.backups.NetworkBackup) -> None:
         self.enqueue("_network_backup_created", json.dumps(backup.as_dict()))
@@ -649,7 +1130,7 @@ class PersistingListener(zigpy.util.CatchingTaskMixin):
                         backup_json=excluded.backup_json"""
 
         await self.execute(q, (None, backup_json))
-        await self._db.commit()
+        await self._commit()
 
     def network_backup_removed(self, backup: zigpy.backups.NetworkBackup) -> None:
         self.enqueue("_network_backup_removed", backup.backup_time)
@@ -659,214 +1140,318 @@ class PersistingListener(zigpy.util.CatchingTaskMixin):
                     WHERE json_extract(backup_json, '$.backup_time')=?"""
 
         await self.execute(q, (backup_time.isoformat(),))
-        await self._db.commit()
+        await self._commit()
+
+    def _fetch_rows(
+        self, query: str, decode: Callable[[tuple], Any] | None = None
+    ) -> asyncio.Task[list]:
+        """Fetch every row of a query in a single round trip to the database thread."""
+
+        async def fetch() -> list:
+            rows = await self._db.execute_fetchall(query)
+
+            if decode is None:
+                return list(rows)
+
+            return [decode(row) for row in rows]
+
+        return asyncio.create_task(fetch())
 
     async def load(self) -> None:
         LOGGER.debug("Loading application state")
-        await self._load_devices()
-        await self._load_node_descriptors()
-        await self._load_endpoints()
-        await self._load_clusters()
-
-        # Quirks require the manufacturer and model name to be populated
-        await self._load_attributes(
-            f"""
-                cluster_type={ClusterType.Server}
-            AND cluster_id={Basic.cluster_id}
-            AND (
-                   attr_id={Basic.AttributeDefs.manufacturer.id}
-                OR attr_id={Basic.AttributeDefs.model.id}
-            )
-            """
-        )
+        start = time.monotonic()
+        timings: dict[str, float] = {}
 
-        for device in self._application.devices.values():
-            device = zigpy.quirks.get_device(device)
-            self._application.devices[device.ieee] = device
-
-        await self._load_attributes()
-        await self._load_unsupported_attributes()
-        await self._load_groups()
-        await self._load_group_members()
-        await self._load_relays()
-        await self._load_neighbors()
-        await self._load_routes()
-        await self._load_network_backups()
-        await self._register_device_listeners()
+        @contextlib.contextmanager
+        def timed(phase: str):
+            phase_start = time.monotonic()
 
-    async def _load_attributes(self, filter: str | None = None) -> None:
-        if filter:
-            query = f"SELECT * FROM attributes_cache{DB_V} WHERE {filter}"
-        else:
-            query = f"SELECT * FROM attributes_cache{DB_V}"
+            try:
+                yield
+            finally:
+                timings[phase] = time.monotonic() - phase_start
+
+        # All tables are requested upfront: the database thread reads the next tables
+        # while the event loop builds objects from the previous ones
+        fetches = {
+            "devices": self._fetch_rows(f"SELECT * FROM devices{DB_V}"),
+            "node_descriptors": self._fetch_rows(
+                f"SELECT * FROM node_descriptors{DB_V}", _decode_node_descriptor
+            ),
+            "endpoints": self._fetch_rows(f"SELECT * FROM endpoints{DB_V}"),
+            "clusters": self._fetch_rows(f"SELECT * FROM clusters{DB_V}"),
+            "attributes": self._fetch_rows(
+                f"SELECT * FROM attributes_cache{DB_V}"
+                + ("" if self._lazy_attributes is None else f" WHERE {DEVICE_INFO}"),
+                lambda row: (
+                    *row[:-1],
+                    datetime.fromtimestamp(row[-1], timezone.utc),
+                ),
+            ),
+            "unsupported_attributes": self._fetch_rows(
+                f"SELECT * FROM unsupported_attributes{DB_V}"
+            ),
+            "groups": self._fetch_rows(f"SELECT * FROM groups{DB_V}"),
+            "group_members": self._fetch_rows(f"SELECT * FROM group_members{DB_V}"),
+            "relays": self._fetch_rows(
+                f"SELECT * FROM relays{DB_V}",
+                lambda row: (
+                    row[0],
+                    zigpy.util.filter_relays(t.Relays.deserialize(row[1])[0]),
+                ),
+            ),
+            "neighbors": self._fetch_rows(
+                f"SELECT * FROM neighbors{DB_V}",
+                lambda row: (row[0], zdo_t.Neighbor(*row[1:])),
+            ),
+            "routes": self._fetch_rows(
+                f"SELECT * FROM routes{DB_V}",
+                lambda row: (row[0], zdo_t.Route(*row[1:])),
+            ),
+            "network_backups": self._fetch_rows(
+                f"SELECT * FROM network_backups{DB_V} ORDER BY id",
+                lambda row: zigpy.backups.NetworkBackup.from_dict(json.loads(row[1])),
+            ),
+        }
 
-        async with self.execute(query) as cursor:
-            async for (
-                ieee,
-                endpoint_id,
-                cluster_type,
-                cluster_id,
-                attr_id,
-                value,
-                last_updated,
-            ) in cursor:
-                dev = self._application.get_device(ieee)
+        try:
+            with timed("devices"):
+                self._load_devices(await fetches["devices"])
+
+            with timed("node_descriptors"):
+                self._load_node_descriptors(await fetches["node_descriptors"])
+
+            with timed("endpoints"):
+                self._load_endpoints(await fetches["endpoints"])
+
+            with timed("clusters"):
+                self._load_clusters(await fetches["clusters"])
+
+            with timed("quirks"):
+                attributes = await fetches["attributes"]
+
+                # Quirks require the manufacturer and model name to be populated
+                if self._lazy_attributes is None:
+                    self._load_attributes(
+                        [
+                            row
+                            for row in attributes
+                            if row[2] == ClusterType.Server
+                            and row[3] == Basic.cluster_id
+                            and row[4]
+                            in (
+                                Basic.AttributeDefs.manufacturer.id,
+                                Basic.AttributeDefs.model.id,
+                            )
+                        ]
+                    )
+                else:
+                    self._load_device_info(attributes)
 
-                # Some quirks create endpoints and clusters that do not exist
-                if endpoint_id not in dev.endpoints:
-                    continue
+                for device in self._application.devices.values():
+                    device = zigpy.quirks.get_device(device)
+                    self._application.devices[device.ieee] = device
 
-                ep = dev.endpoints[endpoint_id]
-                clusters = (
-                    ep.in_clusters
-                    if cluster_type == ClusterType.Server
-                    else ep.out_clusters
+            with timed("attributes"):
+                if self._lazy_attributes is None:
+                    self._load_attributes(attributes)
+                else:
+                    self._attach_lazy_attributes()
+
+            with timed("unsupported_attributes"):
+                self._load_unsupported_attributes(
+                    await fetches["unsupported_attributes"]
                 )
 
-                if cluster_id not in clusters:
-                    continue
+            with timed("groups"):
+                self._load_groups(await fetches["groups"])
+                self._load_group_members(await fetches["group_members"])
 
-                clusters[cluster_id]._attr_cache[attr_id] = value
-                clusters[cluster_id]._attr_last_updated[attr_id] = (
-                    datetime.fromtimestamp(last_updated, timezone.utc)
-                )
+            with timed("topology"):
+                self._load_relays(await fetches["relays"])
+                self._load_neighbors(await fetches["neighbors"])
+                self._load_routes(await fetches["routes"])
+                self._application.topology.invalidate_source_routes()
 
-                LOGGER.debug(
-                    "[0x%04x:%s:0x%04x] Attribute id: %s value: %s",
-                    dev.nwk,
-                    endpoint_id,
-                    cluster_id,
-                    attr_id,
-                    value,
-                )
+            with timed("network_backups"):
+                self._load_network_backups(await fetches["network_backups"])
+        finally:
+            for fetch in fetches.values():
+                fetch.cancel()
 
-                # Populate the device's manufacturer and model attributes
-                if (
-                    cluster_id == Basic.cluster_id
-                    and attr_id == Basic.AttributeDefs.manufacturer.id
-                ):
-                    dev.manufacturer = decode_str_attribute(value)
-                elif (
-                    cluster_id == Basic.cluster_id
-                    and attr_id == Basic.AttributeDefs.model.id
-                ):
-                    dev.model = decode_str_attribute(value)
-
-    async def _load_unsupported_attributes(self) -> None:
-        """Load unsuppoted attributes."""
+            await asyncio.gather(*fetches.values(), return_exceptions=True)
 
-        async with self.execute(
-            f"SELECT * FROM unsupported_attributes{DB_V}"
-        ) as cursor:
-            async for ieee, endpoint_id, cluster_type, cluster_id, attr_id in cursor:
-                dev = self._application.get_device(ieee)
+        await self._register_device_listeners()
 
-                try:
-                    ep = dev.endpoints[endpoint_id]
-                except KeyError:
-                    continue
+        LOGGER.debug(
+            "Loaded application state in %0.3fs (%s)",
+            time.monotonic() - start,
+            ", ".join(
+                f"{phase}: {duration:0.3f}s" for phase, duration in timings.items()
+            ),
+        )
 
-                clusters = (
-                    ep.in_clusters
-                    if cluster_type == ClusterType.Server
-                    else ep.out_clusters
-                )
+    def _load_attributes(self, rows: list[tuple]) -> None:
+        for (
+            ieee,
+            endpoint_id,
+            cluster_type,
+            cluster_id,
+            attr_id,
+            value,
+            last_updated,
+        ) in rows:
+            dev = self._application.get_device(ieee)
 
-                try:
-                    cluster = clusters[cluster_id]
-                except KeyError:
+            # Some quirks create endpoints and clusters that do not exist
+            if endpoint_id not in dev.endpoints:
+                continue
+
+            ep = dev.endpoints[endpoint_id]
+            clusters = (
+                ep.in_clusters
+                if cluster_type == ClusterType.Server
+                else ep.out_clusters
+            )
+
+            if cluster_id not in clusters:
+                continue
+
+            clusters[cluster_id]._attr_cache[attr_id] = value
+            clusters[cluster_id]._attr_last_updated[attr_id] = last_updated
+
+            LOGGER.debug(
+                "[0x%04x:%s:0x%04x] Attribute id: %s value: %s",
+                dev.nwk,
+                endpoint_id,
+                cluster_id,
+                attr_id,
+                value,
+            )
+
+            # Populate the device's manufacturer and model attributes
+            if (
+                cluster_id == Basic.cluster_id
+                and attr_id == Basic.AttributeDefs.manufacturer.id
+            ):
+                dev.manufacturer = decode_str_attribute(value)
+            elif (
+                cluster_id == Basic.cluster_id
+                and attr_id == Basic.AttributeDefs.model.id
+            ):
+                dev.model = decode_str_attribute(value)
+
+    def _load_device_info(self, rows: list[tuple]) -> None:
+        """Populate the manufacturer and model of devices without caching them."""
+        for ieee, _, _, _, attr_id, value, _ in rows:
+            dev = self._application.get_device(ieee)
+
+            if attr_id == Basic.AttributeDefs.manufacturer.id:
+                dev.manufacturer = decode_str_attribute(value)
+            else:
+                dev.model = decode_str_attribute(value)
+
+    def _attach_lazy_attributes(self) -> None:
+        assert self._lazy_attributes is not None
+
+        for dev in self._application.devices.values():
+            for ep_id, ep in dev.endpoints.items():
+                if ep_id == 0:
                     continue
 
-                cluster.add_unsupported_attribute(attr_id, inhibit_events=True)
-
-    async def _load_devices(self) -> None:
-        async with self.execute(f"SELECT * FROM devices{DB_V}") as cursor:
-            async for ieee, nwk, status, last_seen in cursor:
-                dev = self._application.add_device(ieee, nwk)
-                dev.status = zigpy.device.Status(status)
-
-                if last_seen > 0:
-                    dev.last_seen = last_seen
-
-    async def _load_node_descriptors(self) -> None:
-        async with self.execute(f"SELECT * FROM node_descriptors{DB_V}") as cursor:
-            async for ieee, *fields in cursor:
-                dev = self._application.get_device(ieee)
-                dev.node_desc = zdo_t.NodeDescriptor(*fields)
-                assert dev.node_desc.is_valid
-
-    async def _load_endpoints(self) -> None:
-        async with self.execute(f"SELECT * FROM endpoints{DB_V}") as cursor:
-            async for ieee, epid, profile_id, device_type, status in cursor:
-                dev = self._application.get_device(ieee)
-                ep = dev.add_endpoint(epid)
-                ep.profile_id = profile_id
-                ep.status = zigpy.endpoint.Status(status)
-
-                if profile_id == zigpy.profiles.zha.PROFILE_ID:
-                    ep.device_type = zigpy.profiles.zha.DeviceType(device_type)
-                elif profile_id == zigpy.profiles.zll.PROFILE_ID:
-                    ep.device_type = zigpy.profiles.zll.DeviceType(device_type)
-                else:
-                    ep.device_type = device_type
+                for cluster in (*ep.in_clusters.values(), *ep.out_clusters.values()):
+                    # Clusters whose cache was populated by quirks are kept as-is
+                    if not cluster._attr_cache:
+                        self._lazy_attributes.attach(cluster)
 
-    async def _load_clusters(self) -> None:
-        async with self.execute(f"SELECT * FROM clusters{DB_V}") as cursor:
-            async for ieee, endpoint_id, cluster_type, cluster_id in cursor:
-                dev = self._application.get_device(ieee)
-                ep = dev.endpoints[endpoint_id]
+    def _load_unsupported_attributes(self, rows: list[tuple]) -> None:
+        """Load unsuppoted attributes."""
 
-                if ClusterType(cluster_type) == ClusterType.Server:
-                    ep.add_input_cluster(cluster_id)
-                else:
-                    ep.add_output_cluster(cluster_id)
-
-    async def _load_groups(self) -> None:
-        async with self.execute(f"SELECT * FROM groups{DB_V}") as cursor:
-            async for group_id, name in cursor:
-                self._application.groups.add_group(group_id, name, suppress_event=True)
-
-    async def _load_group_members(self) -> None:
-        async with self.execute(f"SELECT * FROM group_members{DB_V}") as cursor:
-            async for group_id, ieee, ep_id in cursor:
-                dev = self._application.get_device(ieee)
-                group = self._application.groups[group_id]
-                group.add_member(dev.endpoints[ep_id], suppress_event=True)
-
-    async def _load_relays(self) -> None:
-        async with self.execute(f"SELECT * FROM relays{DB_V}") as cursor:
-            async for ieee, value in cursor:
-                dev = self._application.get_device(ieee)
-                relays, _ = t.Relays.deserialize(value)
-                dev.relays = zigpy.util.filter_relays(relays)
-
-    async def _load_neighbors(self) -> None:
-        async with self.execute(f"SELECT * FROM neighbors{DB_V}") as cursor:
-            async for ieee, *fields in cursor:
-                neighbor = zdo_t.Neighbor(*fields)
-                self._application.topology.neighbors[ieee].append(neighbor)
-
-    async def _load_routes(self) -> None:
-        async with self.execute(f"SELECT * FROM routes{DB_V}") as cursor:
-            async for ieee, *fields in cursor:
-                route = zdo_t.Route(*fields)
-                self._application.topology.routes[ieee].append(route)
-
-    async def _load_network_backups(self) -> None:
-        self._application.backups.backups.clear()
+        for ieee, endpoint_id, cluster_type, cluster_id, attr_id in rows:
+            dev = self._application.get_device(ieee)
 
-        async with self.execute(
-            f"SELECT * FROM network_backups{DB_V} ORDER BY id"
-        ) as cursor:
-            backups = []
+            try:
+                ep = dev.endpoints[endpoint_id]
+            except KeyError:
+                continue
 
-            async for _id, backup_json in cursor:
-                backup = zigpy.backups.NetworkBackup.from_dict(json.loads(backup_json))
-                backups.append(backup)
+            clusters = (
+                ep.in_clusters
+                if cluster_type == ClusterType.Server
+                else ep.out_clusters
+            )
 
-        backups.sort(key=lambda b: b.backup_time)
+            try:
+                cluster = clusters[cluster_id]
+            except KeyError:
+                continue
+
+            cluster.add_unsupported_attribute(attr_id, inhibit_events=True)
+
+    def _load_devices(self, rows: list[tuple]) -> None:
+        for ieee, nwk, status, last_seen in rows:
+            dev = self._application.add_device(ieee, nwk)
+            dev.status = zigpy.device.Status(status)
+
+            if last_seen > 0:
+                dev.last_seen = last_seen
+
+    def _load_node_descriptors(self, rows: list[tuple]) -> None:
+        for ieee, node_desc in rows:
+            dev = self._application.get_device(ieee)
+            dev.node_desc = node_desc
+
+    def _load_endpoints(self, rows: list[tuple]) -> None:
+        for ieee, epid, profile_id, device_type, status in rows:
+            dev = self._application.get_device(ieee)
+            ep = dev.add_endpoint(epid)
+            ep.profile_id = profile_id
+            ep.status = zigpy.endpoint.Status(status)
+
+            if profile_id == zigpy.profiles.zha.PROFILE_ID:
+                ep.device_type = zigpy.profiles.zha.DeviceType(device_type)
+            elif profile_id == zigpy.profiles.zll.PROFILE_ID:
+                ep.device_type = zigpy.profiles.zll.DeviceType(device_type)
+            else:
+                ep.device_type = device_type
+
+    def _load_clusters(self, rows: list[tuple]) -> None:
+        for ieee, endpoint_id, cluster_type, cluster_id in rows:
+            dev = self._application.get_device(ieee)
+            ep = dev.endpoints[endpoint_id]
+
+            if ClusterType(cluster_type) == ClusterType.Server:
+                ep.add_input_cluster(cluster_id)
+            else:
+                ep.add_output_cluster(cluster_id)
+
+    def _load_groups(self, rows: list[tuple]) -> None:
+        for group_id, name in rows:
+            self._application.groups.add_group(group_id, name, suppress_event=True)
+
+    def _load_group_members(self, rows: list[tuple]) -> None:
+        for group_id, ieee, ep_id in rows:
+            dev = self._application.get_device(ieee)
+            group = self._application.groups[group_id]
+            group.add_member(dev.endpoints[ep_id], suppress_event=True)
+
+    def _load_relays(self, rows: list[tuple]) -> None:
+        for ieee, relays in rows:
+            dev = self._application.get_device(ieee)
+            dev.relays = relays
+
+    def _load_neighbors(self, rows: list[tuple]) -> None:
+        for ieee, neighbor in rows:
+            self._application.topology.neighbors[ieee].append(neighbor)
+
+    def _load_routes(self, rows: list[tuple]) -> None:
+        for ieee, route in rows:
+            self._application.topology.routes[ieee].append(route)
+
+    def _load_network_backups(self, backups: list[zigpy.backups.NetworkBackup]) -> None:
+        self._application.backups.backups.clear()
 
-        for backup in backups:
+        for backup in sorted(backups, key=lambda b: b.backup_time):
             self._application.backups.add_backup(backup, suppress_event=True)
 
     async def _register_device_listeners(self) -> None:
@@ -24,7 +24,12 @@ import zigpy.appdb
 import zigpy.backups
 import zigpy.config as conf
 from zigpy.const import INTERFERENCE_MESSAGE
-from zigpy.datastructures import PriorityDynamicBoundedSemaphore
+from zigpy.datastructures import (
+    Debouncer,
+    DebouncerPool,
+    PriorityDynamicBoundedSemaphore,
+    SequenceAllocator,
+)
 import zigpy.device
 import zigpy.endpoint
 import zigpy.exceptions
@@ -33,6 +38,13 @@ import zigpy.listeners
 import zigpy.ota
 import zigpy.profiles
 import zigpy.quirks
+from zigpy.scheduler import (
+    DEVICE_FAILURE_WINDOW,
+    MIN_FAILING_DEVICES,
+    ConcurrencyController,
+    DestinationClass,
+    RequestScheduler,
+)
 import zigpy.state
 import zigpy.topology
 import zigpy.types as t
@@ -55,6 +67,14 @@ _R = TypeVar("_R")
 CHANNEL_CHANGE_BROADCAST_DELAY_S = 1.0
 CHANNEL_CHANGE_SETTINGS_RELOAD_DELAY_S = 1.0
 
+# Repeated discoveries of an unknown device back off exponentially, and discoveries of
+# all devices share a budget of broadcasts
+DISCOVERY_BACKOFF_INITIAL_S = 30.0
+DISCOVERY_BACKOFF_MAX_S = 30 * 60.0
+DISCOVERY_BROADCAST_BUDGET = 5
+DISCOVERY_BROADCAST_BUDGET_PERIOD_S = 60.0
+DISCOVERY_MAX_TRACKED_DEVICES = 1024
+
 
 class ControllerApplication(zigpy.util.ListenableMixin, abc.ABC):
     SCHEMA = conf.CONFIG_SCHEMA
@@ -63,14 +83,16 @@ class ControllerApplication(zigpy.util.ListenableMixin, abc.ABC):
     _probe_configs: list[dict[str, Any]] = []
 
     def __init__(self, config: dict) -> None:
-        self.devices: dict[t.EUI64, zigpy.device.Device] = {}
+        self.devices: zigpy.device.DeviceDict = zigpy.device.DeviceDict()
         self.state: zigpy.state.State = zigpy.state.State()
         self._listeners = {}
         self._config = self.SCHEMA(config)
         self._dblistener = None
         self._groups = zigpy.group.Groups(self)
         self._listeners = {}
-        self._send_sequence = 0
+        self._sequence_allocator = SequenceAllocator(
+            get_counters=lambda: self.state.counters["sequence_allocator"]
+        )
         self._tasks: set[asyncio.Future[Any]] = set()
 
         self._watchdog_task: asyncio.Task | None = None
@@ -78,6 +100,30 @@ class ControllerApplication(zigpy.util.ListenableMixin, abc.ABC):
         self._concurrent_requests_semaphore = PriorityDynamicBoundedSemaphore(
             self._config[conf.CONF_MAX_CONCURRENT_REQUESTS]
         )
+        self._scheduler = RequestScheduler(
+            {
+                DestinationClass.ROUTER: None,
+                DestinationClass.UNKNOWN: None,
+                DestinationClass.END_DEVICE: self._config[
+                    conf.CONF_MAX_CONCURRENT_END_DEVICE_REQUESTS
+                ],
+                DestinationClass.BROADCAST: self._config[
+                    conf.CONF_MAX_CONCURRENT_BROADCASTS
+                ],
+            },
+            max_queue_time=self._config[conf.CONF_MAX_REQUEST_QUEUE_TIME],
+            counters=self.state.counters["request_scheduler"],
+        )
+        self._concurrency_controller: ConcurrencyController | None = None
+
+        if self._config[conf.CONF_ADAPTIVE_CONCURRENCY]:
+            self._concurrency_controller = ConcurrencyController(
+                self._concurrent_requests_semaphore,
+                min_value=self._config[conf.CONF_ADAPTIVE_CONCURRENCY_MIN],
+                max_value=self._config[conf.CONF_ADAPTIVE_CONCURRENCY_MAX],
+                counters=self.state.counters["adaptive_concurrency"],
+                min_failing_sources=MIN_FAILING_DEVICES,
+            )
 
         self.ota = zigpy.ota.OTA(self._config[conf.CONF_OTA], self)
         self.backups: zigpy.backups.BackupManager = zigpy.backups.BackupManager(self)
@@ -85,8 +131,19 @@ class ControllerApplication(zigpy.util.ListenableMixin, abc.ABC):
 
         self._req_listeners: collections.defaultdict[
             zigpy.device.Device,
-            collections.deque[zigpy.listeners.BaseRequestListener],
-        ] = collections.defaultdict(lambda: collections.deque([]))
+            zigpy.listeners.ListenerIndex,
+        ] = collections.defaultdict(zigpy.listeners.ListenerIndex)
+
+        # Bounds the memory used to deduplicate packets across all devices
+        self._packet_debouncer_pool = DebouncerPool(
+            max_size=zigpy.device.PACKET_DEBOUNCE_MAX_TRACKED_TOTAL
+        )
+
+        # Discoveries of devices with an unknown NWK address
+        self._discoveries: dict[t.NWK, asyncio.Event] = {}
+        self._discovery_attempts: dict[t.NWK, int] = {}
+        self._discovery_backoff = Debouncer(max_size=DISCOVERY_MAX_TRACKED_DEVICES)
+        self._discovery_broadcasts: collections.deque[float] = collections.deque()
 
     def create_task(
         self, target: Coroutine[Any, Any, _R], name: str | None = None
@@ -106,7 +163,17 @@ class ControllerApplication(zigpy.util.ListenableMixin, abc.ABC):
         if not database_file:
             return
 
-        self._dblistener = await zigpy.appdb.PersistingListener.new(database_file, self)
+        self._dblistener = await zigpy.appdb.PersistingListener.new(
+            database_file,
+            self,
+            batch_size=self.config[conf.CONF_DATABASE_BATCH_SIZE],
+            flush_interval=self.config[conf.CONF_DATABASE_FLUSH_INTERVAL],
+            lazy_attributes_max_clusters=(
+                self.config[conf.CONF_DATABASE_LAZY_ATTRIBUTES_MAX_CLUSTERS]
+                if self.config[conf.CONF_DATABASE_LAZY_ATTRIBUTES]
+                else None
+            ),
+        )
         await self._dblistener.load()
         self._add_db_listeners()
 
@@ -486,6 +553,7 @@ class ControllerApplication(zigpy.util.ListenableMixin, abc.ABC):
         dev.cancel_initialization()
 
         LOGGER.info("Removing device 0x%04x (%s)", dev.nwk, ieee)
+        self.topology.invalidate_source_routes()
         self.create_task(
             self._remove_device(dev, remove_children=remove_children, rejoin=rejoin),
             f"remove_device-nwk={dev.nwk!r}-ieee={ieee!r}",
@@ -534,6 +602,10 @@ class ControllerApplication(zigpy.util.ListenableMixin, abc.ABC):
             LOGGER.debug("Sending 'zdo_leave_req' failed: %s", ex)
 
         self.devices.pop(device.ieee, None)
+        self.topology.invalidate_source_routes()
+
+        if self._concurrency_controller is not None:
+            self._concurrency_controller.forget(device.ieee)
 
     def deserialize(
         self,
@@ -576,6 +648,8 @@ class ControllerApplication(zigpy.util.ListenableMixin, abc.ABC):
         # Not all stacks send a ZDO command when a device joins so the last_seen should
         # be updated
         dev.update_last_seen()
+        self.topology.handle_join(ieee, parent_nwk)
+        self._discovery_attempts.pop(nwk, None)
 
         if new_join:
             self.listener_event("device_joined", dev)
@@ -590,6 +664,7 @@ class ControllerApplication(zigpy.util.ListenableMixin, abc.ABC):
     def handle_leave(self, nwk: t.NWK, ieee: t.EUI64):
         """Called when a device has left the network."""
         LOGGER.info("Device 0x%04x (%s) left the network", nwk, ieee)
+        self.topology.handle_leave(ieee)
 
         try:
             dev = self.get_device(ieee=ieee)
@@ -760,7 +835,9 @@ class ControllerApplication(zigpy.util.ListenableMixin, abc.ABC):
                 self._concurrent_requests_semaphore.num_waiting,
             )
 
-        async with self._concurrent_requests_semaphore(priority=priority):
+        async with self._scheduler.global_slot(
+            self._concurrent_requests_semaphore, priority=priority
+        ):
             if was_locked:
                 LOGGER.debug(
                     "Previously delayed request is now running, delayed by %0.2fs",
@@ -769,6 +846,38 @@ class ControllerApplication(zigpy.util.ListenableMixin, abc.ABC):
 
             yield
 
+    def _handle_request_result(
+        self, device: zigpy.device.Device, *, rtt: float | None
+    ) -> None:
+        """Adapt the global and device concurrency limits to the outcome of a device
+        request. `rtt` is `None` if the request failed.
+        """
+        if self._concurrency_controller is None:
+            return
+
+        # Requests to sleepy end devices are slow and fail whenever the device is
+        # asleep, they say nothing about congestion
+        if DestinationClass.for_device(device) is not DestinationClass.ROUTER:
+            return
+
+        if device._concurrency_controller is None:
+            device._concurrency_controller = ConcurrencyController(
+                device._concurrent_requests_semaphore,
+                min_value=1,
+                max_value=self._config[conf.CONF_ADAPTIVE_DEVICE_CONCURRENCY_MAX],
+                counters=self.state.device_counters[str(device.ieee)],
+                failure_window=DEVICE_FAILURE_WINDOW,
+            )
+
+        # Failures of a single device only lower the global limit once other devices
+        # start failing as well
+        if rtt is None:
+            device._concurrency_controller.record_failure()
+            self._concurrency_controller.record_failure(device.ieee)
+        else:
+            device._concurrency_controller.record_success(rtt)
+            self._concurrency_controller.record_success(rtt, device.ieee)
+
     @abc.abstractmethod
     async def send_packet(self, packet: t.ZigbeePacket) -> None:
         """Send a Zigbee packet using the appropriate addressing mode and provided options."""
@@ -778,10 +887,14 @@ class ControllerApplication(zigpy.util.ListenableMixin, abc.ABC):
     def build_source_route_to(self, dest: zigpy.device.Device) -> list[t.NWK] | None:
         """Compute a source route to the destination device."""
 
+        route = self.topology.build_source_route_to(dest)
+
+        if route is not None:
+            return route
+
         if dest.relays is None:
             return None
 
-        # TODO: utilize topology scanner information
         return dest.relays[::-1]
 
     async def request(
@@ -799,6 +912,7 @@ class ControllerApplication(zigpy.util.ListenableMixin, abc.ABC):
         extended_timeout: bool = False,
         ask_for_ack: bool | None = None,
         priority: int = t.PacketPriority.NORMAL,
+        deadline: float | None = None,
     ) -> tuple[zigpy.zcl.foundation.Status, str]:
         """Submit and send data out as an unicast transmission.
         :param device: destination device
@@ -811,6 +925,8 @@ class ControllerApplication(zigpy.util.ListenableMixin, abc.ABC):
         :param expect_reply: True if this is essentially a request
         :param use_ieee: use EUI64 for destination addressing
         :param extended_timeout: instruct the radio to use slower APS retries
+        :param deadline: event loop time after which the request is dropped if it is
+                         still queued
         """
 
         if use_ieee:
@@ -838,22 +954,25 @@ class ControllerApplication(zigpy.util.ListenableMixin, abc.ABC):
         elif not expect_reply:
             tx_options |= t.TransmitOptions.ACK
 
-        await self.send_packet(
-            t.ZigbeePacket(
-                src=src,
-                src_ep=src_ep,
-                dst=dst,
-                dst_ep=dst_ep,
-                tsn=sequence,
-                profile_id=profile,
-                cluster_id=cluster,
-                data=t.SerializableBytes(data),
-                extended_timeout=extended_timeout,
-                source_route=source_route,
-                tx_options=tx_options,
-                priority=priority,
+        async with self._scheduler.schedule(
+            DestinationClass.for_device(device), priority=priority, deadline=deadline
+        ):
+            await self.send_packet(
+                t.ZigbeePacket(
+                    src=src,
+                    src_ep=src_ep,
+                    dst=dst,
+                    dst_ep=dst_ep,
+                    tsn=sequence,
+                    profile_id=profile,
+                    cluster_id=cluster,
+                    data=t.SerializableBytes(data),
+                    extended_timeout=extended_timeout,
+                    source_route=source_route,
+                    tx_options=tx_options,
+                    priority=priority,
+                )
             )
-        )
 
         return (zigpy.zcl.foundation.Status.SUCCESS, "")
 
@@ -869,6 +988,7 @@ class ControllerApplication(zigpy.util.ListenableMixin, abc.ABC):
         hops: int = 0,
         non_member_radius: int = 3,
         priority: int = t.PacketPriority.NORMAL,
+        deadline: float | None = None,
     ):
         """Submit and send data out as a multicast transmission.
         :param group_id: destination multicast address
@@ -882,25 +1002,30 @@ class ControllerApplication(zigpy.util.ListenableMixin, abc.ABC):
         :param non_member_radius: the number of hops that the message will be forwarded
                                   by devices that are not members of the group. A value
                                   of 7 or greater is treated as infinite
+        :param deadline: event loop time after which the request is dropped if it is
+                         still queued
         """
 
-        await self.send_packet(
-            t.ZigbeePacket(
-                src=t.AddrModeAddress(
-                    addr_mode=t.AddrMode.NWK, address=self.state.node_info.nwk
-                ),
-                src_ep=src_ep,
-                dst=t.AddrModeAddress(addr_mode=t.AddrMode.Group, address=group_id),
-                tsn=sequence,
-                profile_id=profile,
-                cluster_id=cluster,
-                data=t.SerializableBytes(data),
-                tx_options=t.TransmitOptions.NONE,
-                radius=hops,
-                non_member_radius=non_member_radius,
-                priority=priority,
+        async with self._scheduler.schedule(
+            DestinationClass.BROADCAST, priority=priority, deadline=deadline
+        ):
+            await self.send_packet(
+                t.ZigbeePacket(
+                    src=t.AddrModeAddress(
+                        addr_mode=t.AddrMode.NWK, address=self.state.node_info.nwk
+                    ),
+                    src_ep=src_ep,
+                    dst=t.AddrModeAddress(addr_mode=t.AddrMode.Group, address=group_id),
+                    tsn=sequence,
+                    profile_id=profile,
+                    cluster_id=cluster,
+                    data=t.SerializableBytes(data),
+                    tx_options=t.TransmitOptions.NONE,
+                    radius=hops,
+                    non_member_radius=non_member_radius,
+                    priority=priority,
+                )
             )
-        )
 
         return (zigpy.zcl.foundation.Status.SUCCESS, "")
 
@@ -916,6 +1041,7 @@ class ControllerApplication(zigpy.util.ListenableMixin, abc.ABC):
         data: bytes,
         broadcast_address: t.BroadcastAddress = t.BroadcastAddress.RX_ON_WHEN_IDLE,
         priority: int = t.PacketPriority.NORMAL,
+        deadline: float | None = None,
     ) -> tuple[zigpy.zcl.foundation.Status, str]:
         """Submit and send data out as an unicast transmission.
         :param profile: Zigbee Profile ID to use for outgoing message
@@ -928,42 +1054,99 @@ class ControllerApplication(zigpy.util.ListenableMixin, abc.ABC):
         :param data: zigbee message payload
         :param timeout: how long to wait for transmission ACK
         :param broadcast_address: broadcast address.
+        :param deadline: event loop time after which the request is dropped if it is
+                         still queued
         """
 
-        await self.send_packet(
-            t.ZigbeePacket(
-                src=t.AddrModeAddress(
-                    addr_mode=t.AddrMode.NWK, address=self.state.node_info.nwk
-                ),
-                src_ep=src_ep,
-                dst=t.AddrModeAddress(
-                    addr_mode=t.AddrMode.Broadcast, address=broadcast_address
-                ),
-                dst_ep=dst_ep,
-                tsn=sequence,
-                profile_id=profile,
-                cluster_id=cluster,
-                data=t.SerializableBytes(data),
-                tx_options=t.TransmitOptions.NONE,
-                radius=radius,
-                priority=priority,
+        async with self._scheduler.schedule(
+            DestinationClass.BROADCAST, priority=priority, deadline=deadline
+        ):
+            await self.send_packet(
+                t.ZigbeePacket(
+                    src=t.AddrModeAddress(
+                        addr_mode=t.AddrMode.NWK, address=self.state.node_info.nwk
+                    ),
+                    src_ep=src_ep,
+                    dst=t.AddrModeAddress(
+                        addr_mode=t.AddrMode.Broadcast, address=broadcast_address
+                    ),
+                    dst_ep=dst_ep,
+                    tsn=sequence,
+                    profile_id=profile,
+                    cluster_id=cluster,
+                    data=t.SerializableBytes(data),
+                    tx_options=t.TransmitOptions.NONE,
+                    radius=radius,
+                    priority=priority,
+                )
             )
-        )
 
         return (zigpy.zcl.foundation.Status.SUCCESS, "")
 
-    async def _discover_unknown_device(self, nwk: t.NWK) -> None:
-        """Discover the IEEE address of a device with an unknown NWK."""
-
-        return await zigpy.zdo.broadcast(
-            app=self,
-            command=zdo_types.ZDOCmd.IEEE_addr_req,
-            grpid=None,
-            radius=0,
-            NWKAddrOfInterest=nwk,
-            RequestType=zdo_types.AddrRequestType.Single,
-            StartIndex=0,
+    async def _discover_unknown_device(self, nwk: t.NWK) -> bool:
+        """Discover the IEEE address of a device with an unknown NWK, returning whether
+        a broadcast was sent.
+
+        Concurrent discoveries of a device are coalesced, repeated ones back off
+        exponentially and all of them share a budget of broadcasts.
+        """
+        counters = self.state.counters["device_discovery"]
+
+        if nwk in self._discoveries:
+            counters["coalesced"].increment()
+            await self._discoveries[nwk].wait()
+            return False
+
+        if self._discovery_backoff.is_filtered(nwk):
+            LOGGER.debug("Backing off discovery of unknown device %s", nwk)
+            counters["backed_off"].increment()
+            return False
+
+        now = asyncio.get_running_loop().time()
+        broadcasts = self._discovery_broadcasts
+
+        while broadcasts and broadcasts[0] <= now - DISCOVERY_BROADCAST_BUDGET_PERIOD_S:
+            broadcasts.popleft()
+
+        if len(broadcasts) >= DISCOVERY_BROADCAST_BUDGET:
+            LOGGER.debug("Discovery budget exceeded, not discovering %s", nwk)
+            counters["over_budget"].increment()
+            return False
+
+        broadcasts.append(now)
+
+        # Reinsert the device to keep the most recently discovered ones
+        attempts = self._discovery_attempts.pop(nwk, 0)
+        self._discovery_attempts[nwk] = attempts + 1
+
+        if len(self._discovery_attempts) > DISCOVERY_MAX_TRACKED_DEVICES:
+            del self._discovery_attempts[next(iter(self._discovery_attempts))]
+
+        self._discovery_backoff.filter(
+            nwk,
+            expire_in=min(
+                DISCOVERY_BACKOFF_INITIAL_S * 2**attempts, DISCOVERY_BACKOFF_MAX_S
+            ),
         )
+        counters["broadcasts"].increment()
+
+        self._discoveries[nwk] = done = asyncio.Event()
+
+        try:
+            await zigpy.zdo.broadcast(
+                app=self,
+                command=zdo_types.ZDOCmd.IEEE_addr_req,
+                grpid=None,
+                radius=0,
+                NWKAddrOfInterest=nwk,
+                RequestType=zdo_types.AddrRequestType.Single,
+                StartIndex=0,
+            )
+        finally:
+            del self._discoveries[nwk]
+            done.set()
+
+        return True
 
     def _maybe_parse_zdo(self, packet: t.ZigbeePacket) -> None:
         """Attempt to parse an incoming packet as ZDO, to extract useful notifications."""
@@ -1268,8 +1451,7 @@ class ControllerApplication(zigpy.util.ListenableMixin, abc.ABC):
         await self.permit_ncp(time_s)
 
     def get_sequence(self) -> t.uint8_t:
-        self._send_sequence = (self._send_sequence + 1) % 256
-        return self._send_sequence
+        return self._sequence_allocator.allocate()
 
     def get_device(
         self, ieee: t.EUI64 = None, nwk: t.NWK | int = None
@@ -1285,14 +1467,10 @@ class ControllerApplication(zigpy.util.ListenableMixin, abc.ABC):
         if nwk == self.state.node_info.nwk:
             return self.devices[self.state.node_info.ieee]
 
-        # TODO: Make this not terrible
-        # Unlike its IEEE address, a device's NWK address can change at runtime so this
-        # is not as simple as building a second mapping
-        for dev in self.devices.values():
-            if dev.nwk == nwk:
-                return dev
-
-        raise KeyError(f"Device not found: nwk={nwk!r}, ieee={ieee!r}")
+        try:
+            return self.devices.get_by_nwk(nwk)
+        except KeyError:
+            raise KeyError(f"Device not found: nwk={nwk!r}, ieee={ieee!r}") from None
 
     def get_endpoint_id(self, cluster_id: int, is_server_cluster: bool = False) -> int:
         """Returns coordinator endpoint id for specified cluster id."""
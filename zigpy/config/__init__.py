@@ -5,9 +5,21 @@ from __future__ import annotations
 import voluptuous as vol
 
 from zigpy.config.defaults import (
+    CONF_ADAPTIVE_CONCURRENCY_DEFAULT,
+    CONF_ADAPTIVE_CONCURRENCY_MAX_DEFAULT,
+    CONF_ADAPTIVE_CONCURRENCY_MIN_DEFAULT,
+    CONF_ADAPTIVE_DEVICE_CONCURRENCY_MAX_DEFAULT,
+    CONF_ATTRIBUTE_READ_BATCH_WINDOW_DEFAULT,
+    CONF_DATABASE_BATCH_SIZE_DEFAULT,
+    CONF_DATABASE_FLUSH_INTERVAL_DEFAULT,
+    CONF_DATABASE_LAZY_ATTRIBUTES_DEFAULT,
+    CONF_DATABASE_LAZY_ATTRIBUTES_MAX_CLUSTERS_DEFAULT,
     CONF_DEVICE_BAUDRATE_DEFAULT,
     CONF_DEVICE_FLOW_CONTROL_DEFAULT,
+    CONF_MAX_CONCURRENT_BROADCASTS_DEFAULT,
+    CONF_MAX_CONCURRENT_END_DEVICE_REQUESTS_DEFAULT,
     CONF_MAX_CONCURRENT_REQUESTS_DEFAULT,
+    CONF_MAX_REQUEST_QUEUE_TIME_DEFAULT,
     CONF_NWK_BACKUP_ENABLED_DEFAULT,
     CONF_NWK_BACKUP_PERIOD_DEFAULT,
     CONF_NWK_CHANNEL_DEFAULT,
@@ -23,13 +35,18 @@ from zigpy.config.defaults import (
     CONF_OTA_BROADCAST_ENABLED_DEFAULT,
     CONF_OTA_BROADCAST_INITIAL_DELAY_DEFAULT,
     CONF_OTA_BROADCAST_INTERVAL_DEFAULT,
+    CONF_OTA_CACHE_DIR_DEFAULT,
+    CONF_OTA_CACHE_MAX_SIZE_DEFAULT,
     CONF_OTA_DISABLE_DEFAULT_PROVIDERS_DEFAULT,
     CONF_OTA_ENABLED_DEFAULT,
     CONF_OTA_EXTRA_PROVIDERS_DEFAULT,
     CONF_OTA_PROVIDERS_DEFAULT,
     CONF_SOURCE_ROUTING_DEFAULT,
     CONF_STARTUP_ENERGY_SCAN_DEFAULT,
+    CONF_TOPO_SCAN_CONCURRENCY_DEFAULT,
     CONF_TOPO_SCAN_ENABLED_DEFAULT,
+    CONF_TOPO_SCAN_INCREMENTAL_DEFAULT,
+    CONF_TOPO_SCAN_MAX_BACKOFF_DEFAULT,
     CONF_TOPO_SCAN_PERIOD_DEFAULT,
     CONF_TOPO_SKIP_COORDINATOR_DEFAULT,
     CONF_WATCHDOG_ENABLED_DEFAULT,
@@ -49,11 +66,23 @@ import zigpy.types as t
 
 CONF_ADDITIONAL_ENDPOINTS = "additional_endpoints"
 CONF_DATABASE = "database_path"
+CONF_DATABASE_BATCH_SIZE = "database_batch_size"
+CONF_DATABASE_FLUSH_INTERVAL = "database_flush_interval"
+CONF_DATABASE_LAZY_ATTRIBUTES = "database_lazy_attributes"
+CONF_DATABASE_LAZY_ATTRIBUTES_MAX_CLUSTERS = "database_lazy_attributes_max_clusters"
 CONF_DEVICE = "device"
 CONF_DEVICE_PATH = "path"
 CONF_DEVICE_BAUDRATE = "baudrate"
 CONF_DEVICE_FLOW_CONTROL = "flow_control"
 CONF_MAX_CONCURRENT_REQUESTS = "max_concurrent_requests"
+CONF_MAX_CONCURRENT_END_DEVICE_REQUESTS = "max_concurrent_end_device_requests"
+CONF_MAX_CONCURRENT_BROADCASTS = "max_concurrent_broadcasts"
+CONF_MAX_REQUEST_QUEUE_TIME = "max_request_queue_time"
+CONF_ADAPTIVE_CONCURRENCY = "adaptive_concurrency"
+CONF_ADAPTIVE_CONCURRENCY_MIN = "adaptive_concurrency_min"
+CONF_ADAPTIVE_CONCURRENCY_MAX = "adaptive_concurrency_max"
+CONF_ADAPTIVE_DEVICE_CONCURRENCY_MAX = "adaptive_device_concurrency_max"
+CONF_ATTRIBUTE_READ_BATCH_WINDOW = "attribute_read_batch_window"
 CONF_NWK = "network"
 CONF_NWK_CHANNEL = "channel"
 CONF_NWK_CHANNELS = "channels"
@@ -81,12 +110,17 @@ CONF_OTA_PROVIDER_WARNING = "warning"
 CONF_OTA_BROADCAST_ENABLED = "broadcast_enabled"
 CONF_OTA_BROADCAST_INITIAL_DELAY = "broadcast_initial_delay"
 CONF_OTA_BROADCAST_INTERVAL = "broadcast_interval"
+CONF_OTA_CACHE_DIR = "cache_dir"
+CONF_OTA_CACHE_MAX_SIZE = "cache_max_size"
 CONF_OTA_PROVIDER_MANUF_IDS = "manufacturer_ids"
 CONF_SOURCE_ROUTING = "source_routing"
 CONF_STARTUP_ENERGY_SCAN = "startup_energy_scan"
 CONF_TOPO_SCAN_PERIOD = "topology_scan_period"
 CONF_TOPO_SCAN_ENABLED = "topology_scan_enabled"
 CONF_TOPO_SKIP_COORDINATOR = "topology_scan_skip_coordinator"
+CONF_TOPO_SCAN_CONCURRENCY = "topology_scan_concurrency"
+CONF_TOPO_SCAN_INCREMENTAL = "topology_scan_incremental"
+CONF_TOPO_SCAN_MAX_BACKOFF = "topology_scan_max_backoff"
 CONF_WATCHDOG_ENABLED = "watchdog_enabled"
 
 CONF_OTA_ALLOW_ADVANCED_DIR_STRING = (
@@ -203,6 +237,12 @@ SCHEMA_OTA_BASE = {
     vol.Optional(
         CONF_OTA_BROADCAST_INTERVAL, default=CONF_OTA_BROADCAST_INTERVAL_DEFAULT
     ): vol.All(vol.Coerce(float), vol.Range(min=0)),
+    vol.Optional(CONF_OTA_CACHE_DIR, default=CONF_OTA_CACHE_DIR_DEFAULT): vol.Any(
+        None, str
+    ),
+    vol.Optional(
+        CONF_OTA_CACHE_MAX_SIZE, default=CONF_OTA_CACHE_MAX_SIZE_DEFAULT
+    ): vol.All(int, vol.Range(min=0)),
     vol.Optional(CONF_OTA_PROVIDERS, default=CONF_OTA_PROVIDERS_DEFAULT): [
         cv_ota_provider
     ],
@@ -343,6 +383,19 @@ SCHEMA_OTA = vol.Schema(
 ZIGPY_SCHEMA = vol.Schema(
     {
         vol.Optional(CONF_DATABASE, default=None): vol.Any(None, str),
+        vol.Optional(
+            CONF_DATABASE_BATCH_SIZE, default=CONF_DATABASE_BATCH_SIZE_DEFAULT
+        ): vol.All(int, vol.Range(min=1)),
+        vol.Optional(
+            CONF_DATABASE_FLUSH_INTERVAL, default=CONF_DATABASE_FLUSH_INTERVAL_DEFAULT
+        ): vol.All(vol.Coerce(float), vol.Range(min=0)),
+        vol.Optional(
+            CONF_DATABASE_LAZY_ATTRIBUTES, default=CONF_DATABASE_LAZY_ATTRIBUTES_DEFAULT
+        ): cv_boolean,
+        vol.Optional(
+            CONF_DATABASE_LAZY_ATTRIBUTES_MAX_CLUSTERS,
+            default=CONF_DATABASE_LAZY_ATTRIBUTES_MAX_CLUSTERS_DEFAULT,
+        ): vol.All(int, vol.Range(min=1)),
         vol.Optional(CONF_NWK, default={}): SCHEMA_NETWORK,
         vol.Optional(CONF_OTA, default={}): SCHEMA_OTA,
         vol.Optional(
@@ -354,6 +407,15 @@ ZIGPY_SCHEMA = vol.Schema(
         vol.Optional(
             CONF_TOPO_SKIP_COORDINATOR, default=CONF_TOPO_SKIP_COORDINATOR_DEFAULT
         ): cv_boolean,
+        vol.Optional(
+            CONF_TOPO_SCAN_CONCURRENCY, default=CONF_TOPO_SCAN_CONCURRENCY_DEFAULT
+        ): vol.All(int, vol.Range(min=1)),
+        vol.Optional(
+            CONF_TOPO_SCAN_INCREMENTAL, default=CONF_TOPO_SCAN_INCREMENTAL_DEFAULT
+        ): cv_boolean,
+        vol.Optional(
+            CONF_TOPO_SCAN_MAX_BACKOFF, default=CONF_TOPO_SCAN_MAX_BACKOFF_DEFAULT
+        ): vol.All(int, vol.Range(min=1)),
         vol.Optional(
             CONF_NWK_BACKUP_ENABLED, default=CONF_NWK_BACKUP_ENABLED_DEFAULT
         ): cv_boolean,
@@ -367,6 +429,34 @@ ZIGPY_SCHEMA = vol.Schema(
         vol.Optional(
             CONF_MAX_CONCURRENT_REQUESTS, default=CONF_MAX_CONCURRENT_REQUESTS_DEFAULT
         ): vol.All(int, vol.Range(min=0)),
+        vol.Optional(
+            CONF_MAX_CONCURRENT_END_DEVICE_REQUESTS,
+            default=CONF_MAX_CONCURRENT_END_DEVICE_REQUESTS_DEFAULT,
+        ): vol.Any(None, vol.All(int, vol.Range(min=1))),
+        vol.Optional(
+            CONF_MAX_CONCURRENT_BROADCASTS,
+            default=CONF_MAX_CONCURRENT_BROADCASTS_DEFAULT,
+        ): vol.Any(None, vol.All(int, vol.Range(min=1))),
+        vol.Optional(
+            CONF_MAX_REQUEST_QUEUE_TIME, default=CONF_MAX_REQUEST_QUEUE_TIME_DEFAULT
+        ): vol.Any(None, vol.All(vol.Coerce(float), vol.Range(min=0))),
+        vol.Optional(
+            CONF_ADAPTIVE_CONCURRENCY, default=CONF_ADAPTIVE_CONCURRENCY_DEFAULT
+        ): cv_boolean,
+        vol.Optional(
+            CONF_ADAPTIVE_CONCURRENCY_MIN, default=CONF_ADAPTIVE_CONCURRENCY_MIN_DEFAULT
+        ): vol.All(int, vol.Range(min=1)),
+        vol.Optional(
+            CONF_ADAPTIVE_CONCURRENCY_MAX, default=CONF_ADAPTIVE_CONCURRENCY_MAX_DEFAULT
+        ): vol.All(int, vol.Range(min=1)),
+        vol.Optional(
+            CONF_ADAPTIVE_DEVICE_CONCURRENCY_MAX,
+            default=CONF_ADAPTIVE_DEVICE_CONCURRENCY_MAX_DEFAULT,
+        ): vol.All(int, vol.Range(min=1)),
+        vol.Optional(
+            CONF_ATTRIBUTE_READ_BATCH_WINDOW,
+            default=CONF_ATTRIBUTE_READ_BATCH_WINDOW_DEFAULT,
+        ): vol.Any(None, vol.All(vol.Coerce(float), vol.Range(min=0))),
         vol.Optional(CONF_SOURCE_ROUTING, default=CONF_SOURCE_ROUTING_DEFAULT): (
             cv_boolean
         ),
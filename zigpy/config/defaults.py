@@ -9,10 +9,22 @@ if typing.TYPE_CHECKING:
 
 CONF_OTA_PROVIDER_TYPE = "type"
 
+CONF_DATABASE_BATCH_SIZE_DEFAULT = 1
+CONF_DATABASE_FLUSH_INTERVAL_DEFAULT = 0.0
+CONF_DATABASE_LAZY_ATTRIBUTES_DEFAULT = False
+CONF_DATABASE_LAZY_ATTRIBUTES_MAX_CLUSTERS_DEFAULT = 1000
 CONF_DEVICE_BAUDRATE_DEFAULT = 115200
 CONF_DEVICE_FLOW_CONTROL_DEFAULT = None
 CONF_STARTUP_ENERGY_SCAN_DEFAULT = True
 CONF_MAX_CONCURRENT_REQUESTS_DEFAULT = 8
+CONF_MAX_CONCURRENT_END_DEVICE_REQUESTS_DEFAULT = 4
+CONF_MAX_CONCURRENT_BROADCASTS_DEFAULT = 2
+CONF_MAX_REQUEST_QUEUE_TIME_DEFAULT = None
+CONF_ATTRIBUTE_READ_BATCH_WINDOW_DEFAULT = None
+CONF_ADAPTIVE_CONCURRENCY_DEFAULT = False
+CONF_ADAPTIVE_CONCURRENCY_MIN_DEFAULT = 1
+CONF_ADAPTIVE_CONCURRENCY_MAX_DEFAULT = 16
+CONF_ADAPTIVE_DEVICE_CONCURRENCY_MAX_DEFAULT = 2
 CONF_NWK_BACKUP_ENABLED_DEFAULT = True
 CONF_NWK_BACKUP_PERIOD_DEFAULT = 24 * 60  # 24 hours
 CONF_NWK_CHANNEL_DEFAULT = None
@@ -30,6 +42,8 @@ CONF_OTA_DISABLE_DEFAULT_PROVIDERS_DEFAULT: list[str] = []
 CONF_OTA_BROADCAST_ENABLED_DEFAULT = True
 CONF_OTA_BROADCAST_INITIAL_DELAY_DEFAULT = 3.9 * 60 * 60  # 3.9 hours
 CONF_OTA_BROADCAST_INTERVAL_DEFAULT = 3.9 * 60 * 60  # 3.9 hours
+CONF_OTA_CACHE_DIR_DEFAULT = None
+CONF_OTA_CACHE_MAX_SIZE_DEFAULT = 64 * 1024 * 1024  # 64 MiB
 CONF_OTA_PROVIDERS_DEFAULT = [
     {
         CONF_OTA_PROVIDER_TYPE: "ledvance",
@@ -49,4 +63,7 @@ CONF_SOURCE_ROUTING_DEFAULT = False
 CONF_TOPO_SCAN_PERIOD_DEFAULT = 4 * 60  # 4 hours
 CONF_TOPO_SCAN_ENABLED_DEFAULT = True
 CONF_TOPO_SKIP_COORDINATOR_DEFAULT = False
+CONF_TOPO_SCAN_CONCURRENCY_DEFAULT = 4
+CONF_TOPO_SCAN_INCREMENTAL_DEFAULT = False
+CONF_TOPO_SCAN_MAX_BACKOFF_DEFAULT = 8  # scan periods
 CONF_WATCHDOG_ENABLED_DEFAULT = True
@@ -3,11 +3,22 @@
 from __future__ import annotations
 
 import asyncio
+import collections
 import contextlib
 import functools
 import heapq
+import itertools
+import math
+import time
 import types
 import typing
+import weakref
+
+from zigpy.const import APS_REPLY_TIMEOUT_EXTENDED
+from zigpy.exceptions import ControllerException
+
+if typing.TYPE_CHECKING:
+    import zigpy.state
 
 
 class WrappedContextManager:
@@ -219,29 +230,96 @@ class ReschedulableTimeout:
             self._timer = None
 
 
+class DebouncerPool:
+    """Memory cap shared by several debouncers.
+
+    Once the debouncers track `max_size` objects in total, the object closest to
+    expiring in any of them is evicted first.
+    """
+
+    def __init__(self, max_size: int) -> None:
+        self.max_size = max_size
+        self.size = 0
+
+        self._debouncers: weakref.WeakSet[Debouncer] = weakref.WeakSet()
+
+    def _register(self, debouncer: Debouncer) -> None:
+        self._debouncers.add(debouncer)
+
+        # Objects tracked by debouncers that are garbage collected no longer count
+        weakref.finalize(debouncer, self._release, debouncer._times)
+
+    def _release(self, times: dict[typing.Any, float]) -> None:
+        self.size -= len(times)
+
+    def _make_room(self, now: float) -> None:
+        for debouncer in self._debouncers:
+            debouncer.clean(now)
+
+        while self.size >= self.max_size:
+            debouncer = min(
+                (debouncer for debouncer in self._debouncers if debouncer._queue),
+                key=lambda debouncer: debouncer._queue[0][0],
+            )
+            debouncer._evict()
+
+    def __repr__(self) -> str:
+        """String representation of the pool."""
+        return f"<{self.__class__.__name__} [tracked:{self.size}/{self.max_size}]>"
+
+
 class Debouncer:
     """Generic debouncer supporting per-invocation expiration."""
 
-    def __init__(self):
+    def __init__(
+        self,
+        max_size: int | None = None,
+        *,
+        pool: DebouncerPool | None = None,
+        get_counters: typing.Callable[[], zigpy.state.CounterGroup] | None = None,
+    ):
         self._times: dict[typing.Any, float] = {}
         self._queue: list[tuple[float, int, typing.Any]] = []
 
         self._last_time: int = 0
         self._dedup_counter: int = 0
 
+        # When full, the objects closest to expiring are evicted first
+        self.max_size: int | None = max_size
+
+        self._pool = pool
+        self._get_counters = get_counters
+
+        if pool is not None:
+            pool._register(self)
+
     @functools.cached_property
     def _loop(self) -> asyncio.BaseEventLoop:
         return asyncio.get_running_loop()
 
+    def _pop(self) -> None:
+        _, _, obj = heapq.heappop(self._queue)
+        self._times.pop(obj)
+
+        if self._pool is not None:
+            self._pool.size -= 1
+
+    def _evict(self) -> None:
+        self._pop()
+        self._increment("evictions")
+
+    def _increment(self, name: str) -> None:
+        if self._get_counters is not None:
+            self._get_counters()[name].increment()
+
     def clean(self, now: float | None = None) -> None:
         """Clean up stale timers."""
         if now is None:
             now = self._loop.time()
 
-        # We store the negative expiration time to ensure we can pop expiring objects
-        while self._queue and -self._queue[-1][0] < now:
-            _, _, obj = self._queue.pop()
-            self._times.pop(obj)
+        # The queue is a min-heap, the earliest expiration is always first
+        while self._queue and self._queue[0][0] < now:
+            self._pop()
 
     def is_filtered(self, obj: typing.Any, now: float | None = None) -> bool:
         """Check if an object will be filtered."""
@@ -268,14 +346,87 @@ class Debouncer:
 
         # If the object is filtered, do nothing
         if self.is_filtered(obj, now=now):
+            self._increment("hits")
             return True
 
+        if self.max_size is not None:
+            while self._queue and len(self._queue) >= self.max_size:
+                self._evict()
+
+        if self._pool is not None and self._pool.size >= self._pool.max_size:
+            self._pool._make_room(now)
+
         # Otherwise, queue it
         self._times[obj] = now + expire_in
-        heapq.heappush(self._queue, (-(now + expire_in), self._dedup_counter, obj))
+        heapq.heappush(self._queue, (now + expire_in, self._dedup_counter, obj))
+
+        if self._pool is not None:
+            self._pool.size += 1
 
         return False
 
     def __repr__(self) -> str:
         """String representation of the debouncer."""
         return f"<{self.__class__.__name__} [tracked:{len(self._queue)}]>"
+
+
+class SequenceAllocator:
+    """Allocates 8-bit transaction sequence numbers (TSNs).
+
+    The least recently allocated TSN is allocated first, so late responses to an old
+    request are unlikely to be matched with a new one. TSNs of pending requests are
+    skipped.
+    """
+
+    def __init__(
+        self,
+        in_use: typing.Container[int] = (),
+        reuse_after: float = APS_REPLY_TIMEOUT_EXTENDED,
+        get_counters: typing.Callable[[], zigpy.state.CounterGroup] | None = None,
+    ) -> None:
+        self._in_use = in_use
+        self._reuse_after = reuse_after
+        self._get_counters = get_counters
+
+        # Allocation time of every TSN, least recently allocated first
+        self._allocated_at: collections.OrderedDict[int, float] = (
+            collections.OrderedDict.fromkeys(
+                itertools.chain(range(1, 256), (0,)), -math.inf
+            )
+        )
+
+        self.sequence: int = 0
+
+    def allocate(self, now: float | None = None) -> int:
+        """Allocate a new TSN."""
+        if now is None:
+            now = time.monotonic()
+
+        for _ in range(len(self._allocated_at)):
+            sequence, allocated_at = self._allocated_at.popitem(last=False)
+
+            if sequence not in self._in_use:
+                break
+
+            # Pending TSNs are skipped until all others have been allocated
+            self._allocated_at[sequence] = allocated_at
+            self._increment("collisions")
+        else:
+            self._increment("exhausted")
+            raise ControllerException("All TSNs are in use by pending requests")
+
+        if now - allocated_at < self._reuse_after:
+            self._increment("early_reuses")
+
+        self._allocated_at[sequence] = now
+        self.sequence = sequence
+
+        return sequence
+
+    def _increment(self, name: str) -> None:
+        if self._get_counters is not None:
+            self._get_counters()[name].increment()
+
+    def __repr__(self) -> str:
+        """String representation of the allocator."""
+        return f"<{self.__class__.__name__} [sequence:{self.sequence}]>"
@@ -4,6 +4,8 @@ import asyncio
 import contextlib
 from datetime import datetime, timezone
 import enum
+import functools
+import hashlib
 import itertools
 import logging
 import sys
@@ -20,6 +22,7 @@ else:
     from asyncio import timeout as asyncio_timeout  # pragma: no cover
 
 from zigpy import zdo
+import zigpy.config as conf
 from zigpy.const import (
     APS_REPLY_TIMEOUT,
     APS_REPLY_TIMEOUT_EXTENDED,
@@ -36,6 +39,7 @@ import zigpy.datastructures
 import zigpy.endpoint
 import zigpy.exceptions
 import zigpy.listeners
+import zigpy.scheduler
 import zigpy.types as t
 from zigpy.typing import AddressingMode
 import zigpy.util
@@ -43,13 +47,18 @@ from zigpy.zcl import foundation
 import zigpy.zdo.types as zdo_t
 
 if typing.TYPE_CHECKING:
+    from zigpy.appdb import LazyAttributeCache
     from zigpy.application import ControllerApplication
     from zigpy.ota.providers import OtaImageWithMetadata
+    from zigpy.scheduler import ConcurrencyController
 
 
 LOGGER = logging.getLogger(__name__)
 
 PACKET_DEBOUNCE_WINDOW = 10
+PACKET_DEBOUNCE_MAX_TRACKED = 64
+PACKET_DEBOUNCE_MAX_TRACKED_TOTAL = 4096
+PACKET_DEBOUNCE_DIGEST_SIZE = 16
 MAX_DEVICE_CONCURRENCY = 1
 
 AFTER_OTA_ATTR_READ_DELAY = 10
@@ -77,7 +86,7 @@ class Device(zigpy.util.LocalLogMixin, zigpy.util.ListenableMixin):
     def __init__(self, application: ControllerApplication, ieee: t.EUI64, nwk: t.NWK):
         self._application: ControllerApplication = application
         self._ieee: t.EUI64 = ieee
-        self.nwk: t.NWK = t.NWK(nwk)
+        self._nwk: t.NWK = t.NWK(nwk)
         self.zdo: zdo.ZDO = zdo.ZDO(self)
         self.endpoints: dict[int, zdo.ZDO | zigpy.endpoint.Endpoint] = {0: self.zdo}
         self.lqi: int | None = None
@@ -93,16 +102,30 @@ class Device(zigpy.util.LocalLogMixin, zigpy.util.ListenableMixin):
         self._pending: zigpy.util.Requests[t.uint8_t] = zigpy.util.Requests()
         self._relays: t.Relays | None = None
         self._skip_configuration: bool = False
-        self._send_sequence: int = 0
+        self._sequence_allocator = zigpy.datastructures.SequenceAllocator(
+            in_use=self._pending,
+            get_counters=lambda: (
+                self._application.state.counters["device_sequence_allocator"]
+            ),
+        )
 
-        self._packet_debouncer = zigpy.datastructures.Debouncer()
         self._concurrent_requests_semaphore = (
             zigpy.datastructures.PriorityDynamicBoundedSemaphore(MAX_DEVICE_CONCURRENCY)
         )
+        self._concurrency_controller: ConcurrencyController | None = None
 
         # Retained for backwards compatibility, will be removed in a future release
         self.status = Status.NEW
 
+    @functools.cached_property
+    def _packet_debouncer(self) -> zigpy.datastructures.Debouncer:
+        # Created on the first packet, memory is shared by every device
+        return zigpy.datastructures.Debouncer(
+            max_size=PACKET_DEBOUNCE_MAX_TRACKED,
+            pool=self._application._packet_debouncer_pool,
+            get_counters=lambda: self._application.state.counters["packet_debouncer"],
+        )
+
     @contextlib.asynccontextmanager
     async def _limit_concurrency(self, *, priority: int = 0):
         """Async context manager to limit device request concurrency."""
@@ -127,8 +150,7 @@ class Device(zigpy.util.LocalLogMixin, zigpy.util.ListenableMixin):
             yield
 
     def get_sequence(self) -> t.uint8_t:
-        self._send_sequence = (self._send_sequence + 1) % 256
-        return self._send_sequence
+        return self._sequence_allocator.allocate()
 
     @property
     def name(self) -> str:
@@ -204,6 +226,12 @@ class Device(zigpy.util.LocalLogMixin, zigpy.util.ListenableMixin):
         # Already-initialized devices don't need to be re-initialized
         if self.is_initialized:
             self.debug("Skipping initialization, device is fully initialized")
+
+            if self._attribute_cache_loaders():
+                self.cancel_initialization()
+                self._initialize_task = asyncio.create_task(self._signal_initialized())
+                return self._initialize_task
+
             self._application.device_initialized(self)
             return None
 
@@ -314,6 +342,22 @@ class Device(zigpy.util.LocalLogMixin, zigpy.util.ListenableMixin):
         self.status = Status.ENDPOINTS_INIT
 
         self.info("Discovered basic device information for %s", self)
+        await self._signal_initialized()
+
+    def _attribute_cache_loaders(self) -> set[LazyAttributeCache]:
+        """Loaders of attribute caches that have not been read from the database."""
+        return {
+            cluster._attr_cache_loader
+            for ep in self.non_zdo_endpoints
+            for cluster in (*ep.in_clusters.values(), *ep.out_clusters.values())
+            if cluster._attr_cache_loader is not None
+            and "_attr_cache" not in cluster.__dict__
+        }
+
+    async def _signal_initialized(self) -> None:
+        # Attribute caches are loaded before the device is used
+        for loader in self._attribute_cache_loaders():
+            await loader.preload_device(self)
 
         # Signal to the application that the device is ready
         self._application.device_initialized(self)
@@ -344,6 +388,7 @@ class Device(zigpy.util.LocalLogMixin, zigpy.util.ListenableMixin):
         use_ieee=False,
         ask_for_ack: bool | None = None,
         priority: int = t.PacketPriority.NORMAL,
+        deadline: float | None = None,
     ):
         extended_timeout = False
 
@@ -366,19 +411,40 @@ class Device(zigpy.util.LocalLogMixin, zigpy.util.ListenableMixin):
             extended_timeout=extended_timeout,
             ask_for_ack=ask_for_ack,
             priority=priority,
+            deadline=deadline,
         )
 
         async with self._limit_concurrency(priority=priority):
-            if not expect_reply:
-                await send_request()
-                return None
+            loop = asyncio.get_running_loop()
+            start_time = loop.time()
 
-            # Only create a pending request if we are expecting a reply
-            with self._pending.new(sequence) as req:
-                await send_request()
+            try:
+                with zigpy.scheduler.track_request() as timing:
+                    if not expect_reply:
+                        await send_request()
+                        result = None
+                    else:
+                        # Only create a pending request if we are expecting a reply
+                        with self._pending.new(sequence) as req:
+                            await send_request()
+
+                            async with asyncio_timeout(timeout):
+                                result = await req.result
+            except zigpy.exceptions.SendError:
+                # Requests dropped before being sent say nothing about the network
+                raise
+            except (zigpy.exceptions.DeliveryError, asyncio.TimeoutError):
+                self._application._handle_request_result(self, rtt=None)
+                raise
+
+            # Waiting for a slot of the global concurrency limit is not part of the
+            # round-trip time, the limit itself depends on it
+            if timing.sent_at is not None:
+                start_time = timing.sent_at
+
+            self._application._handle_request_result(self, rtt=loop.time() - start_time)
 
-                async with asyncio_timeout(timeout):
-                    return await req.result
+            return result
 
     def handle_message(
         self,
@@ -434,9 +500,26 @@ class Device(zigpy.util.LocalLogMixin, zigpy.util.ListenableMixin):
         if packet.rssi is not None:
             self.rssi = packet.rssi
 
+        data = packet.data.serialize()
+
         if self._packet_debouncer.filter(
-            # Be conservative with deduplication
-            obj=packet.replace(timestamp=None, tsn=None, lqi=None, rssi=None),
+            # Be conservative with deduplication, only volatile radio details and the
+            # TSN are excluded. The payload is stored as a digest to bound memory.
+            obj=(
+                packet.src,
+                packet.src_ep,
+                packet.dst,
+                packet.dst_ep,
+                (None if packet.source_route is None else tuple(packet.source_route)),
+                packet.extended_timeout,
+                packet.profile_id,
+                packet.cluster_id,
+                hashlib.blake2b(data, digest_size=PACKET_DEBOUNCE_DIGEST_SIZE).digest(),
+                packet.tx_options,
+                packet.radius,
+                packet.non_member_radius,
+                packet.priority,
+            ),
             expire_in=PACKET_DEBOUNCE_WINDOW,
         ):
             self.debug("Filtering duplicate packet")
@@ -468,12 +551,10 @@ class Device(zigpy.util.LocalLogMixin, zigpy.util.ListenableMixin):
             return
 
         # Parse the ZCL/ZDO header first. This should never fail.
-        data = packet.data.serialize()
-
         if packet.dst_ep == zdo.ZDO_ENDPOINT:
             hdr, _ = zdo_t.ZDOHeader.deserialize(packet.cluster_id, data)
         else:
-            hdr, _ = foundation.ZCLHeader.deserialize(data)
+            hdr, offset = t.deserialize_from(foundation.ZCLHeader, data)
 
         try:
             if (
@@ -482,6 +563,16 @@ class Device(zigpy.util.LocalLogMixin, zigpy.util.ListenableMixin):
             ):
                 # XXX: support for custom deserialization will be removed
                 hdr, args = self.deserialize(packet.src_ep, packet.cluster_id, data)
+            elif (
+                packet.dst_ep != zdo.ZDO_ENDPOINT
+                and getattr(endpoint.deserialize, "__func__", None)
+                is zigpy.endpoint.Endpoint.deserialize
+            ):
+                # Only the ZCL payload is left to parse, the header is reused
+                # FIXME: ZCL deserialization mutates the header!
+                hdr, args = endpoint._deserialize_payload(
+                    packet.cluster_id, hdr, data, offset
+                )
             else:
                 # Next, parse the ZCL/ZDO payload
                 # FIXME: ZCL deserialization mutates the header!
@@ -523,8 +614,10 @@ class Device(zigpy.util.LocalLogMixin, zigpy.util.ListenableMixin):
 
         # Pass the request off to a listener, if one is registered
         for listener in itertools.chain(
-            self._application._req_listeners[zigpy.listeners.ANY_DEVICE],
-            self._application._req_listeners[self],
+            self._application._req_listeners[zigpy.listeners.ANY_DEVICE].candidates(
+                args
+            ),
+            self._application._req_listeners[self].candidates(args),
         ):
             # Resolve only until the first future listener
             if listener.resolve(hdr, args) and isinstance(
@@ -628,6 +721,21 @@ class Device(zigpy.util.LocalLogMixin, zigpy.util.ListenableMixin):
     def ieee(self) -> t.EUI64:
         return self._ieee
 
+    @property
+    def nwk(self) -> t.NWK:
+        return self._nwk
+
+    @nwk.setter
+    def nwk(self, value: t.NWK | int) -> None:
+        old_nwk = self._nwk
+        self._nwk = t.NWK(value)
+
+        # Keep the application's NWK address index up to date
+        devices = getattr(self._application, "devices", None)
+
+        if isinstance(devices, DeviceDict):
+            devices.nwk_changed(self, old_nwk)
+
     @property
     def manufacturer(self) -> str | None:
         return self._manufacturer
@@ -667,6 +775,13 @@ class Device(zigpy.util.LocalLogMixin, zigpy.util.ListenableMixin):
         else:
             self._skip_configuration = False
 
+    @property
+    def read_batch_window(self) -> float | None:
+        """Time window to collect attribute reads of one cluster in before sending them
+        as a single request. `None` if attribute reads are not batched.
+        """
+        return self._application.config[conf.CONF_ATTRIBUTE_READ_BATCH_WINDOW]
+
     @property
     def relays(self) -> t.Relays | None:
         """Relay list."""
@@ -726,6 +841,124 @@ class Device(zigpy.util.LocalLogMixin, zigpy.util.ListenableMixin):
         )
 
 
+class DeviceDict(dict):
+    """Devices keyed by IEEE address, with a secondary index on their NWK address.
+
+    Unlike its IEEE address, a device's NWK address can change at runtime. Devices
+    notify the dictionary they belong to when their NWK address changes, allowing
+    lookups by NWK address to be done in constant time.
+    """
+
+    def __init__(self, *args: typing.Any, **kwargs: typing.Any) -> None:
+        super().__init__()
+
+        # Multiple devices can briefly share a NWK address (e.g. address conflicts), so
+        # every NWK address maps to all of the devices currently using it
+        self._nwk_index: dict[t.NWK, dict[t.EUI64, Device]] = {}
+        self.update(*args, **kwargs)
+
+    def _index(self, ieee: t.EUI64, device: Device) -> None:
+        self._nwk_index.setdefault(device.nwk, {})[ieee] = device
+
+    def _unindex(self, ieee: t.EUI64, nwk: t.NWK) -> None:
+        devices = self._nwk_index.get(nwk)
+
+        if devices is None:
+            return
+
+        devices.pop(ieee, None)
+
+        if not devices:
+            del self._nwk_index[nwk]
+
+    def __setitem__(self, ieee: t.EUI64, device: Device) -> None:
+        if ieee in self:
+            self._unindex(ieee, self[ieee].nwk)
+
+        super().__setitem__(ieee, device)
+        self._index(ieee, device)
+
+    def __delitem__(self, ieee: t.EUI64) -> None:
+        device = self[ieee]
+        super().__delitem__(ieee)
+        self._unindex(ieee, device.nwk)
+
+    def pop(self, ieee: t.EUI64, *args: typing.Any) -> Device:
+        if ieee not in self:
+            return super().pop(ieee, *args)
+
+        device = super().pop(ieee)
+        self._unindex(ieee, device.nwk)
+
+        return device
+
+    def popitem(self) -> tuple[t.EUI64, Device]:
+        ieee, device = super().popitem()
+        self._unindex(ieee, device.nwk)
+
+        return ieee, device
+
+    def clear(self) -> None:
+        super().clear()
+        self._nwk_index.clear()
+
+    def setdefault(self, ieee: t.EUI64, default: Device) -> Device:
+        if ieee not in self:
+            self[ieee] = default
+
+        return self[ieee]
+
+    def update(self, *args: typing.Any, **kwargs: typing.Any) -> None:
+        for ieee, device in dict(*args, **kwargs).items():
+            self[ieee] = device
+
+    def nwk_changed(self, device: Device, old_nwk: t.NWK) -> None:
+        """Re-index a device whose NWK address has changed."""
+        if self.get(device.ieee) is not device:
+            return
+
+        self._unindex(device.ieee, old_nwk)
+        self._index(device.ieee, device)
+
+    def get_by_nwk(self, nwk: t.NWK | int) -> Device:
+        """Get a device by its NWK address. Raises `KeyError` if none is found."""
+        devices = self._nwk_index.get(nwk)
+
+        if not devices:
+            raise KeyError(nwk)
+
+        return next(iter(devices.values()))
+
+    def check_nwk_index(self) -> list[str]:
+        """Compare the NWK address index against the devices, returning a list of any
+        inconsistencies found.
+        """
+        problems = []
+
+        for ieee, device in self.items():
+            if self._nwk_index.get(device.nwk, {}).get(ieee) is not device:
+                problems.append(f"Device {ieee} is not indexed under {device.nwk!r}")
+
+        for nwk, devices in self._nwk_index.items():
+            for ieee, device in devices.items():
+                if self.get(ieee) is not device:
+                    problems.append(f"Stale index entry {nwk!r} for device {ieee}")
+                elif device.nwk != nwk:
+                    problems.append(
+                        f"Device {ieee} is indexed under {nwk!r} but has NWK"
+                        f" {device.nwk!r}"
+                    )
+
+        return problems
+
+    def rebuild_nwk_index(self) -> None:
+        """Rebuild the NWK address index from scratch."""
+        self._nwk_index.clear()
+
+        for ieee, device in self.items():
+            self._index(ieee, device)
+
+
 async def broadcast(
     app,
     profile,
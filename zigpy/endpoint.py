@@ -227,6 +227,24 @@ class Endpoint(zigpy.util.LocalLogMixin, zigpy.util.ListenableMixin):
         cluster = self.in_clusters.get(cluster_id, self.out_clusters.get(cluster_id))
         return cluster.deserialize(data)
 
+    def _deserialize_payload(
+        self, cluster_id: t.ClusterId, hdr: ZCLHeader, data: bytes, offset: int
+    ) -> tuple[ZCLHeader, CommandSchema]:
+        """Deserialize the payload of a ZCL frame whose header is already parsed."""
+        cluster = self.in_clusters.get(cluster_id, self.out_clusters.get(cluster_id))
+
+        if cluster is None:
+            raise KeyError(f"No cluster ID 0x{cluster_id:04x} on {self.unique_id}")
+
+        if (
+            getattr(cluster.deserialize, "__func__", None)
+            is not zigpy.zcl.Cluster.deserialize
+        ):
+            # Clusters with custom deserialization have to parse the entire frame
+            return cluster.deserialize(data)
+
+        return cluster._deserialize_payload(hdr, data, offset)
+
     def handle_message(
         self,
         profile: int,
@@ -258,6 +276,7 @@ class Endpoint(zigpy.util.LocalLogMixin, zigpy.util.ListenableMixin):
         use_ieee: bool = False,
         ask_for_ack: bool | None = None,
         priority: int = t.PacketPriority.NORMAL,
+        deadline: float | None = None,
     ):
         if self.profile_id == zigpy.profiles.zll.PROFILE_ID and not (
             cluster == zigpy.zcl.clusters.lightlink.LightLink.cluster_id
@@ -279,6 +298,7 @@ class Endpoint(zigpy.util.LocalLogMixin, zigpy.util.ListenableMixin):
             use_ieee=use_ieee,
             ask_for_ack=ask_for_ack,
             priority=priority,
+            deadline=deadline,
         )
 
     async def reply(
@@ -1,8 +1,11 @@
 from __future__ import annotations
 
 import asyncio
+from collections.abc import Iterable, Iterator
 import dataclasses
+import functools
 import inspect
+import itertools
 import logging
 import typing
 
@@ -128,6 +131,124 @@ class CallbackListener(BaseRequestListener):
         return False
 
 
+@functools.cache
+def _schema_index_keys(
+    schema: type[foundation.CommandSchema],
+) -> tuple[type[foundation.CommandSchema], ...]:
+    """Command schema classes that a schema instance is indexed under.
+
+    `Struct.matches` accepts subclasses in either direction, so both matchers and
+    commands use their entire schema class hierarchy.
+    """
+
+    return tuple(
+        cls
+        for cls in schema.__mro__
+        if issubclass(cls, foundation.CommandSchema)
+        and cls is not foundation.CommandSchema
+    )
+
+
+class ListenerIndex:
+    """Request listeners registered for a single source, indexed by the command
+    schemas they match. Listeners with callable matchers are always candidates.
+    """
+
+    def __init__(self) -> None:
+        self._seq = itertools.count()
+        self._seqs: dict[int, list[int]] = {}
+        self._listeners: dict[int, BaseRequestListener] = {}
+        self._unindexed: dict[int, BaseRequestListener] = {}
+        self._by_schema: dict[
+            type[foundation.CommandSchema], dict[int, BaseRequestListener]
+        ] = {}
+
+    def _keys(self, listener: BaseRequestListener) -> set[type] | None:
+        keys = set()
+
+        for matcher in listener.matchers:
+            if not isinstance(matcher, foundation.CommandSchema):
+                return None
+
+            keys.update(_schema_index_keys(type(matcher)))
+
+        return keys
+
+    def append(self, listener: BaseRequestListener) -> None:
+        """Register a listener."""
+        seq = next(self._seq)
+        self._seqs.setdefault(id(listener), []).append(seq)
+        self._listeners[seq] = listener
+
+        keys = self._keys(listener)
+
+        if keys is None:
+            self._unindexed[seq] = listener
+            return
+
+        for key in keys:
+            self._by_schema.setdefault(key, {})[seq] = listener
+
+    def remove(self, listener: BaseRequestListener) -> None:
+        """Unregister a listener. Like `list.remove`, a listener registered more than
+        once is only unregistered once, starting with its first registration.
+        """
+        seqs = self._seqs[id(listener)]
+        seq = seqs.pop(0)
+
+        if not seqs:
+            del self._seqs[id(listener)]
+
+        del self._listeners[seq]
+
+        keys = self._keys(listener)
+
+        if keys is None:
+            del self._unindexed[seq]
+            return
+
+        for key in keys:
+            bucket = self._by_schema[key]
+            del bucket[seq]
+
+            if not bucket:
+                del self._by_schema[key]
+
+    def candidates(
+        self, command: foundation.CommandSchema | typing.Any
+    ) -> Iterable[BaseRequestListener]:
+        """Listeners that may match a command, in registration order."""
+
+        # Schema matchers can only match commands with a related schema
+        if not self._by_schema or not isinstance(command, foundation.CommandSchema):
+            return list(self._unindexed.values())
+
+        buckets = [
+            self._by_schema[key]
+            for key in _schema_index_keys(type(command))
+            if key in self._by_schema
+        ]
+
+        if not self._unindexed and len(buckets) <= 1:
+            return list(buckets[0].values()) if buckets else []
+
+        merged = dict(self._unindexed)
+
+        for bucket in buckets:
+            merged.update(bucket)
+
+        return [merged[seq] for seq in sorted(merged)]
+
+    def __iter__(self) -> Iterator[BaseRequestListener]:
+        return iter(list(self._listeners.values()))
+
+    def __len__(self) -> int:
+        return len(self._listeners)
+
+    def __repr__(self) -> str:
+        return f"<{type(self).__name__} [listeners:{len(self)}]>"
+
+
 MatcherFuncType = typing.Callable[
     [
         typing.Union[foundation.ZCLHeader, zdo_t.ZDOHeader],
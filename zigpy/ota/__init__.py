@@ -7,12 +7,15 @@ from collections import defaultdict
 import contextlib
 import dataclasses
 import logging
+import pathlib
 import sys
 import typing
 
 from zigpy.config import (
     CONF_OTA_ADVANCED_DIR,
     CONF_OTA_ALLOW_ADVANCED_DIR,
+    CONF_OTA_CACHE_DIR,
+    CONF_OTA_CACHE_MAX_SIZE,
     CONF_OTA_DISABLE_DEFAULT_PROVIDERS,
     CONF_OTA_ENABLED,
     CONF_OTA_EXTRA_PROVIDERS,
@@ -29,8 +32,10 @@ from zigpy.config import (
     CONF_OTA_Z2M_LOCAL_INDEX,
     CONF_OTA_Z2M_REMOTE_INDEX,
 )
-from zigpy.ota.image import BaseOTAImage
+from zigpy.config.defaults import CONF_OTA_CACHE_MAX_SIZE_DEFAULT
+from zigpy.ota.image import BaseOTAImage, OTAImageHeader, parse_ota_image
 import zigpy.ota.providers
+from zigpy.ota.store import OtaImageStore
 import zigpy.types as t
 import zigpy.util
 from zigpy.zcl import foundation
@@ -62,20 +67,31 @@ class OtaImagesResult(t.BaseDataclassMixin):
 class OtaImageWithMetadata(t.BaseDataclassMixin):
     metadata: zigpy.ota.providers.BaseOtaImageMetadata
     firmware: BaseOTAImage | None
+    # Firmware header of an image whose contents are not kept in memory
+    header: OTAImageHeader | None = dataclasses.field(
+        default=None, compare=False, repr=False
+    )
 
     @property
     def version(self) -> int:
         return self.metadata.file_version
 
+    @property
+    def _header(self) -> OTAImageHeader | None:
+        if self.firmware is not None:
+            return self.firmware.header
+
+        return self.header
+
     @property
     def _min_hardware_version(self) -> int | None:
         if self.metadata.min_hardware_version is not None:
             return self.metadata.min_hardware_version
         elif (
-            self.firmware is not None
-            and self.firmware.header.minimum_hardware_version is not None
+            self._header is not None
+            and self._header.minimum_hardware_version is not None
         ):
-            return self.firmware.header.minimum_hardware_version
+            return self._header.minimum_hardware_version
         else:
             return None
 
@@ -84,10 +100,10 @@ class OtaImageWithMetadata(t.BaseDataclassMixin):
         if self.metadata.max_hardware_version is not None:
             return self.metadata.max_hardware_version
         elif (
-            self.firmware is not None
-            and self.firmware.header.maximum_hardware_version is not None
+            self._header is not None
+            and self._header.maximum_hardware_version is not None
         ):
-            return self.firmware.header.maximum_hardware_version
+            return self._header.maximum_hardware_version
         else:
             return None
 
@@ -95,8 +111,8 @@ class OtaImageWithMetadata(t.BaseDataclassMixin):
     def _manufacturer_id(self) -> int | None:
         if self.metadata.manufacturer_id is not None:
             return self.metadata.manufacturer_id
-        elif self.firmware is not None:
-            return self.firmware.header.manufacturer_id
+        elif self._header is not None:
+            return self._header.manufacturer_id
         else:
             return None
 
@@ -104,8 +120,8 @@ class OtaImageWithMetadata(t.BaseDataclassMixin):
     def _image_type(self) -> int | None:
         if self.metadata.image_type is not None:
             return self.metadata.image_type
-        elif self.firmware is not None:
-            return self.firmware.header.image_type
+        elif self._header is not None:
+            return self._header.image_type
         else:
             return None
 
@@ -229,6 +245,17 @@ class OTA:
             zigpy.ota.providers.BaseOtaImageMetadata, OtaImageWithMetadata
         ] = {}
 
+        # Downloaded images are persisted to disk instead of being kept in memory
+        self._image_store: OtaImageStore | None = None
+
+        if config.get(CONF_OTA_CACHE_DIR) is not None:
+            self._image_store = OtaImageStore(
+                path=pathlib.Path(config[CONF_OTA_CACHE_DIR]),
+                max_size=config.get(
+                    CONF_OTA_CACHE_MAX_SIZE, CONF_OTA_CACHE_MAX_SIZE_DEFAULT
+                ),
+            )
+
         self._broadcast_loop_task = None
 
         if config[CONF_OTA_ENABLED]:
@@ -380,10 +407,24 @@ class OTA:
     async def _fetch_image(
         self, image: OtaImageWithMetadata
     ) -> list[OtaImageWithMetadata]:
-        """Load the index of a provider."""
+        """Download an image, or load it from the image store."""
+        # Local files can change on disk and gain nothing from being stored
+        if self._image_store is None or isinstance(
+            image.metadata, zigpy.ota.providers.LocalOtaImageMetadata
+        ):
+            async with asyncio_timeout(OTA_FETCH_TIMEOUT):
+                return await image.fetch()
 
-        async with asyncio_timeout(OTA_FETCH_TIMEOUT):
-            return await image.fetch()
+        data = await self._image_store.get(image.metadata)
+
+        if data is None:
+            async with asyncio_timeout(OTA_FETCH_TIMEOUT):
+                data = await image.metadata.fetch_data()
+
+            await self._image_store.put(image.metadata, data)
+
+        firmware, _ = parse_ota_image(data)
+        return image.replace(firmware=firmware)
 
     async def get_ota_images(
         self,
@@ -464,10 +505,17 @@ class OTA:
             # image with downloaded firmware.
             img = result
 
-            # Cache the image if it isn't already cached
+            # Cache the image if it isn't already cached. With an image store, only the
+            # header is kept and the contents are loaded from disk when needed.
             if self._image_cache[img.metadata].firmware is None:
                 _LOGGER.debug("Caching image %s", img)
-                self._image_cache[img.metadata] = img
+
+                if self._image_store is None:
+                    self._image_cache[img.metadata] = img
+                else:
+                    self._image_cache[img.metadata] = img.replace(
+                        firmware=None, header=img.firmware.header
+                    )
 
             upgrades[img.metadata] = img
 
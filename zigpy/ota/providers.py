@@ -82,11 +82,14 @@ class BaseOtaImageMetadata(t.BaseDataclassMixin):
                     f" got {hasher.hexdigest()}"
                 )
 
-    async def fetch(self) -> BaseOTAImage:
+    async def fetch_data(self) -> bytes:
         data = await self._fetch()
         await self._validate(data)
 
-        image, _ = parse_ota_image(data)
+        return data
+
+    async def fetch(self) -> BaseOTAImage:
+        image, _ = parse_ota_image(await self.fetch_data())
         return image
 
 
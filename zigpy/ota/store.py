@@ -0,0 +1,159 @@
+"""Persistent on-disk store of downloaded OTA images."""
+
+from __future__ import annotations
+
+import asyncio
+import contextlib
+import hashlib
+import json
+import logging
+import mmap
+import os
+import pathlib
+
+from zigpy.ota.providers import BaseOtaImageMetadata
+
+_LOGGER = logging.getLogger(__name__)
+
+INDEX_FILE = "index.json"
+IMAGE_SUFFIX = ".ota"
+
+
+class OtaImageStore:
+    """Content-addressed cache of OTA image files.
+
+    Every unique file is stored once, named after the SHA-256 of its contents. An index
+    maps image metadata to file contents. The least recently used files are evicted once
+    the store grows past its maximum size.
+    """
+
+    def __init__(self, path: pathlib.Path, max_size: int) -> None:
+        self.path = path
+        self.max_size = max_size
+
+        self._index: dict[str, str] | None = None
+        self._lock = asyncio.Lock()
+
+    @staticmethod
+    def _key(meta: BaseOtaImageMetadata) -> str:
+        # Images without a checksum are told apart by where they are downloaded from
+        return json.dumps(
+            [
+                meta.source,
+                meta.manufacturer_id,
+                meta.image_type,
+                meta.file_version,
+                meta.checksum,
+                meta.file_size,
+                getattr(meta, "url", None),
+            ]
+        )
+
+    def _image_path(self, digest: str) -> pathlib.Path:
+        return self.path / f"{digest}{IMAGE_SUFFIX}"
+
+    def _load_index(self) -> dict[str, str]:
+        if self._index is None:
+            try:
+                self._index = json.loads((self.path / INDEX_FILE).read_text())
+            except (OSError, ValueError):
+                self._index = {}
+
+        return self._index
+
+    def _save_index(self) -> None:
+        tmp_path = self.path / f"{INDEX_FILE}.tmp"
+        tmp_path.write_text(json.dumps(self._index))
+        os.replace(tmp_path, self.path / INDEX_FILE)
+
+    def _remove(self, digest: str) -> None:
+        """Remove a file and every reference to it."""
+        with contextlib.suppress(FileNotFoundError):
+            self._image_path(digest).unlink()
+
+        index = self._load_index()
+
+        for key in [key for key, value in index.items() if value == digest]:
+            del index[key]
+
+    def _read(self, key: str) -> bytes | None:
+        digest = self._load_index().get(key)
+
+        if digest is None:
+            return None
+
+        path = self._image_path(digest)
+        contents = None
+
+        try:
+            # The file is only copied into memory once it has been verified
+            with path.open("rb") as f:
+                with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as data:
+                    if hashlib.sha256(data).hexdigest() == digest:
+                        contents = data[:]
+                    else:
+                        _LOGGER.warning(
+                            "Cached OTA image checksum is invalid: %s", path
+                        )
+        except (OSError, ValueError) as exc:
+            _LOGGER.warning("Removing invalid cached OTA image: %s", exc)
+
+        if contents is None:
+            self._remove(digest)
+            self._save_index()
+            return None
+
+        # Keep track of recently used files for eviction
+        os.utime(path)
+
+        return contents
+
+    def _write(self, key: str, data: bytes) -> None:
+        digest = hashlib.sha256(data).hexdigest()
+        path = self._image_path(digest)
+
+        self.path.mkdir(parents=True, exist_ok=True)
+
+        if path.exists():
+            os.utime(path)
+        else:
+            tmp_path = path.with_suffix(".tmp")
+            tmp_path.write_bytes(data)
+            os.replace(tmp_path, path)
+
+        self._load_index()[key] = digest
+        self._evict()
+        self._save_index()
+
+    def _evict(self) -> None:
+        files = sorted(
+            (stat.st_mtime, stat.st_size, path.stem)
+            for path in self.path.glob(f"*{IMAGE_SUFFIX}")
+            for stat in [path.stat()]
+        )
+        size = sum(file_size for _, file_size, _ in files)
+
+        for _, file_size, digest in files:
+            if size <= self.max_size:
+                break
+
+            _LOGGER.debug("Evicting cached OTA image %s", digest)
+            self._remove(digest)
+            size -= file_size
+
+    async def get(self, meta: BaseOtaImageMetadata) -> bytes | None:
+        """Read the verified contents of a cached image file, if it exists."""
+        async with self._lock:
+            return await asyncio.get_running_loop().run_in_executor(
+                None, self._read, self._key(meta)
+            )
+
+    async def put(self, meta: BaseOtaImageMetadata, data: bytes) -> None:
+        """Cache the contents of an image file."""
+        async with self._lock:
+            try:
+                await asyncio.get_running_loop().run_in_executor(
+                    None, self._write, self._key(meta), data
+                )
+            except OSError as exc:
+                _LOGGER.warning("Failed to cache OTA image %s: %s", meta, exc)
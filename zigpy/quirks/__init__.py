@@ -503,6 +503,37 @@ def signature_matches(
     return _filter
 
 
+def signature_fingerprint(signature: dict[str, typing.Any]) -> frozenset | None:
+    """Return a hashable summary of the parts of a signature that must match a device
+    exactly: endpoint IDs and their input and output clusters. Signatures without
+    endpoints never match and have no fingerprint.
+    """
+
+    endpoints = signature.get(SIG_ENDPOINTS)
+
+    if endpoints is None:
+        return None
+
+    return frozenset(
+        (
+            eid,
+            frozenset(ep.get(SIG_EP_INPUT, [])),
+            frozenset(ep.get(SIG_EP_OUTPUT, [])),
+        )
+        for eid, ep in endpoints.items()
+    )
+
+
+def device_fingerprint(device: zigpy.device.Device) -> frozenset:
+    """Return the signature fingerprint of a device, see `signature_fingerprint`."""
+
+    return frozenset(
+        (eid, frozenset(ep.in_clusters), frozenset(ep.out_clusters))
+        for eid, ep in device.endpoints.items()
+        if eid != 0
+    )
+
+
 def handle_message_from_uninitialized_sender(
     sender: zigpy.device.Device,
     profile: int,
@@ -38,7 +38,31 @@ class DeviceRegistry:
             collections.defaultdict(set)
         )
 
+        # v1 quirks of each (manufacturer, model) list, grouped by signature
+        # fingerprint. Built lazily and cleared whenever the registry changes. A hash
+        # of each indexed signature is kept to detect in-place changes.
+        self._fingerprint_index: dict[
+            tuple[str | None, str | None],
+            tuple[
+                list[tuple[CustomDeviceType, int]],
+                dict[frozenset, list[tuple[CustomDeviceType, zigpy.quirks.FilterType]]],
+            ],
+        ] = {}
+
+        # Matching v1 quirk (or `None`) for each device signature seen so far. v2
+        # quirks can filter on anything and are always evaluated.
+        self._resolution_cache: dict[tuple, CustomDeviceType | None] = {}
+        self.resolution_cache_hits: int = 0
+        self.resolution_cache_misses: int = 0
+
+    def _invalidate(self) -> None:
+        """Drop everything derived from the v1 registry contents."""
+        self._fingerprint_index.clear()
+        self._resolution_cache.clear()
+
     def purge_custom_quirks(self, custom_quirks_root: pathlib.Path) -> None:
+        self._invalidate()
+
         # If zhaquirks aren't being used, we can't tell if a quirk is custom or not
         for model_registry in self._registry.values():
             for quirks in model_registry.values():
@@ -70,6 +94,8 @@ class DeviceRegistry:
 
     def add_to_registry(self, custom_device: CustomDeviceType) -> None:
         """Add a device to the registry"""
+        self._invalidate()
+
         models_info = custom_device.signature.get(SIG_MODELS_INFO)
         if models_info:
             for manuf, model in models_info:
@@ -95,6 +121,8 @@ class DeviceRegistry:
             self._registry_v2[key].remove(custom_device.quirk_metadata)
             return
 
+        self._invalidate()
+
         models_info = custom_device.signature.get(SIG_MODELS_INFO)
         if models_info:
             for manuf, model in models_info:
@@ -135,25 +163,124 @@ class DeviceRegistry:
             device.model,
             device.ieee,
         )
-        for candidate in itertools.chain(
-            self.registry[device.manufacturer][device.model],
-            self.registry[device.manufacturer][None],
-            self.registry[None][device.model],
-            self.registry[None][None],
+
+        # v1 quirks only look at the device signature, identical devices always
+        # resolve to the same quirk
+        cache_key = (
+            device.manufacturer,
+            device.model,
+            frozenset(
+                (
+                    eid,
+                    ep.profile_id,
+                    ep.device_type,
+                    frozenset(ep.in_clusters),
+                    frozenset(ep.out_clusters),
+                )
+                for eid, ep in device.endpoints.items()
+                if eid != 0
+            ),
+        )
+
+        # Quirk signatures should not be modified in place after registration, such
+        # changes are only noticed when resolving a new device signature
+        try:
+            quirk = self._resolution_cache[cache_key]
+        except KeyError:
+            self.resolution_cache_misses += 1
+
+            for manufacturer, model in (
+                (device.manufacturer, device.model),
+                (device.manufacturer, None),
+                (None, device.model),
+                (None, None),
+            ):
+                self._check_signatures(manufacturer, model)
+
+            quirk = self._resolve(device)
+            self._resolution_cache[cache_key] = quirk
+        else:
+            self.resolution_cache_hits += 1
+
+        if quirk is None:
+            return device
+
+        _LOGGER.debug("Found custom device replacement for %s: %s", device.ieee, quirk)
+        return quirk(device._application, device.ieee, device.nwk, device)
+
+    def _resolve(self, device: DeviceType) -> CustomDeviceType | None:
+        """Find the first v1 quirk matching a device."""
+        fingerprint = zigpy.quirks.device_fingerprint(device)
+
+        for candidate, matcher in itertools.chain(
+            self._candidates(device.manufacturer, device.model, fingerprint),
+            self._candidates(device.manufacturer, None, fingerprint),
+            self._candidates(None, device.model, fingerprint),
+            self._candidates(None, None, fingerprint),
         ):
-            matcher = zigpy.quirks.signature_matches(candidate.signature)
             _LOGGER.debug("Considering %s", candidate)
 
-            if not matcher(device):
-                continue
+            if matcher(device):
+                return candidate
+
+        return None
+
+    def _candidates(
+        self, manufacturer: str | None, model: str | None, fingerprint: frozenset
+    ) -> list[tuple[CustomDeviceType, zigpy.quirks.FilterType]]:
+        """v1 quirks registered for a manufacturer and model that may match a device
+        with the given fingerprint, in registry order, along with their matchers.
+        """
+        try:
+            _, index = self._fingerprint_index[(manufacturer, model)]
+        except KeyError:
+            index = {}
+            candidates = self.registry[manufacturer][model]
+
+            for candidate in candidates:
+                candidate_fingerprint = zigpy.quirks.signature_fingerprint(
+                    candidate.signature
+                )
 
-            _LOGGER.debug(
-                "Found custom device replacement for %s: %s", device.ieee, candidate
+                if candidate_fingerprint is None:
+                    continue
+
+                index.setdefault(candidate_fingerprint, []).append(
+                    (candidate, zigpy.quirks.signature_matches(candidate.signature))
+                )
+
+            self._fingerprint_index[(manufacturer, model)] = (
+                [
+                    (candidate, hash(repr(candidate.signature)))
+                    for candidate in candidates
+                ],
+                index,
             )
-            device = candidate(device._application, device.ieee, device.nwk, device)
-            break
 
-        return device
+        return index.get(fingerprint, [])
+
+    def _check_signatures(self, manufacturer: str | None, model: str | None) -> None:
+        """Drop the index of a (manufacturer, model) list and all resolved quirks if
+        the list or any of its quirk signatures changed since it was indexed.
+        """
+        try:
+            snapshots, _ = self._fingerprint_index[(manufacturer, model)]
+        except KeyError:
+            return
+
+        candidates = self.registry.get(manufacturer, {}).get(model, [])
+
+        if len(candidates) == len(snapshots) and all(
+            candidate is indexed and hash(repr(candidate.signature)) == signature_hash
+            for candidate, (indexed, signature_hash) in zip(candidates, snapshots)
+        ):
+            return
+
+        _LOGGER.debug(
+            "Quirk signatures changed, re-indexing %s %s", manufacturer, model
+        )
+        del self._fingerprint_index[(manufacturer, model)]
+        self._resolution_cache.clear()
 
     @property
     def registry(self) -> TYPE_MANUF_QUIRKS_DICT:
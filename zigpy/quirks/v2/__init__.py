@@ -10,6 +10,7 @@ import logging
 import pathlib
 import typing
 from typing import TYPE_CHECKING, Any
+import weakref
 
 import attrs
 from frozendict import deepfreeze, frozendict
@@ -23,7 +24,13 @@ from zigpy.const import (
     SIG_NODE_DESC,
     SIG_SKIP_CONFIG,
 )
-from zigpy.quirks import _DEVICE_REGISTRY, BaseCustomDevice, CustomCluster, FilterType
+from zigpy.quirks import (
+    _DEVICE_REGISTRY,
+    BaseCustomDevice,
+    CustomCluster,
+    CustomEndpoint,
+    FilterType,
+)
 from zigpy.quirks.registry import DeviceRegistry
 from zigpy.quirks.v2.homeassistant import EntityPlatform, EntityType
 from zigpy.quirks.v2.homeassistant.binary_sensor import BinarySensorDeviceClass
@@ -65,17 +72,68 @@ class CustomDeviceV2(BaseCustomDevice):
         quirk_metadata: QuirksV2RegistryEntry,
     ) -> None:
         self.quirk_metadata: QuirksV2RegistryEntry = quirk_metadata
-        # this is done to simplify extending from CustomDevice
-        self._replacement_from_replaces(replaces)
-        super().__init__(application, ieee, nwk, replaces)
-        # we no longer need this after calling super().__init__
-        self.replacement = {}
         self._exposes_metadata: dict[
             # (endpoint_id, cluster_id, cluster_type)
             tuple[int, int, ClusterType],
             list[EntityMetadata],
         ] = collections.defaultdict(list)
 
+        layout = _device_layout(replaces)
+        templates = _DEVICE_TEMPLATES.setdefault(
+            quirk_metadata, collections.OrderedDict()
+        )
+
+        try:
+            template = templates[layout]
+        except KeyError:
+            carried_over = self._apply_metadata(application, ieee, nwk, replaces)
+            templates[layout] = _DeviceTemplate.from_device(self, carried_over)
+
+            if len(templates) > MAX_DEVICE_TEMPLATES_PER_QUIRK:
+                templates.popitem(last=False)
+        else:
+            templates.move_to_end(layout)
+
+            if template is None:
+                self._apply_metadata(application, ieee, nwk, replaces)
+            else:
+                # Endpoints are created from the template, not by `BaseCustomDevice`
+                self.replacement = {}
+                self._replacement_from_metadata()
+                super().__init__(application, ieee, nwk, replaces)
+                self.replacement = {}
+                self._apply_template(template, replaces)
+
+        if quirk_metadata.device_automation_triggers_metadata:
+            self.device_automation_triggers = (
+                quirk_metadata.device_automation_triggers_metadata
+            )
+
+    def _apply_metadata(
+        self,
+        application: ControllerApplication,
+        ieee: t.EUI64,
+        nwk: t.NWK,
+        replaces: Device,
+    ) -> set[int]:
+        """Build the device by replaying every piece of quirk metadata. Returns the
+        IDs of the cluster objects carried over from the original device.
+        """
+        quirk_metadata = self.quirk_metadata
+
+        # this is done to simplify extending from CustomDevice
+        self._replacement_from_replaces(replaces)
+        super().__init__(application, ieee, nwk, replaces)
+        # we no longer need this after calling super().__init__
+        self.replacement = {}
+
+        carried_over = {
+            id(cluster)
+            for endpoint in self.endpoints.values()
+            if not isinstance(endpoint, ZDO)
+            for cluster in endpoint.clusters
+        }
+
         for add_meta in quirk_metadata.adds_metadata:
             add_meta(self)
 
@@ -93,10 +151,68 @@ class CustomDeviceV2(BaseCustomDevice):
         for entity_meta in quirk_metadata.entity_metadata:
             entity_meta(self)
 
-        if quirk_metadata.device_automation_triggers_metadata:
-            self.device_automation_triggers = (
-                quirk_metadata.device_automation_triggers_metadata
+        return carried_over
+
+    def _apply_template(self, template: _DeviceTemplate, replaces: Device) -> None:
+        """Build the device the same way an earlier `_apply_metadata` call did."""
+        for ep_template in template.endpoints:
+            original = replaces.endpoints[ep_template.endpoint_id]
+            endpoint = CustomEndpoint(
+                self,
+                ep_template.endpoint_id,
+                {
+                    SIG_EP_PROFILE: original.profile_id,
+                    SIG_EP_TYPE: original.device_type,
+                },
+                replaces,
             )
+            self.endpoints[ep_template.endpoint_id] = endpoint
+
+            for add_cluster, cluster_templates, original_clusters in (
+                (
+                    endpoint.add_input_cluster,
+                    ep_template.input_clusters,
+                    original.in_clusters,
+                ),
+                (
+                    endpoint.add_output_cluster,
+                    ep_template.output_clusters,
+                    original.out_clusters,
+                ),
+            ):
+                for cluster_template in cluster_templates:
+                    cluster = cluster_template.cluster(
+                        endpoint, is_server=cluster_template.is_server
+                    )
+
+                    # Clusters without a definition are created with an instance ID
+                    if cluster.cluster_id != cluster_template.cluster_id:
+                        cluster.cluster_id = cluster_template.cluster_id
+
+                    add_cluster(cluster_template.cluster_id, cluster)
+
+                    if (
+                        cluster_template.copy_attr_cache
+                        and self._copy_cluster_attr_cache
+                    ):
+                        cluster._attr_cache = original_clusters[
+                            cluster_template.cluster_id
+                        ]._attr_cache.copy()
+
+                    if cluster_template.constant_attributes is not None:
+                        cluster._CONSTANT_ATTRIBUTES = dict(
+                            cluster_template.constant_attributes
+                        )
+
+            endpoint._cluster_attr = {
+                name: (endpoint.in_clusters if is_server else endpoint.out_clusters)[
+                    cluster_id
+                ]
+                for name, cluster_id, is_server in ep_template.cluster_attributes
+            }
+
+        for key, entities in template.exposes_metadata.items():
+            self._exposes_metadata[key].extend(entities)
 
     def _replacement_from_replaces(self, replaces: Device) -> None:
         """Set replacement data from replaces device."""
@@ -116,6 +232,10 @@ class CustomDeviceV2(BaseCustomDevice):
                 if not isinstance(endpoint, ZDO)
             }
         }
+        self._replacement_from_metadata()
+
+    def _replacement_from_metadata(self) -> None:
+        """Set the device-level replacement data of the quirk."""
         self.replacement[SIG_SKIP_CONFIG] = (
             self.quirk_metadata.skip_device_configuration
         )
@@ -172,6 +292,20 @@ class AddsMetadata:
             }
 
 
+def _remove_cluster(
+    endpoint: Endpoint, clusters: dict[int, Cluster], cluster_id: int
+) -> None:
+    """Remove a cluster from an endpoint, along with its endpoint attribute."""
+    cluster = clusters.pop(cluster_id, None)
+
+    if (
+        cluster is not None
+        and cluster.ep_attribute is not None
+        and endpoint._cluster_attr.get(cluster.ep_attribute) is cluster
+    ):
+        del endpoint._cluster_attr[cluster.ep_attribute]
+
+
 @attrs.define(frozen=True, kw_only=True, repr=True)
 class RemovesMetadata:
     """Removes metadata for removing a cluster from a device."""
@@ -184,9 +318,9 @@ class RemovesMetadata:
         """Process the remove."""
         endpoint = device.endpoints[self.endpoint_id]
         if self.cluster_type == ClusterType.Server:
-            endpoint.in_clusters.pop(self.cluster_id, None)
+            _remove_cluster(endpoint, endpoint.in_clusters, self.cluster_id)
         else:
-            endpoint.out_clusters.pop(self.cluster_id, None)
+            _remove_cluster(endpoint, endpoint.out_clusters, self.cluster_id)
 
 
 @attrs.define(frozen=True, kw_only=True, repr=True)
@@ -218,7 +352,7 @@ class ReplaceClusterOccurrencesMetadata:
                 ClusterType.Server in self.cluster_types
                 and self.cluster.cluster_id in endpoint.in_clusters
             ):
-                endpoint.in_clusters.pop(self.cluster.cluster_id)
+                _remove_cluster(endpoint, endpoint.in_clusters, self.cluster.cluster_id)
                 endpoint.add_input_cluster(
                     self.cluster.cluster_id, self.cluster(endpoint)
                 )
@@ -226,7 +360,9 @@ class ReplaceClusterOccurrencesMetadata:
                 ClusterType.Client in self.cluster_types
                 and self.cluster.cluster_id in endpoint.out_clusters
             ):
-                endpoint.out_clusters.pop(self.cluster.cluster_id)
+                _remove_cluster(
+                    endpoint, endpoint.out_clusters, self.cluster.cluster_id
+                )
                 endpoint.add_output_cluster(
                     self.cluster.cluster_id, self.cluster(endpoint, is_server=False)
                 )
@@ -353,6 +489,150 @@ class FriendlyNameMetadata:
 
 
 @attrs.define(frozen=True, kw_only=True, repr=True)
+class _ClusterTemplate:
+    """A cluster of a quirked device, see `_DeviceTemplate`."""
+
+    cluster_id: int = attrs.field()
+    cluster: type[Cluster | CustomCluster] = attrs.field()
+    is_server: bool = attrs.field()
+    # Clusters carried over from the original device keep their attribute cache
+    copy_attr_cache: bool = attrs.field()
+    constant_attributes: frozendict[str, typing.Any] | None = attrs.field()
+
+    @classmethod
+    def from_cluster(cls, cluster: Cluster, carried_over: set[int]) -> _ClusterTemplate:
+        """Record a cluster of a device built by `CustomDeviceV2._apply_metadata`."""
+        constant_attributes = vars(cluster).get("_CONSTANT_ATTRIBUTES")
+
+        return cls(
+            cluster_id=cluster.cluster_id,
+            cluster=type(cluster),
+            is_server=cluster.is_server,
+            copy_attr_cache=id(cluster) in carried_over,
+            constant_attributes=(
+                None if constant_attributes is None else frozendict(constant_attributes)
+            ),
+        )
+
+
+@attrs.define(frozen=True, kw_only=True, repr=True)
+class _EndpointTemplate:
+    """An endpoint of a quirked device, see `_DeviceTemplate`."""
+
+    endpoint_id: int = attrs.field()
+    input_clusters: tuple[_ClusterTemplate, ...] = attrs.field()
+    output_clusters: tuple[_ClusterTemplate, ...] = attrs.field()
+    # (ep_attribute, cluster_id, is_server)
+    cluster_attributes: tuple[tuple[str, int, bool], ...] = attrs.field()
+
+
+@attrs.define(frozen=True, kw_only=True, repr=True)
+class _DeviceTemplate:
+    """Endpoints, clusters and entities that applying a quirk's metadata produced for
+    an original endpoint/cluster layout, to build further devices without replaying it.
+    """
+
+    endpoints: tuple[_EndpointTemplate, ...] = attrs.field()
+    exposes_metadata: frozendict[
+        tuple[int, int, ClusterType], tuple[EntityMetadata, ...]
+    ] = attrs.field()
+
+    @classmethod
+    def from_device(
+        cls, device: CustomDeviceV2, carried_over: set[int]
+    ) -> _DeviceTemplate | None:
+        """Record a device built by `CustomDeviceV2._apply_metadata`. Returns `None`
+        if the device cannot be reproduced from a template.
+        """
+        entry = device.quirk_metadata
+
+        # Custom metadata types can do anything, they are always replayed
+        if not (
+            type(device)._apply_metadata is CustomDeviceV2._apply_metadata
+            and all(type(meta) is AddsMetadata for meta in entry.adds_metadata)
+            and all(type(meta) is RemovesMetadata for meta in entry.removes_metadata)
+            and all(
+                type(meta) is ReplacesMetadata
+                and type(meta.remove) is RemovesMetadata
+                and type(meta.add) is AddsMetadata
+                for meta in entry.replaces_metadata
+            )
+            and all(
+                type(meta) is ReplaceClusterOccurrencesMetadata
+                for meta in entry.replaces_cluster_occurrences_metadata
+            )
+            and all(
+                type(meta).__call__ is EntityMetadata.__call__
+                for meta in entry.entity_metadata
+            )
+        ):
+            return None
+
+        endpoints = []
+
+        for endpoint_id, endpoint in device.endpoints.items():
+            if isinstance(endpoint, ZDO):
+                continue
+
+            if type(endpoint) is not CustomEndpoint:
+                return None
+
+            cluster_attributes = []
+
+            for name, cluster in endpoint._cluster_attr.items():
+                if endpoint.in_clusters.get(cluster.cluster_id) is cluster:
+                    cluster_attributes.append((name, cluster.cluster_id, True))
+                elif endpoint.out_clusters.get(cluster.cluster_id) is cluster:
+                    cluster_attributes.append((name, cluster.cluster_id, False))
+                else:
+                    return None
+
+            endpoints.append(
+                _EndpointTemplate(
+                    endpoint_id=endpoint_id,
+                    input_clusters=tuple(
+                        _ClusterTemplate.from_cluster(cluster, carried_over)
+                        for cluster in endpoint.in_clusters.values()
+                    ),
+                    output_clusters=tuple(
+                        _ClusterTemplate.from_cluster(cluster, carried_over)
+                        for cluster in endpoint.out_clusters.values()
+                    ),
+                    cluster_attributes=tuple(cluster_attributes),
+                )
+            )
+
+        return cls(
+            endpoints=tuple(endpoints),
+            exposes_metadata=frozendict(
+                {
+                    key: tuple(entities)
+                    for key, entities in device.exposes_metadata.items()
+                }
+            ),
+        )
+
+
+_DeviceLayout = tuple[tuple[int, tuple[int, ...], tuple[int, ...]], ...]
+
+# Templates of each quirk, for its most recently seen device layouts
+MAX_DEVICE_TEMPLATES_PER_QUIRK = 16
+_DEVICE_TEMPLATES: weakref.WeakKeyDictionary[
+    QuirksV2RegistryEntry,
+    collections.OrderedDict[_DeviceLayout, _DeviceTemplate | None],
+] = weakref.WeakKeyDictionary()
+
+
+def _device_layout(device: Device) -> _DeviceLayout:
+    """Endpoint and cluster IDs of a device, which determine how a quirk applies."""
+    return tuple(
+        (endpoint_id, tuple(endpoint.in_clusters), tuple(endpoint.out_clusters))
+        for endpoint_id, endpoint in device.endpoints.items()
+        if not isinstance(endpoint, ZDO)
+    )
+
+
+@attrs.define(frozen=True, kw_only=True, repr=True, cache_hash=True)
 class QuirksV2RegistryEntry:
     """Quirks V2 registry entry."""
 
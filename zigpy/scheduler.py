@@ -0,0 +1,390 @@
+"""Scheduling of outgoing requests by class of destination."""
+
+from __future__ import annotations
+
+import asyncio
+import bisect
+import collections
+from collections.abc import AsyncIterator, Iterator
+import contextlib
+import contextvars
+import dataclasses
+import enum
+import logging
+import sys
+import typing
+
+if sys.version_info[:2] < (3, 11):
+    from async_timeout import timeout as asyncio_timeout  # pragma: no cover
+else:
+    from asyncio import timeout as asyncio_timeout  # pragma: no cover
+
+from zigpy.datastructures import PriorityDynamicBoundedSemaphore
+import zigpy.exceptions
+import zigpy.state
+import zigpy.types as t
+
+if typing.TYPE_CHECKING:
+    import zigpy.device
+
+LOGGER = logging.getLogger(__name__)
+
+# Upper bounds of the buckets of the queue wait histograms
+WAIT_HISTOGRAM_BUCKETS_S = (0.01, 0.1, 1.0, 10.0)
+
+# Concurrency is reduced when the smoothed round-trip time to a destination exceeds its
+# baseline by this factor, plus some jitter. The baseline slowly drifts upwards so that
+# it follows lasting route changes.
+RTT_SMOOTHING = 0.125
+RTT_CONGESTION_FACTOR = 2.0
+RTT_JITTER_S = 0.05
+RTT_BASELINE_DRIFT = 0.01
+
+# Failures of requests sent before a reduction already took effect are not penalized
+CONCURRENCY_DECREASE_COOLDOWN_S = 1.0
+
+# Single failures are expected on a lossy mesh. Concurrency is only reduced once this
+# share of the most recent requests has failed, across enough distinct destinations.
+FAILURE_RATE_THRESHOLD = 0.25
+FAILURE_WINDOW = 20
+DEVICE_FAILURE_WINDOW = 4
+MIN_FAILING_DEVICES = 2
+
+
+class DestinationClass(enum.Enum):
+    """Class of destination of an outgoing request."""
+
+    ROUTER = "router"
+    END_DEVICE = "end_device"
+    UNKNOWN = "unknown"
+    BROADCAST = "broadcast"
+
+    @classmethod
+    def for_device(cls, device: zigpy.device.Device) -> DestinationClass:
+        # Devices are unknown until their node descriptor is read during the initial
+        # interview, they must not take up the budget of sleepy end devices
+        if device.node_desc is None:
+            return cls.UNKNOWN
+
+        if device.node_desc.is_end_device:
+            return cls.END_DEVICE
+
+        return cls.ROUTER
+
+
+@dataclasses.dataclass
+class RequestTiming:
+    """Timing of the request being sent by the current task."""
+
+    dest_class: DestinationClass | None = None
+    deadline: float | None = None
+
+    # Event loop time at which the request got a slot of the global concurrency limit
+    sent_at: float | None = None
+
+
+# Radio libraries acquire the global concurrency limit from within `send_packet`, the
+# timing of the request being sent is passed along with the task instead
+_request_timing: contextvars.ContextVar[RequestTiming | None] = contextvars.ContextVar(
+    "request_timing", default=None
+)
+
+
+@contextlib.contextmanager
+def track_request() -> Iterator[RequestTiming]:
+    """Track the timing of the request sent by the current task. Nested calls share the
+    timing of the outermost one.
+    """
+    timing = _request_timing.get()
+
+    if timing is not None:
+        yield timing
+        return
+
+    timing = RequestTiming()
+    token = _request_timing.set(timing)
+
+    try:
+        yield timing
+    finally:
+        _request_timing.reset(token)
+
+
+def _bucket_name(wait: float) -> str:
+    index = bisect.bisect_left(WAIT_HISTOGRAM_BUCKETS_S, wait)
+
+    if index == len(WAIT_HISTOGRAM_BUCKETS_S):
+        return f"wait_gt_{WAIT_HISTOGRAM_BUCKETS_S[-1]}s"
+
+    return f"wait_le_{WAIT_HISTOGRAM_BUCKETS_S[index]}s"
+
+
+class RequestScheduler:
+    """Limit the number of concurrent requests to every class of destination.
+
+    Requests to sleepy end devices and broadcasts take much longer to complete than
+    requests to routers. Budgeting them separately keeps them from taking up every slot
+    of the global concurrency limit. Requests still queued past their deadline, for
+    their budget or for the global concurrency limit, are dropped instead of being sent
+    late.
+    """
+
+    def __init__(
+        self,
+        budgets: dict[DestinationClass, int | None],
+        *,
+        max_queue_time: float | None,
+        counters: zigpy.state.CounterGroup,
+    ) -> None:
+        self.max_queue_time = max_queue_time
+
+        self._semaphores: dict[DestinationClass, PriorityDynamicBoundedSemaphore] = {
+            dest_class: PriorityDynamicBoundedSemaphore(budget)
+            for dest_class, budget in budgets.items()
+            if budget is not None
+        }
+        self._in_flight: collections.Counter[DestinationClass] = collections.Counter()
+        self._counters = counters
+
+    def in_flight(self, dest_class: DestinationClass) -> int:
+        """Number of requests currently being sent to a class of destination."""
+        return self._in_flight[dest_class]
+
+    def num_waiting(self, dest_class: DestinationClass) -> int:
+        """Number of requests queued for a class of destination."""
+        semaphore = self._semaphores.get(dest_class)
+
+        return 0 if semaphore is None else semaphore.num_waiting
+
+    def wait_histogram(self, dest_class: DestinationClass) -> dict[str, int]:
+        """Histogram of how long requests to a class of destination were queued."""
+        group = self._counters.get(dest_class.value)
+
+        if group is None:
+            return {}
+
+        return {
+            counter.name: counter.value
+            for counter in group.counters()
+            if counter.name.startswith("wait_")
+        }
+
+    def _dropped(
+        self, dest_class: DestinationClass, start_time: float
+    ) -> zigpy.exceptions.SendError:
+        LOGGER.debug(
+            "Dropping %s request, deadline expired after %0.2fs in queue",
+            dest_class.value,
+            asyncio.get_running_loop().time() - start_time,
+        )
+        self._counters.increment("dropped", dest_class.value)
+
+        return zigpy.exceptions.SendError(
+            f"Deadline of {dest_class.value} request expired while queued"
+        )
+
+    @contextlib.asynccontextmanager
+    async def schedule(
+        self,
+        dest_class: DestinationClass,
+        *,
+        priority: int = t.PacketPriority.NORMAL,
+        deadline: float | None = None,
+    ) -> AsyncIterator[None]:
+        """Wait for a free slot in the budget of a class of destination.
+
+        `deadline` is in event loop time. `zigpy.exceptions.SendError` is raised if it
+        expires before the request can be sent.
+        """
+        loop = asyncio.get_running_loop()
+        start_time = loop.time()
+
+        if deadline is None and self.max_queue_time is not None:
+            deadline = start_time + self.max_queue_time
+
+        semaphore = self._semaphores.get(dest_class)
+
+        if deadline is not None and deadline <= start_time:
+            raise self._dropped(dest_class, start_time)
+
+        if semaphore is not None:
+            try:
+                async with asyncio_timeout(
+                    None if deadline is None else deadline - start_time
+                ):
+                    await semaphore.acquire(priority)
+            except asyncio.TimeoutError:
+                raise self._dropped(dest_class, start_time) from None
+
+        self._counters.increment(
+            _bucket_name(loop.time() - start_time), dest_class.value
+        )
+        self._in_flight[dest_class] += 1
+
+        try:
+            with track_request() as timing:
+                timing.dest_class = dest_class
+                timing.deadline = deadline
+
+                yield
+        finally:
+            self._in_flight[dest_class] -= 1
+
+            if semaphore is not None:
+                semaphore.release()
+
+    @contextlib.asynccontextmanager
+    async def global_slot(
+        self,
+        semaphore: PriorityDynamicBoundedSemaphore,
+        *,
+        priority: int = t.PacketPriority.NORMAL,
+    ) -> AsyncIterator[None]:
+        """Wait for a slot of the global concurrency limit, within the deadline of the
+        request being scheduled by the current task.
+        """
+        loop = asyncio.get_running_loop()
+        start_time = loop.time()
+        timing = _request_timing.get()
+
+        if timing is None or timing.deadline is None:
+            await semaphore.acquire(priority)
+        else:
+            try:
+                async with asyncio_timeout(timing.deadline - start_time):
+                    await semaphore.acquire(priority)
+            except asyncio.TimeoutError:
+                assert timing.dest_class is not None
+                raise self._dropped(timing.dest_class, start_time) from None
+
+        if timing is not None:
+            timing.sent_at = loop.time()
+
+        try:
+            yield
+        finally:
+            semaphore.release()
+
+
+class _RttEstimate:
+    """Smoothed and baseline round-trip times of a single destination."""
+
+    __slots__ = ("baseline", "smoothed")
+
+    def __init__(self, rtt: float) -> None:
+        self.smoothed = rtt
+        self.baseline = rtt
+
+    def update(self, rtt: float) -> None:
+        self.smoothed += RTT_SMOOTHING * (rtt - self.smoothed)
+        self.baseline = min(rtt, self.baseline * (1 + RTT_BASELINE_DRIFT))
+
+    @property
+    def congested(self) -> bool:
+        return self.smoothed > RTT_CONGESTION_FACTOR * self.baseline + RTT_JITTER_S
+
+
+class ConcurrencyController:
+    """Adjust the max value of a semaphore with additive increase, multiplicative
+    decrease, based on the round-trip times and failures of requests.
+
+    The limit grows by one after a full window of timely requests. It is halved when
+    too many of the recent requests failed or when round-trip times to a destination
+    rise well above its own baseline. Destinations are identified by `source`, which
+    can be omitted when the controller only sees requests to a single one.
+    """
+
+    def __init__(
+        self,
+        semaphore: PriorityDynamicBoundedSemaphore,
+        *,
+        min_value: int,
+        max_value: int,
+        counters: zigpy.state.CounterGroup,
+        failure_window: int = FAILURE_WINDOW,
+        min_failing_sources: int = 1,
+    ) -> None:
+        self.semaphore = semaphore
+        self.min_value = min_value
+        self.max_value = max_value
+        self.failure_window = failure_window
+        self.min_failing_sources = min_failing_sources
+
+        self._counters = counters
+        self._successes = 0
+        self._outcomes: collections.deque[tuple[bool, typing.Hashable]] = (
+            collections.deque(maxlen=failure_window)
+        )
+        self._rtt: dict[typing.Hashable, _RttEstimate] = {}
+        self._last_decrease: float | None = None
+
+        self._set_limit(min(max(semaphore.max_value, min_value), max_value))
+
+    @property
+    def limit(self) -> int:
+        return self.semaphore.max_value
+
+    def _set_limit(self, limit: int) -> None:
+        if limit != self.semaphore.max_value:
+            LOGGER.debug(
+                "Adjusting concurrency from %d to %d", self.semaphore.max_value, limit
+            )
+            self.semaphore.max_value = limit
+
+    def _decrease(self, reason: str) -> None:
+        now = asyncio.get_running_loop().time()
+        self._successes = 0
+        self._outcomes.clear()
+
+        if (
+            self._last_decrease is not None
+            and now - self._last_decrease < CONCURRENCY_DECREASE_COOLDOWN_S
+        ):
+            return
+
+        self._last_decrease = now
+        limit = max(self.min_value, self.limit // 2)
+
+        if limit != self.limit:
+            self._counters[f"concurrency_decreased_{reason}"].increment()
+            self._set_limit(limit)
+
+    def record_success(self, rtt: float, source: typing.Hashable = None) -> None:
+        """Record the round-trip time of a successful request."""
+        self._outcomes.append((False, source))
+        estimate = self._rtt.get(source)
+
+        if estimate is None:
+            self._rtt[source] = _RttEstimate(rtt)
+        else:
+            estimate.update(rtt)
+
+            if estimate.congested:
+                self._decrease("latency")
+                return
+
+        self._successes += 1
+
+        # Grow by one once every request of the current window has succeeded
+        if self._successes >= self.limit:
+            self._successes = 0
+
+            if self.limit < self.max_value:
+                self._counters["concurrency_increased"].increment()
+                self._set_limit(self.limit + 1)
+
+    def record_failure(self, source: typing.Hashable = None) -> None:
+        """Record a request that failed to be delivered or timed out."""
+        self._successes = 0
+        self._outcomes.append((True, source))
+        failed = [src for is_failure, src in self._outcomes if is_failure]
+
+        if (
+            len(failed) >= FAILURE_RATE_THRESHOLD * self.failure_window
+            and len(set(failed)) >= self.min_failing_sources
+        ):
+            self._decrease("failure")
+
+    def forget(self, source: typing.Hashable) -> None:
+        """Drop the round-trip times of a destination that left the network."""
+        self._rtt.pop(source, None)
@@ -4,9 +4,13 @@ from __future__ import annotations
 
 import asyncio
 import collections
+import dataclasses
+import functools
+import heapq
 import itertools
 import logging
 import random
+import time
 import typing
 
 import zigpy.config
@@ -29,12 +33,62 @@ class ScanNotSupported(Exception):
     pass
 
 
+@dataclasses.dataclass
+class TopologyScan:
+    """Summary of a topology scan."""
+
+    routers: int = 0
+    scanned: int = 0
+    failed: int = 0
+    skipped: int = 0
+    duration: float = 0.0
+
+    @property
+    def coverage(self) -> float:
+        """Fraction of routers whose neighbor or routing table was scanned."""
+        if not self.routers:
+            return 1.0
+
+        return self.scanned / self.routers
+
+
+# Worst link cost, also used for links that are only known from routing tables
+MAX_LINK_COST = 7
+
 INVALID_NEIGHBOR_IEEES = {
     t.EUI64.convert("00:00:00:00:00:00:00:00"),
     t.EUI64.convert("ff:ff:ff:ff:ff:ff:ff:ff"),
 }
 
 
+def link_cost(lqi: int) -> int:
+    """Zigbee link cost, from the probability of delivery estimated from the LQI."""
+    if lqi == 0:
+        return MAX_LINK_COST
+
+    return min(MAX_LINK_COST, max(1, round((255 / lqi) ** 4)))
+
+
+def _neighbor_link(neighbor: zdo_t.Neighbor) -> tuple:
+    """Fields identifying the link to a neighbor."""
+    return (
+        neighbor.ieee,
+        neighbor.nwk,
+        neighbor.relationship,
+        neighbor.device_type,
+    )
+
+
+def _neighbors_changed(old: list[zdo_t.Neighbor], new: list[zdo_t.Neighbor]) -> bool:
+    """Whether the links to neighbors changed, ignoring link quality fluctuations that
+    do not change the link cost.
+    """
+    old_costs = {_neighbor_link(n): link_cost(n.lqi) for n in old}
+    new_costs = {_neighbor_link(n): link_cost(n.lqi) for n in new}
+
+    return old_costs != new_costs
+
+
 class Topology(zigpy.util.ListenableMixin):
     """Topology scanner."""
 
@@ -54,6 +108,18 @@ class Topology(zigpy.util.ListenableMixin):
         )
         self.routes: dict[t.EUI64, list[zdo_t.Route]] = collections.defaultdict(list)
 
+        self.last_scan: TopologyScan | None = None
+
+        # Incremental scans back off exponentially on routers whose links are stable
+        self._unchanged_scans: collections.Counter[t.EUI64] = collections.Counter()
+        self._skipped_scans: collections.Counter[t.EUI64] = collections.Counter()
+
+        # Routers that had children join or leave since they were last scanned
+        self._changed: set[t.EUI64] = set()
+
+        # Next hop from the coordinator towards every reachable device
+        self._source_route_parents: dict[t.NWK, t.NWK] | None = None
+
     def start_periodic_scans(self, period: float) -> None:
         self.stop_periodic_scans()
         self._scan_loop_task = asyncio.create_task(self._scan_loop(period))
@@ -75,7 +141,11 @@ class Topology(zigpy.util.ListenableMixin):
             LOGGER.debug("Starting scheduled neighbor scan")
 
             try:
-                await self.scan()
+                await self.scan(
+                    incremental=self._app.config[
+                        zigpy.config.CONF_TOPO_SCAN_INCREMENTAL
+                    ]
+                )
             except asyncio.CancelledError:
                 # We explicitly catch a cancellation here to ensure the scan loop will
                 # not be interrupted if a manual scan is initiated
@@ -84,17 +154,165 @@ class Topology(zigpy.util.ListenableMixin):
                 LOGGER.debug("Topology scan failed", exc_info=True)
 
     async def scan(
-        self, devices: typing.Iterable[zigpy.device.Device] | None = None
+        self,
+        devices: typing.Iterable[zigpy.device.Device] | None = None,
+        *,
+        incremental: bool = False,
     ) -> None:
-        """Preempt Topology scan and reschedule."""
+        """Preempt Topology scan and reschedule.
+
+        Incremental scans skip routers whose links have been stable for a while and
+        only emit updates for tables that changed.
+        """
 
         if self._scan_task and not self._scan_task.done():
             LOGGER.debug("Cancelling old scanning task")
             self._scan_task.cancel()
 
-        self._scan_task = asyncio.create_task(self._scan(devices))
+        self._scan_task = asyncio.create_task(
+            self._scan(devices, incremental=incremental)
+        )
         await self._scan_task
 
+    def handle_join(self, ieee: t.EUI64, parent_nwk: t.NWK | None) -> None:
+        """Flag the new and old parents of a joining device for the next scan."""
+        self.handle_leave(ieee)
+
+        if parent_nwk is None:
+            return
+
+        try:
+            parent = self._app.get_device(nwk=parent_nwk)
+        except KeyError:
+            return
+
+        self._changed.add(parent.ieee)
+
+    def handle_leave(self, ieee: t.EUI64) -> None:
+        """Flag the routers that had a leaving device as a child for the next scan."""
+        self.invalidate_source_routes()
+
+        for router_ieee, neighbors in self.neighbors.items():
+            if any(
+                neighbor.ieee == ieee
+                and neighbor.relationship == zdo_t.Neighbor.Relationship.Child
+                for neighbor in neighbors
+            ):
+                self._changed.add(router_ieee)
+
+    def invalidate_source_routes(self) -> None:
+        """Discard source routes computed from outdated tables or addresses."""
+        self._source_route_parents = None
+
+    def build_source_route_to(self, dest: zigpy.device.Device) -> list[t.NWK] | None:
+        """Most reliable route from the coordinator to a device according to the last
+        neighbor and routing tables, as the list of relays ordered from the coordinator.
+        """
+        if self._source_route_parents is None:
+            self._source_route_parents = self._compute_source_routes()
+
+        parents = self._source_route_parents
+
+        if dest.nwk not in parents:
+            return None
+
+        route = []
+        nwk = parents[dest.nwk]
+
+        while nwk in parents:
+            route.append(nwk)
+            nwk = parents[nwk]
+
+        return route[::-1]
+
+    def _link_costs(self) -> dict[t.NWK, dict[t.NWK, int]]:
+        """Costs of the links between routers and their neighbors."""
+        costs: dict[t.NWK, dict[t.NWK, int]] = collections.defaultdict(dict)
+
+        def add_link(src: t.NWK, dst: t.NWK, cost: int) -> None:
+            # Links are symmetric, limited by the worst direction
+            cost = max(cost, costs[dst].get(src, 0))
+            costs[src][dst] = costs[dst][src] = cost
+
+        for ieee, neighbors in self.neighbors.items():
+            router = self._app.devices.get(ieee)
+
+            if router is None:
+                continue
+
+            for neighbor in neighbors:
+                device = self._app.devices.get(neighbor.ieee)
+                nwk = neighbor.nwk if device is None else device.nwk
+
+                # The LQI is measured by the router, receiving from the neighbor
+                add_link(nwk, router.nwk, link_cost(neighbor.lqi))
+
+        for ieee, routes in self.routes.items():
+            router = self._app.devices.get(ieee)
+
+            if router is None:
+                continue
+
+            for route in routes:
+                if route.RouteStatus != zdo_t.RouteStatus.Active:
+                    continue
+
+                if route.NextHop not in costs[router.nwk]:
+                    add_link(router.nwk, route.NextHop, MAX_LINK_COST)
+
+        return costs
+
+    def _relays(self) -> set[t.NWK]:
+        """Addresses of devices that are able to relay packets."""
+        relays = {
+            device.nwk
+            for device in self._app.devices.values()
+            if device.node_desc is not None
+            and (device.node_desc.is_router or device.node_desc.is_coordinator)
+        }
+
+        for neighbor in itertools.chain.from_iterable(self.neighbors.values()):
+            if neighbor.ieee not in self._app.devices and neighbor.device_type in (
+                zdo_t.Neighbor.DeviceType.Coordinator,
+                zdo_t.Neighbor.DeviceType.Router,
+            ):
+                relays.add(neighbor.nwk)
+
+        return relays
+
+    def _compute_source_routes(self) -> dict[t.NWK, t.NWK]:
+        """Find the cheapest path from the coordinator to every device, preferring
+        fewer hops between paths of equal cost.
+        """
+        costs = self._link_costs()
+        relays = self._relays()
+        coordinator = self._app.state.node_info.nwk
+
+        parents: dict[t.NWK, t.NWK] = {}
+        visited: set[t.NWK] = set()
+        queue = [(0, 0, coordinator, coordinator)]
+
+        while queue:
+            cost, hops, nwk, parent = heapq.heappop(queue)
+
+            if nwk in visited:
+                continue
+
+            visited.add(nwk)
+
+            if nwk != coordinator:
+                parents[nwk] = parent
+
+            # End devices cannot relay packets
+            if nwk != coordinator and nwk not in relays:
+                continue
+
+            for neighbor, link in costs[nwk].items():
+                if neighbor not in visited:
+                    heapq.heappush(queue, (cost + link, hops + 1, neighbor, nwk))
+
+        return parents
+
     async def _scan_table(
         self, scan_request: typing.Callable, entries_attr: str
     ) -> list[typing.Any]:
@@ -103,6 +321,9 @@ class Topology(zigpy.util.ListenableMixin):
         index = 0
         table = []
 
+        # Topology scans must not delay other requests
+        scan_request = functools.partial(scan_request, priority=t.PacketPriority.LOW)
+
         while True:
             status, rsp = await RETRY_SLOW(scan_request)(index)
 
@@ -153,8 +374,137 @@ class Topology(zigpy.util.ListenableMixin):
 
         return table
 
+    def _should_scan(self, device: zigpy.device.Device) -> bool:
+        # Ignore devices that aren't routers
+        if device.node_desc is None or not (
+            device.node_desc.is_router or device.node_desc.is_coordinator
+        ):
+            return False
+
+        # Ignore devices that do not support scanning tables
+        if (
+            device.ieee in self._neighbors_unsupported
+            and device.ieee in self._routes_unsupported
+        ):
+            return False
+
+        # Some coordinators have issues when performing loopback scans
+        if (
+            self._app.config[zigpy.config.CONF_TOPO_SKIP_COORDINATOR]
+            and device is self._app._device
+        ):
+            return False
+
+        return True
+
+    def _scan_due(self, device: zigpy.device.Device) -> bool:
+        """Whether an incremental scan should scan a router."""
+        if device.ieee in self._changed:
+            return True
+
+        backoff = min(
+            2 ** self._unchanged_scans[device.ieee],
+            self._app.config[zigpy.config.CONF_TOPO_SCAN_MAX_BACKOFF],
+        )
+
+        return self._skipped_scans[device.ieee] + 1 >= backoff
+
+    def _links(self, ieee: t.EUI64) -> tuple[frozenset, frozenset]:
+        """Links of a router, ignoring link quality that fluctuates between scans."""
+        return (
+            frozenset(_neighbor_link(n) for n in self.neighbors[ieee]),
+            frozenset((r.DstNWK, r.NextHop) for r in self.routes[ieee]),
+        )
+
+    def _branch(self, device: zigpy.device.Device) -> t.NWK:
+        """Router next to the coordinator through which a device is reached."""
+        if device.relays:
+            return device.relays[-1]
+
+        return device.nwk
+
+    async def _scan_router(
+        self, device: zigpy.device.Device, *, incremental: bool = False
+    ) -> bool:
+        """Scan the neighbor and routing tables of a router, returning whether either
+        of them could be scanned.
+        """
+        scanned = False
+        changed = device.ieee in self._changed
+        self._changed.discard(device.ieee)
+
+        old_links = self._links(device.ieee)
+        old_neighbors = self.neighbors[device.ieee]
+        old_routes = self.routes[device.ieee]
+
+        try:
+            self.neighbors[device.ieee] = await self._scan_neighbors(device)
+        except Exception as e:  # noqa: BLE001
+            LOGGER.debug("Failed to scan neighbors of %s", device, exc_info=e)
+        else:
+            scanned = True
+            LOGGER.info(
+                "Scanned neighbors of %s: %s", device, self.neighbors[device.ieee]
+            )
+
+        neighbors_changed = _neighbors_changed(
+            old_neighbors, self.neighbors[device.ieee]
+        )
+
+        # Link quality that does not change the link cost is only updated by full scans
+        if incremental and not neighbors_changed:
+            self.neighbors[device.ieee] = old_neighbors
+
+        if neighbors_changed:
+            self.invalidate_source_routes()
+
+        if not incremental or neighbors_changed:
+            self.listener_event(
+                "neighbors_updated", device.ieee, self.neighbors[device.ieee]
+            )
+
+        try:
+            # Filter out inactive routes
+            routes = await self._scan_routes(device)
+            self.routes[device.ieee] = [
+                route
+                for route in routes
+                if route.RouteStatus != zdo_t.RouteStatus.Inactive
+            ]
+        except Exception as e:  # noqa: BLE001
+            LOGGER.debug("Failed to scan routes of %s", device, exc_info=e)
+        else:
+            scanned = True
+            LOGGER.info("Scanned routes of %s: %s", device, self.routes[device.ieee])
+
+        routes_changed = self.routes[device.ieee] != old_routes
+
+        if routes_changed:
+            self.invalidate_source_routes()
+
+        if not incremental or routes_changed:
+            self.listener_event("routes_updated", device.ieee, self.routes[device.ieee])
+
+        if not scanned:
+            if changed:
+                self._changed.add(device.ieee)
+
+            return False
+
+        self._skipped_scans.pop(device.ieee, None)
+
+        if changed or self._links(device.ieee) != old_links:
+            self._unchanged_scans.pop(device.ieee, None)
+        else:
+            self._unchanged_scans[device.ieee] += 1
+
+        return True
+
     async def _scan(
-        self, devices: typing.Iterable[zigpy.device.Device] | None = None
+        self,
+        devices: typing.Iterable[zigpy.device.Device] | None = None,
+        *,
+        incremental: bool = False,
     ) -> None:
         """Scan topology."""
 
@@ -162,62 +512,84 @@ class Topology(zigpy.util.ListenableMixin):
             # We iterate over a copy of the devices as opposed to the live dictionary
             devices = list(self._app.devices.values())
 
-        for index, device in enumerate(devices):
-            LOGGER.debug(
-                "Scanning topology (%d/%d) of %s", index + 1, len(devices), device
+        start = time.monotonic()
+        pending = [device for device in devices if self._should_scan(device)]
+        skipped = 0
+
+        if incremental:
+            due = []
+
+            for device in pending:
+                if self._scan_due(device):
+                    due.append(device)
+                else:
+                    self._skipped_scans[device.ieee] += 1
+                    skipped += 1
+
+            # Scan routers with joining or leaving children first, then the ones
+            # whose links changed most recently
+            pending = sorted(
+                due,
+                key=lambda d: (
+                    d.ieee not in self._changed,
+                    self._unchanged_scans[d.ieee],
+                ),
             )
 
-            # Ignore devices that aren't routers
-            if device.node_desc is None or not (
-                device.node_desc.is_router or device.node_desc.is_coordinator
-            ):
-                continue
-
-            # Ignore devices that do not support scanning tables
-            if (
-                device.ieee in self._neighbors_unsupported
-                and device.ieee in self._routes_unsupported
-            ):
-                continue
+        summary = TopologyScan(routers=len(pending), skipped=skipped)
 
-            # Some coordinators have issues when performing loopback scans
-            if (
-                self._app.config[zigpy.config.CONF_TOPO_SKIP_COORDINATOR]
-                and device is self._app._device
-            ):
-                continue
+        # Routers reached through the same router next to the coordinator
+        active_branches: collections.Counter[t.NWK] = collections.Counter()
 
-            try:
-                self.neighbors[device.ieee] = await self._scan_neighbors(device)
-            except Exception as e:  # noqa: BLE001
-                LOGGER.debug("Failed to scan neighbors of %s", device, exc_info=e)
-            else:
-                LOGGER.info(
-                    "Scanned neighbors of %s: %s", device, self.neighbors[device.ieee]
+        async def worker() -> None:
+            while pending:
+                # Prefer routers in branches of the network not being scanned already
+                device = next(
+                    (d for d in pending if not active_branches[self._branch(d)]),
+                    pending[0],
                 )
+                pending.remove(device)
 
-            self.listener_event(
-                "neighbors_updated", device.ieee, self.neighbors[device.ieee]
-            )
+                branch = self._branch(device)
+                active_branches[branch] += 1
 
-            try:
-                # Filter out inactive routes
-                routes = await self._scan_routes(device)
-                self.routes[device.ieee] = [
-                    route
-                    for route in routes
-                    if route.RouteStatus != zdo_t.RouteStatus.Inactive
-                ]
-            except Exception as e:  # noqa: BLE001
-                LOGGER.debug("Failed to scan routes of %s", device, exc_info=e)
-            else:
-                LOGGER.info(
-                    "Scanned routes of %s: %s", device, self.routes[device.ieee]
+                LOGGER.debug(
+                    "Scanning topology (%d/%d) of %s",
+                    summary.routers - len(pending),
+                    summary.routers,
+                    device,
                 )
 
-            self.listener_event("routes_updated", device.ieee, self.routes[device.ieee])
-
-        LOGGER.debug("Finished scanning neighbors for all devices")
+                try:
+                    if await self._scan_router(device, incremental=incremental):
+                        summary.scanned += 1
+                    else:
+                        summary.failed += 1
+                finally:
+                    active_branches[branch] -= 1
+
+        # Every router is scanned one request at a time, with a delay between requests
+        concurrency = self._app.config[zigpy.config.CONF_TOPO_SCAN_CONCURRENCY]
+        await asyncio.gather(*(worker() for _ in range(min(concurrency, len(pending)))))
+
+        summary.duration = time.monotonic() - start
+        self.last_scan = summary
+
+        counters = self._app.state.counters["topology"]
+        counters["scans"].increment()
+        counters["routers_scanned"].increment(summary.scanned)
+        counters["routers_failed"].increment(summary.failed)
+        counters["routers_skipped"].increment(summary.skipped)
+        counters["scan_time_ms"].increment(int(summary.duration * 1000))
+
+        LOGGER.debug(
+            "Finished scanning %d/%d routers (%d failed, %d skipped) in %0.2fs",
+            summary.scanned,
+            summary.routers,
+            summary.failed,
+            summary.skipped,
+            summary.duration,
+        )
         await self._find_unknown_devices(neighbors=self.neighbors, routes=self.routes)
 
     async def _find_unknown_devices(
@@ -250,5 +622,5 @@ class Topology(zigpy.util.ListenableMixin):
         # Try to discover any unknown devices
         for nwk in unknown_nwks:
             LOGGER.debug("Found unknown device nwk=%s", nwk)
-            await self._app._discover_unknown_device(nwk)
-            await asyncio.sleep(random.uniform(*REQUEST_DELAY))
+            if await self._app._discover_unknown_device(nwk):
+                await asyncio.sleep(random.uniform(*REQUEST_DELAY))
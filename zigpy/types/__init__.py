@@ -7,10 +7,11 @@ from .struct import *  # noqa: F401,F403
 
 def deserialize(data, schema):
     result = []
+    offset = 0
     for type_ in schema:
-        value, data = type_.deserialize(data)
+        value, offset = deserialize_from(type_, data, offset)  # noqa: F405
         result.append(value)
-    return result, data
+    return result, data[offset:]
 
 
 def serialize(data, schema):
@@ -1,6 +1,7 @@
 from __future__ import annotations
 
 import enum
+import functools
 import inspect
 import struct
 import sys
@@ -12,6 +13,34 @@ CALLABLE_T = typing.TypeVar("CALLABLE_T", bound=typing.Callable)
 T = typing.TypeVar("T")
 
 
+@functools.lru_cache(maxsize=1024)
+def _implements_deserialize_from(cls: type) -> bool:
+    """Check that `deserialize` was not overridden after `deserialize_from`."""
+    for klass in cls.__mro__:
+        if "deserialize_from" in vars(klass):
+            return True
+
+        if "deserialize" in vars(klass):
+            return False
+
+    return False
+
+
+def deserialize_from(
+    cls: type[T], data: bytes | memoryview, offset: int = 0
+) -> tuple[T, int]:
+    """Deserialize an instance of `cls` from `data`, starting at `offset`.
+
+    Returns the deserialized value and the offset of the first unconsumed byte. Types
+    that only implement `deserialize` are passed the remainder of the buffer.
+    """
+    if _implements_deserialize_from(cls):
+        return cls.deserialize_from(data, offset)  # type:ignore[attr-defined]
+
+    value, rest = cls.deserialize(bytes(data[offset:]))  # type:ignore[attr-defined]
+    return value, len(data) - len(rest)
+
+
 class Bits(list):
     @classmethod
     def from_bitfields(cls, fields):
@@ -189,18 +218,25 @@ class FixedIntType(int):
         return self.to_bytes(self._bits // 8, self._byteorder, signed=self._signed)
 
     @classmethod
-    def deserialize(cls, data: bytes) -> tuple[FixedIntType, bytes]:
+    def deserialize_from(
+        cls, data: bytes | memoryview, offset: int = 0
+    ) -> tuple[FixedIntType, int]:
         if cls._bits % 8 != 0:
             raise TypeError(f"Integer type with {cls._bits} bits is not byte aligned")
 
         byte_size = cls._bits // 8
+        end = offset + byte_size
 
-        if len(data) < byte_size:
+        if len(data) < end:
             raise ValueError(f"Data is too short to contain {byte_size} bytes")
 
-        r = cls.from_bytes(data[:byte_size], cls._byteorder, signed=cls._signed)
-        data = data[byte_size:]
-        return r, data
+        r = cls.from_bytes(data[offset:end], cls._byteorder, signed=cls._signed)
+        return r, end
+
+    @classmethod
+    def deserialize(cls, data: bytes) -> tuple[FixedIntType, bytes]:
+        r, offset = cls.deserialize_from(data)
+        return r, data[offset:]
 
 
 class uint_t(FixedIntType, signed=False):
@@ -692,15 +728,24 @@ class BaseFloat(float):
         ).to_bytes(self._size, "little")
 
     @classmethod
-    def deserialize(cls, data: bytes) -> tuple[BaseFloat, bytes]:
-        if len(data) < cls._size:
+    def deserialize_from(
+        cls, data: bytes | memoryview, offset: int = 0
+    ) -> tuple[BaseFloat, int]:
+        end = offset + cls._size
+
+        if len(data) < end:
             raise ValueError(f"Data is too short to contain {cls._size} bytes")
 
         double_bytes = cls._convert_format(
-            src=cls, dst=Double, n=int.from_bytes(data[: cls._size], "little")
+            src=cls, dst=Double, n=int.from_bytes(data[offset:end], "little")
         ).to_bytes(Double._size, "little")
 
-        return cls(struct.unpack("<d", double_bytes)[0]), data[cls._size :]
+        return cls(struct.unpack("<d", double_bytes)[0]), end
+
+    @classmethod
+    def deserialize(cls, data: bytes) -> tuple[BaseFloat, bytes]:
+        r, offset = cls.deserialize_from(data)
+        return r, data[offset:]
 
 
 class Half(BaseFloat, exponent_bits=5, fraction_bits=10):
@@ -724,18 +769,24 @@ class LVBytes(bytes):
         return len(self).to_bytes(self._prefix_length, "little", signed=False) + self
 
     @classmethod
-    def deserialize(cls, data):
-        if len(data) < cls._prefix_length:
+    def deserialize_from(cls, data, offset=0):
+        start = offset + cls._prefix_length
+
+        if len(data) < start:
             raise ValueError("Data is too short")
 
-        num_bytes = int.from_bytes(data[: cls._prefix_length], "little")
+        num_bytes = int.from_bytes(data[offset:start], "little")
+        end = start + num_bytes
 
-        if len(data) < cls._prefix_length + num_bytes:
+        if len(data) < end:
             raise ValueError("Data is too short")
 
-        s = data[cls._prefix_length : cls._prefix_length + num_bytes]
+        return cls(data[start:end]), end
 
-        return cls(s), data[cls._prefix_length + num_bytes :]
+    @classmethod
+    def deserialize(cls, data):
+        r, offset = cls.deserialize_from(data)
+        return r, data[offset:]
 
 
 def LimitedLVBytes(max_len):  # noqa: N802
@@ -757,12 +808,12 @@ class LVBytesSize2(LVBytes):
         return super().serialize()
 
     @classmethod
-    def deserialize(cls, data):
-        d, r = super().deserialize(data)
+    def deserialize_from(cls, data, offset=0):
+        d, offset = super().deserialize_from(data, offset)
 
         if len(d) != 2:
             raise ValueError("LVBytes must be of size 2")
-        return d, r
+        return d, offset
 
 
 class LongOctetString(LVBytes):
@@ -866,15 +917,22 @@ class List(list, metaclass=KwargTypeMeta):
         return b"".join([self._item_type(i).serialize() for i in self])
 
     @classmethod
-    def deserialize(cls: type[T], data: bytes) -> tuple[T, bytes]:
+    def deserialize_from(
+        cls: type[T], data: bytes | memoryview, offset: int = 0
+    ) -> tuple[T, int]:
         assert cls._item_type is not None
 
         lst = cls()
-        while data:
-            item, data = cls._item_type.deserialize(data)
+        while offset < len(data):
+            item, offset = deserialize_from(cls._item_type, data, offset)
             lst.append(item)
 
-        return lst, data
+        return lst, offset
+
+    @classmethod
+    def deserialize(cls: type[T], data: bytes) -> tuple[T, bytes]:
+        lst, offset = cls.deserialize_from(data)
+        return lst, data[offset:]
 
 
 class LVList(list, metaclass=KwargTypeMeta):
@@ -890,17 +948,26 @@ class LVList(list, metaclass=KwargTypeMeta):
         )
 
     @classmethod
-    def deserialize(cls: type[T], data: bytes) -> tuple[T, bytes]:
+    def deserialize_from(
+        cls: type[T], data: bytes | memoryview, offset: int = 0
+    ) -> tuple[T, int]:
         assert cls._item_type is not None
-        length, data = cls._length_type.deserialize(data)
+        length, offset = deserialize_from(cls._length_type, data, offset)
         r = cls()
         for _i in range(length):
-            item, data = cls._item_type.deserialize(data)
+            item, offset = deserialize_from(cls._item_type, data, offset)
             r.append(item)
-        return r, data
+        return r, offset
+
+    @classmethod
+    def deserialize(cls: type[T], data: bytes) -> tuple[T, bytes]:
+        r, offset = cls.deserialize_from(data)
+        return r, data[offset:]
 
 
 class FixedList(list, metaclass=KwargTypeMeta):
+    __slots__ = ()
+
     _item_type = None
     _length = None
 
@@ -917,13 +984,20 @@ class FixedList(list, metaclass=KwargTypeMeta):
         return b"".join([self._item_type(i).serialize() for i in self])
 
     @classmethod
-    def deserialize(cls: type[T], data: bytes) -> tuple[T, bytes]:
+    def deserialize_from(
+        cls: type[T], data: bytes | memoryview, offset: int = 0
+    ) -> tuple[T, int]:
         assert cls._item_type is not None
         r = cls()
         for _i in range(cls._length):
-            item, data = cls._item_type.deserialize(data)
+            item, offset = deserialize_from(cls._item_type, data, offset)
             r.append(item)
-        return r, data
+        return r, offset
+
+    @classmethod
+    def deserialize(cls: type[T], data: bytes) -> tuple[T, bytes]:
+        r, offset = cls.deserialize_from(data)
+        return r, data[offset:]
 
 
 class CharacterString(str):
@@ -951,26 +1025,37 @@ class CharacterString(str):
         ) + self.encode("utf8")
 
     @classmethod
-    def deserialize(cls: type[T], data: bytes) -> tuple[T, bytes]:
-        if len(data) < cls._prefix_length:
+    def deserialize_from(
+        cls: type[T], data: bytes | memoryview, offset: int = 0
+    ) -> tuple[T, int]:
+        start = offset + cls._prefix_length
+
+        if len(data) < start:
             raise ValueError("Data is too short")
 
-        length = int.from_bytes(data[: cls._prefix_length], "little")
+        length = int.from_bytes(data[offset:start], "little")
 
         if length == cls._invalid_length:
-            return cls("", invalid=True), data[cls._prefix_length :]  # type:ignore[call-arg]
+            return cls("", invalid=True), start  # type:ignore[call-arg]
+
+        end = start + length
 
-        if len(data) < cls._prefix_length + length:
+        if len(data) < end:
             raise ValueError("Data is too short")
 
-        raw = data[cls._prefix_length : cls._prefix_length + length]
+        raw = bytes(data[start:end])
         text = raw.split(b"\x00")[0].decode("utf8", errors="replace")
 
         # FIXME: figure out how to get this working: `T` is not behaving as expected in
         # the classmethod when it is not bound.
         r = cls(text)  # type:ignore[call-arg]
         r.raw = raw
-        return r, data[cls._prefix_length + length :]
+        return r, end
+
+    @classmethod
+    def deserialize(cls: type[T], data: bytes) -> tuple[T, bytes]:
+        r, offset = cls.deserialize_from(data)
+        return r, data[offset:]
 
 
 class LongCharacterString(CharacterString):
@@ -3,6 +3,7 @@ from __future__ import annotations
 import dataclasses
 from datetime import datetime, timezone
 import enum
+import functools
 import typing
 
 import attrs
@@ -42,21 +43,102 @@ class BroadcastAddress(basic.enum16):
     RESERVED_FFF8 = 0xFFF8
 
 
+# Every possible byte, to avoid constructing new `uint8_t` objects for every EUI64
+_UINT8_VALUES = tuple(basic.uint8_t(i) for i in range(256))
+
+
+def _invalidates_cache(method: typing.Callable) -> typing.Callable:
+    """Wrap a `list` method that mutates the list to invalidate the EUI64 cache."""
+
+    @functools.wraps(method)
+    def wrapper(self: EUI64, *args: typing.Any, **kwargs: typing.Any) -> typing.Any:
+        self._packed = None
+        self._hash = None
+
+        return method(self, *args, **kwargs)
+
+    return wrapper
+
+
 class EUI64(basic.FixedList, item_type=basic.uint8_t, length=8):
     # EUI 64-bit ID (an IEEE address).
+
+    # EUI64 objects are used as dictionary keys throughout zigpy. The packed byte
+    # representation and the hash are cached and invalidated if the list is mutated.
+    __slots__ = ("_packed", "_hash")
+
+    def __init__(self, *args: typing.Any, **kwargs: typing.Any) -> None:
+        super().__init__(*args, **kwargs)
+        self._packed: bytes | None = None
+        self._hash: int | None = None
+
+    def _as_bytes(self) -> bytes:
+        if self._packed is None:
+            self._packed = bytes(self)
+
+        return self._packed
+
     def __repr__(self) -> str:
-        return ":".join(f"{i:02x}" for i in self[::-1])
+        try:
+            return self._as_bytes()[::-1].hex(":")
+        except (TypeError, ValueError):
+            # Invalid values are still representable
+            return ":".join(f"{i:02x}" for i in self[::-1])
+
+    def __reduce__(self) -> tuple[type[EUI64], tuple[list[int]]]:
+        # Hashes of bytes differ between processes, the cache must not be pickled
+        return type(self), (list(self),)
 
     def __hash__(self) -> int:  # type: ignore[override]
-        return hash(repr(self))
+        if self._hash is None:
+            try:
+                self._hash = hash(self._as_bytes())
+            except (TypeError, ValueError):
+                return hash(tuple(self))
+
+        return self._hash
+
+    __setitem__ = _invalidates_cache(list.__setitem__)
+    __delitem__ = _invalidates_cache(list.__delitem__)
+    __iadd__ = _invalidates_cache(list.__iadd__)
+    __imul__ = _invalidates_cache(list.__imul__)
+    append = _invalidates_cache(list.append)
+    extend = _invalidates_cache(list.extend)
+    insert = _invalidates_cache(list.insert)
+    pop = _invalidates_cache(list.pop)
+    remove = _invalidates_cache(list.remove)
+    clear = _invalidates_cache(list.clear)
+    sort = _invalidates_cache(list.sort)
+    reverse = _invalidates_cache(list.reverse)
+
+    def serialize(self) -> bytes:
+        if len(self) != self._length:
+            return super().serialize()  # Raises the appropriate error
+
+        return self._as_bytes()
+
+    @classmethod
+    def deserialize_from(
+        cls, data: bytes | memoryview, offset: int = 0
+    ) -> tuple[Self, int]:
+        end = offset + cls._length
+
+        if len(data) < end:
+            raise ValueError(f"Data is too short to contain {cls._length} bytes")
+
+        packed = bytes(data[offset:end])
+        r = cls(map(_UINT8_VALUES.__getitem__, packed))
+        r._packed = packed
+
+        return r, end
 
     @classmethod
     def convert(cls, ieee: str) -> EUI64:
         if ieee is None:
             return None
-        ieee = [basic.uint8_t(p) for p in _hex_string_to_bytes(ieee)[::-1]]
-        assert len(ieee) == cls._length
-        return cls(ieee)
+        packed = _hex_string_to_bytes(ieee)[::-1]
+        assert len(packed) == cls._length
+        return cls(map(_UINT8_VALUES.__getitem__, packed))
 
 
 EUI64.UNKNOWN = EUI64.convert("FF:FF:FF:FF:FF:FF:FF:FF")
@@ -1,7 +1,6 @@
 from __future__ import annotations
 
 import dataclasses
-import inspect
 import typing
 
 from typing_extensions import Self
@@ -55,6 +54,125 @@ class StructField:
             ) from e
 
 
+def _compile_bind_args(fields: list[StructField]) -> typing.Callable[..., tuple]:
+    """Build a function binding constructor arguments to a tuple of field values.
+
+    This behaves like `inspect.Signature.bind` for the signature
+    `(p1=None, p2=None, ...)` but is built once per struct, not on every call.
+    """
+    names = [f.name for f in fields]
+    indices = {name: index for index, name in enumerate(names)}
+    defaults = (None,) * len(names)
+
+    def bind_args(*args: typing.Any, **kwargs: typing.Any) -> tuple:
+        if len(args) > len(names):
+            raise TypeError(
+                f"Takes {len(names)} positional arguments but {len(args)} were given"
+            )
+
+        if not kwargs:
+            return args + defaults[len(args) :]
+
+        values = [*args, *defaults[len(args) :]]
+
+        for name, value in kwargs.items():
+            index = indices.get(name)
+
+            if index is None:
+                raise TypeError(f"Got an unexpected keyword argument {name!r}")
+
+            if index < len(args):
+                raise TypeError(f"Got multiple values for argument {name!r}")
+
+            values[index] = value
+
+        return tuple(values)
+
+    return bind_args
+
+
+def _pack_bitfields(values: typing.Sequence[t.FixedIntType]) -> bytes:
+    """Pack a byte-aligned segment of bitfields, the first one in the lowest bits."""
+    n = 0
+    size = 0
+
+    for value in values:
+        n |= (int(value) & ((1 << value._bits) - 1)) << size
+        size += value._bits
+
+    return n.to_bytes(size // 8, "big")
+
+
+def _unpack_bitfields(
+    types: typing.Sequence[type[t.FixedIntType]], data: bytes | memoryview
+) -> list[t.FixedIntType]:
+    """Unpack a byte-aligned segment of bitfields packed by `_pack_bitfields`."""
+    n = int.from_bytes(data, "big")
+    values = []
+
+    for field_type in types:
+        bits = field_type._bits
+        value = n & ((1 << bits) - 1)
+        n >>= bits
+
+        if field_type._signed and value >= 1 << (bits - 1):
+            value -= 1 << bits
+
+        values.append(field_type(value))
+
+    return values
+
+
+def _compile_layout(fields: list[StructField]) -> tuple | None:
+    """Resolve the byte layout of a struct whose fields are all unconditional.
+
+    The layout is a tuple of `(fields, types, size)` segments: `size` is the byte size
+    of a segment of bitfields, or `None` for a single regular field. Structs with
+    conditional, optional, or dynamically typed fields are laid out while being
+    (de)serialized instead.
+    """
+    segments = []
+    bitfields: list[StructField] = []
+    bit_length = 0
+
+    for field in fields:
+        if (
+            field.requires is not None
+            or field.optional
+            or field.dynamic_type is not None
+        ):
+            return None
+
+        if issubclass(field.type, t.FixedIntType) and not (
+            field.type._bits % 8 == 0 and bit_length % 8 == 0
+        ):
+            bit_length += field.type._bits
+            bitfields.append(field)
+
+            if bit_length % 8 == 0:
+                segments.append(
+                    (
+                        tuple(bitfields),
+                        tuple(f.type for f in bitfields),
+                        bit_length // 8,
+                    )
+                )
+                bitfields = []
+                bit_length = 0
+
+            continue
+        elif bitfields:
+            # Misaligned bitfields are reported when (de)serializing
+            return None
+
+        segments.append(((field,), (field.type,), None))
+
+    if bitfields:
+        return None
+
+    return tuple(segments)
+
+
 class Struct:
     @classmethod
     def _real_cls(cls) -> type:
@@ -67,6 +185,9 @@ class Struct:
 
         # We generate fields up here to fail early and cache it
         cls.fields = cls._real_cls()._get_fields()
+        cls._bind_args = staticmethod(_compile_bind_args(cls.fields))
+        cls._struct_cls = cls._real_cls()
+        cls._layout = _compile_layout(cls.fields)
 
         # Check to see if the Struct is also an integer
         cls._int_type = next(
@@ -81,7 +202,7 @@ class Struct:
         cls._frozen = False
 
     def __new__(cls: type[Self], *args, **kwargs) -> Self:
-        cls = cls._real_cls()  # noqa: PLW0642
+        cls = cls._struct_cls  # noqa: PLW0642
 
         if len(args) == 1 and isinstance(args[0], cls):
             # Like a copy constructor
@@ -94,28 +215,15 @@ class Struct:
             # Integer constructor
             return cls.deserialize(cls._int_type(args[0]).serialize())[0]
 
-        # Pretend our signature is `__new__(cls, p1: t1, p2: t2, ...)`
-        signature = inspect.Signature(
-            parameters=[
-                inspect.Parameter(
-                    name=f.name,
-                    kind=inspect.Parameter.POSITIONAL_OR_KEYWORD,
-                    default=None,
-                    annotation=f.type,
-                )
-                for f in cls.fields
-            ]
-        )
-
-        bound = signature.bind(*args, **kwargs)
-        bound.apply_defaults()
-
+        values = cls._bind_args(*args, **kwargs)
         instance = super().__new__(cls)
 
         # Set each attributes on the instance
-        for name, value in bound.arguments.items():
-            field = getattr(cls.fields, name)
-            setattr(instance, name, field._convert_type(value, struct=instance))
+        for field, value in zip(cls.fields, values):
+            if value is not None:
+                value = field._convert_type(value, struct=instance)
+
+            setattr(instance, field.name, value)
 
         return instance
 
@@ -227,6 +335,9 @@ class Struct:
         return tuple(self.as_dict(skip_missing=skip_missing).values())
 
     def serialize(self) -> bytes:
+        if self._layout is not None:
+            return self._serialize_layout()
+
         chunks = []
 
         bit_offset = 0
@@ -249,7 +360,7 @@ class Struct:
 
                 # Serialize the current segment of bitfields once we reach a boundary
                 if bit_offset % 8 == 0:
-                    chunks.append(t.Bits.from_bitfields(bitfields).serialize())
+                    chunks.append(_pack_bitfields(bitfields))
                     bitfields = []
 
                 continue
@@ -269,8 +380,61 @@ class Struct:
 
         return b"".join(chunks)
 
+    def _serialize_layout(self) -> bytes:
+        chunks = []
+
+        for fields, _, size in self._layout:
+            values = []
+
+            for field in fields:
+                value = getattr(self, field.name)
+
+                if value is None:
+                    raise ValueError(
+                        f"Value for field {field.name!r} is required: {self!r}"
+                    )
+
+                values.append(field._convert_type(value, struct=self))
+
+            if size is None:
+                chunks.append(values[0].serialize())
+            else:
+                chunks.append(_pack_bitfields(values))
+
+        return b"".join(chunks)
+
     @classmethod
-    def deserialize(cls: type[Self], data: bytes) -> tuple[Self, bytes]:
+    def _deserialize_layout(
+        cls: type[Self], data: bytes | memoryview, offset: int
+    ) -> tuple[Self, int]:
+        instance = cls()
+
+        for fields, types, size in cls._layout:
+            if size is None:
+                value, offset = t.deserialize_from(types[0], data, offset)
+                setattr(instance, fields[0].name, value)
+                continue
+
+            end = offset + size
+
+            if len(data) < end:
+                raise ValueError(f"Data is too short to contain {list(fields)}")
+
+            values = _unpack_bitfields(types, data[offset:end])
+            offset = end
+
+            for field, value in zip(fields, values):
+                setattr(instance, field.name, value)
+
+        return instance, offset
+
+    @classmethod
+    def deserialize_from(
+        cls: type[Self], data: bytes | memoryview, offset: int = 0
+    ) -> tuple[Self, int]:
+        if cls._layout is not None:
+            return cls._deserialize_layout(data, offset)
+
         instance = cls()
 
         bit_length = 0
@@ -280,7 +444,7 @@ class Struct:
             if (
                 field.requires is not None
                 and not field.requires(instance)
-                or not data
+                or offset >= len(data)
                 and field.optional
             ):
                 continue
@@ -294,18 +458,19 @@ class Struct:
                 bitfields.append(field)
 
                 if bit_length % 8 == 0:
-                    if len(data) < bit_length // 8:
+                    end = offset + bit_length // 8
+
+                    if len(data) < end:
                         raise ValueError(f"Data is too short to contain {bitfields}")
 
-                    bits, _ = t.Bits.deserialize(data[: bit_length // 8])
-                    data = data[bit_length // 8 :]
+                    values = _unpack_bitfields(
+                        [f.type for f in bitfields], data[offset:end]
+                    )
+                    offset = end
 
-                    for f in bitfields:
-                        value, bits = f.type.from_bits(bits)
+                    for f, value in zip(bitfields, values):
                         setattr(instance, f.name, value)
 
-                    assert not bits
-
                     bit_length = 0
                     bitfields = []
 
@@ -316,7 +481,7 @@ class Struct:
                     f" {bitfields}"
                 )
 
-            value, data = field_type.deserialize(data)
+            value, offset = t.deserialize_from(field_type, data, offset)
             setattr(instance, field.name, value)
 
         if bitfields:
@@ -325,7 +490,12 @@ class Struct:
                 f" {bitfields}"
             )
 
-        return instance, data
+        return instance, offset
+
+    @classmethod
+    def deserialize(cls: type[Self], data: bytes) -> tuple[Self, bytes]:
+        instance, offset = cls.deserialize_from(data)
+        return instance, data[offset:]
 
     def replace(self, **kwargs: dict[str, typing.Any]) -> Struct:
         d = self.as_dict().copy()
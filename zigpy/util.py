@@ -474,6 +474,53 @@ def filter_relays(relays: list[int]) -> list[int]:
     return filtered_relays
 
 
+def retrieve_exception(future: asyncio.Future) -> None:
+    """Mark the exception of a future as retrieved, for futures that may never be
+    awaited.
+    """
+    if not future.cancelled():
+        future.exception()
+
+
+class SharedRequest(typing.Generic[T]):
+    """Request sent by the first caller, whose result concurrent identical requests
+    can share.
+
+    The request runs in the task of the caller that sends it, so cancelling that caller
+    cancels the request. Callers that joined it then send the request themselves.
+    """
+
+    def __init__(self) -> None:
+        self._result: asyncio.Future[T] = asyncio.get_running_loop().create_future()
+        self._result.add_done_callback(retrieve_exception)
+
+    async def run(self, request: typing.Awaitable[T]) -> T:
+        """Send the request and share its outcome with callers that joined it."""
+        try:
+            result = await request
+        except asyncio.CancelledError:
+            self._result.cancel()
+            raise
+        except BaseException as exc:
+            self._result.set_exception(exc)
+            raise
+
+        self._result.set_result(result)
+        return result
+
+    async def join(self, fallback: typing.Callable[[], typing.Awaitable[T]]) -> T:
+        """Wait for the result of the request, or send it with `fallback` if the
+        caller that sent it was cancelled.
+        """
+        try:
+            return await asyncio.shield(self._result)
+        except asyncio.CancelledError:
+            if not self._result.cancelled():
+                raise
+
+        return await fallback()
+
+
 def combine_concurrent_calls(
     function: typing.Callable[
         ..., typing.Coroutine[typing.Any, typing.Any, typing.Any]
@@ -1,7 +1,9 @@
 from __future__ import annotations
 
+import asyncio
 import collections
 from collections.abc import Iterable, Sequence
+import dataclasses
 from datetime import datetime, timezone
 import enum
 import functools
@@ -19,12 +21,18 @@ from zigpy.zcl import foundation
 from zigpy.zcl.foundation import BaseAttributeDefs, BaseCommandDefs
 
 if TYPE_CHECKING:
-    from zigpy.appdb import PersistingListener
+    from zigpy.appdb import LazyAttributeCache, PersistingListener
     from zigpy.endpoint import Endpoint
 
 
 LOGGER = logging.getLogger(__name__)
 
+# ZCL payload that fits into an unfragmented, network-encrypted APS frame, even when
+# it is source routed
+READ_BATCH_MAX_PAYLOAD_SIZE = 64
+# Assumed size of attribute values without a fixed size, such as strings
+READ_BATCH_VARIABLE_VALUE_SIZE = 16
+
 
 def convert_list_schema(
     schema: Sequence[type], command_id: int, direction: foundation.Direction
@@ -55,6 +63,27 @@ class ClusterType(enum.IntEnum):
     Client = 1
 
 
+@dataclasses.dataclass(frozen=True)
+class _PendingRead:
+    """Attribute read that concurrent identical reads can join."""
+
+    attribute_ids: frozenset[int]
+    manufacturer: int | None
+    kwargs: dict[str, Any]
+    request: util.SharedRequest[dict[int, tuple[foundation.Status, Any]]]
+
+
+@dataclasses.dataclass
+class _ReadBatch:
+    """Attribute reads collected to be sent together."""
+
+    manufacturer: int | None
+    kwargs: dict[str, Any]
+    requests: list[list[int]] = dataclasses.field(default_factory=list)
+    waiters: int = 0
+    task: asyncio.Task[dict[int, tuple[foundation.Status, Any]]] | None = None
+
+
 class Cluster(util.ListenableMixin, util.CatchingTaskMixin):
     """A cluster on an endpoint"""
 
@@ -91,6 +120,13 @@ class Cluster(util.ListenableMixin, util.CatchingTaskMixin):
     # Internal caches and indices
     _registry: dict = {}
     _registry_range: dict = {}
+    _command_table: dict[
+        tuple[foundation.FrameType, foundation.Direction, int],
+        foundation.ZCLCommandDef,
+    ] = {}
+
+    # Set when the attribute cache is loaded from the database on first access
+    _attr_cache_loader: LazyAttributeCache | None = None
 
     def __init_subclass__(cls) -> None:
         if cls.cluster_id is not None:
@@ -200,6 +236,7 @@ class Cluster(util.ListenableMixin, util.CatchingTaskMixin):
             cls.ClientCommandDefs, cls.ServerCommandDefs
         )
         cls.commands_by_name = {cmd.name: cmd for cmd in all_cmds}
+        cls._command_table = cls._compile_command_table()
 
         if cls._skip_registry:
             return
@@ -219,6 +256,10 @@ class Cluster(util.ListenableMixin, util.CatchingTaskMixin):
         self._type: ClusterType = (
             ClusterType.Server if is_server else ClusterType.Client
         )
+        self._pending_reads: list[_PendingRead] = []
+        self._read_batches: list[_ReadBatch] = []
+        self._read_batching_unsupported: bool = False
+        self._read_batch_timed_out: bool = False
 
     @property
     def attridx(self):
@@ -260,39 +301,68 @@ class Cluster(util.ListenableMixin, util.CatchingTaskMixin):
         cluster.cluster_id = cluster_id
         return cluster
 
+    @classmethod
+    def _compile_command_table(
+        cls,
+    ) -> dict[
+        tuple[foundation.FrameType, foundation.Direction, int],
+        foundation.ZCLCommandDef,
+    ]:
+        """Index every command the cluster can receive by its header fields."""
+        table = {}
+
+        for direction in foundation.Direction:
+            for command in foundation.GENERAL_COMMANDS.values():
+                key = (foundation.FrameType.GLOBAL_COMMAND, direction, command.id)
+                table[key] = command
+
+        for direction, commands in [
+            (foundation.Direction.Client_to_Server, cls.server_commands),
+            (foundation.Direction.Server_to_Client, cls.client_commands),
+        ]:
+            for command in commands.values():
+                key = (foundation.FrameType.CLUSTER_COMMAND, direction, command.id)
+                table[key] = command
+
+        return table
+
     def deserialize(self, data: bytes) -> tuple[foundation.ZCLHeader, ...]:
         self.debug("Received ZCL frame: %r", data)
 
-        hdr, data = foundation.ZCLHeader.deserialize(data)
+        hdr, offset = t.deserialize_from(foundation.ZCLHeader, data)
+
+        return self._deserialize_payload(hdr, data, offset)
+
+    def _deserialize_payload(
+        self, hdr: foundation.ZCLHeader, data: bytes, offset: int
+    ) -> tuple[foundation.ZCLHeader, ...]:
+        """Deserialize the payload of a ZCL frame, starting at `offset`."""
         self.debug("Decoded ZCL frame header: %r", hdr)
 
         if hdr.frame_control.frame_type == foundation.FrameType.CLUSTER_COMMAND:
-            # Cluster command
-            if hdr.direction == foundation.Direction.Server_to_Client:
-                commands = self.client_commands
-            else:
-                commands = self.server_commands
+            frame_type = foundation.FrameType.CLUSTER_COMMAND
+        else:
+            frame_type = foundation.FrameType.GLOBAL_COMMAND
 
-            if hdr.command_id not in commands:
-                self.debug("Unknown cluster command %s %s", hdr.command_id, data)
-                return hdr, data
+        command = self._command_table.get((frame_type, hdr.direction, hdr.command_id))
 
-            command = commands[hdr.command_id]
-        else:
-            # General command
-            if hdr.command_id not in foundation.GENERAL_COMMANDS:
+        if command is None:
+            data = data[offset:]
+
+            if frame_type == foundation.FrameType.CLUSTER_COMMAND:
+                self.debug("Unknown cluster command %s %s", hdr.command_id, data)
+            else:
                 self.debug("Unknown foundation command %s %s", hdr.command_id, data)
-                return hdr, data
 
-            command = foundation.GENERAL_COMMANDS[hdr.command_id]
+            return hdr, data
 
         hdr.frame_control.direction = command.direction
-        response, data = command.schema.deserialize(data)
+        response, offset = t.deserialize_from(command.schema, data, offset)
 
         self.debug("Decoded ZCL frame: %s:%r", type(self).__name__, response)
 
-        if data:
-            self.debug("Data remains after deserializing ZCL frame: %r", data)
+        if offset < len(data):
+            self.debug("Data remains after deserializing ZCL frame: %r", data[offset:])
 
         return hdr, response
 
@@ -555,8 +625,15 @@ class Cluster(util.ListenableMixin, util.CatchingTaskMixin):
             attribute_ids.append(attrid)
             orig_attributes[attrid] = attribute
 
+        # Both cached and read values use the attribute cache
+        if self._attr_cache_loader is not None:
+            await self._attr_cache_loader.preload(self)
+
         to_read = []
         if allow_cache or only_cache:
+            if self._attr_cache_loader is not None:
+                self._attr_cache_loader.touch(self)
+
             for idx, attribute in enumerate(attribute_ids):
                 if attribute in self._attr_cache:
                     success[attributes[idx]] = self._attr_cache[attribute]
@@ -570,16 +647,221 @@ class Cluster(util.ListenableMixin, util.CatchingTaskMixin):
         if not to_read or only_cache:
             return success, failure
 
+        # Join identical reads that are already in flight and only read the rest
+        joined = []
+        missing = list(to_read)
+
+        for read in self._pending_reads:
+            if read.manufacturer != manufacturer or read.kwargs != kwargs:
+                continue
+
+            if any(attrid in read.attribute_ids for attrid in missing):
+                joined.append(read)
+                missing = [a for a in missing if a not in read.attribute_ids]
+
+        if joined:
+            self.debug("Joining in-flight reads of attributes %s", to_read)
+
+        results = {}
+
+        if missing:
+            batch_window = self._endpoint.device.read_batch_window
+
+            if batch_window is None or self._read_batching_unsupported:
+                request = self._read_attribute_results(missing, manufacturer, **kwargs)
+            elif self._read_batch_timed_out:
+                request = self._read_after_batch_timeout(missing, manufacturer, kwargs)
+            else:
+                request = self._read_batched(
+                    missing, batch_window, manufacturer, kwargs
+                )
+
+            # The read runs in this task, later identical reads can join it
+            read = _PendingRead(
+                attribute_ids=frozenset(missing),
+                manufacturer=manufacturer,
+                kwargs=kwargs,
+                request=util.SharedRequest(),
+            )
+            self._pending_reads.append(read)
+
+            try:
+                results.update(await read.request.run(request))
+            finally:
+                self._pending_reads.remove(read)
+
+        for read in joined:
+            results.update(
+                await read.request.join(
+                    functools.partial(
+                        self._read_attribute_results,
+                        [a for a in to_read if a in read.attribute_ids],
+                        manufacturer,
+                        **kwargs,
+                    )
+                )
+            )
+
+        for attrid in to_read:
+            if attrid not in results:
+                continue
+
+            status, value = results[attrid]
+
+            if status == foundation.Status.SUCCESS:
+                success[orig_attributes[attrid]] = value
+            else:
+                failure[orig_attributes[attrid]] = status
+
+        return success, failure
+
+    async def _read_batched(
+        self,
+        attribute_ids: list[int],
+        batch_window: float,
+        manufacturer: int | t.uint16_t | None,
+        kwargs: dict[str, Any],
+    ) -> dict[int, tuple[foundation.Status, Any]]:
+        """Read attributes together with other reads of this cluster that are made
+        within `batch_window` seconds.
+        """
+        for batch in self._read_batches:
+            # Batches that nobody waits for anymore are being cancelled
+            if (
+                batch.waiters
+                and batch.manufacturer == manufacturer
+                and batch.kwargs == kwargs
+            ):
+                break
+        else:
+            batch = _ReadBatch(manufacturer=manufacturer, kwargs=kwargs)
+            batch.task = asyncio.create_task(self._send_read_batch(batch, batch_window))
+            batch.task.add_done_callback(util.retrieve_exception)
+            self._read_batches.append(batch)
+
+        batch.requests.append(attribute_ids)
+        batch.waiters += 1
+
+        try:
+            return await asyncio.shield(batch.task)
+        except asyncio.CancelledError:
+            # The batch is only sent for as long as somebody is waiting for it
+            if batch.waiters == 1:
+                batch.task.cancel()
+
+            raise
+        finally:
+            batch.waiters -= 1
+
+    async def _read_after_batch_timeout(
+        self,
+        attribute_ids: list[int],
+        manufacturer: int | t.uint16_t | None,
+        kwargs: dict[str, Any],
+    ) -> dict[int, tuple[foundation.Status, Any]]:
+        """Read attributes exactly as they would have been without batching, after a
+        batched read timed out. Batching is only disabled if the device responds.
+        """
+        try:
+            results = await self._read_attribute_results(
+                attribute_ids, manufacturer, **kwargs
+            )
+        except asyncio.TimeoutError:
+            # The device is unreachable, batching is not to blame
+            self._read_batch_timed_out = False
+            raise
+
+        if self._read_batch_timed_out and not self._read_batching_unsupported:
+            self.debug("Separate attribute reads succeeded, no longer batching reads")
+            self._read_batching_unsupported = True
+
+        return results
+
+    async def _send_read_batch(
+        self, batch: _ReadBatch, batch_window: float
+    ) -> dict[int, tuple[foundation.Status, Any]]:
+        """Wait for reads to join the batch and then send them."""
+        try:
+            await asyncio.sleep(batch_window)
+        finally:
+            self._read_batches.remove(batch)
+
+        attribute_ids = list(dict.fromkeys(itertools.chain(*batch.requests)))
+
+        if len(batch.requests) == 1:
+            return await self._read_attribute_results(
+                attribute_ids, batch.manufacturer, **batch.kwargs
+            )
+
+        self.debug(
+            "Batching %d attribute reads into one: %s",
+            len(batch.requests),
+            attribute_ids,
+        )
+
+        results = {}
+
+        try:
+            for chunk in self._split_attribute_reads(attribute_ids):
+                results.update(
+                    await self._read_attribute_results(
+                        chunk, batch.manufacturer, **batch.kwargs
+                    )
+                )
+        except asyncio.TimeoutError:
+            # Some devices can't handle multiple attributes in the same read request,
+            # the next reads are sent separately to find out
+            self.debug("Batched attribute read timed out, reading separately")
+            self._read_batch_timed_out = True
+            raise
+
+        return results
+
+    def _split_attribute_reads(self, attribute_ids: list[int]) -> list[list[int]]:
+        """Split attributes into reads whose responses fit into a single APS frame."""
+        header_size = 5  # With a manufacturer code
+        chunks: list[list[int]] = [[]]
+        size = header_size
+
+        for attrid in attribute_ids:
+            attr_def = self.attributes.get(attrid)
+            value_size = (
+                None if attr_def is None else getattr(attr_def.type, "_size", None)
+            )
+
+            if value_size is None:
+                value_size = READ_BATCH_VARIABLE_VALUE_SIZE
+
+            # Attribute ID, status, data type, and the value
+            record_size = 2 + 1 + 1 + value_size
+
+            if chunks[-1] and size + record_size > READ_BATCH_MAX_PAYLOAD_SIZE:
+                chunks.append([])
+                size = header_size
+
+            chunks[-1].append(attrid)
+            size += record_size
+
+        return chunks
+
+    async def _read_attribute_results(
+        self,
+        attribute_ids: list[int],
+        manufacturer: int | t.uint16_t | None = None,
+        **kwargs,
+    ) -> dict[int, tuple[foundation.Status, Any]]:
+        """Read attributes, updating the attribute cache. Returns the status and the
+        value of every attribute included in the response.
+        """
+        results = {}
         result = await self.read_attributes_raw(
-            to_read, manufacturer=manufacturer, **kwargs
+            attribute_ids, manufacturer=manufacturer, **kwargs
         )
         if not isinstance(result[0], list):
-            for attrid in to_read:
-                orig_attribute = orig_attributes[attrid]
-                failure[orig_attribute] = result[0]  # Assume default response
+            for attrid in attribute_ids:
+                results[attrid] = (result[0], None)  # Assume default response
         else:
             for record in result[0]:
-                orig_attribute = orig_attributes[record.attrid]
                 if record.status == foundation.Status.SUCCESS:
                     try:
                         value = self.attributes[record.attrid].type(record.value.value)
@@ -594,14 +876,14 @@ class Cluster(util.ListenableMixin, util.CatchingTaskMixin):
                             exc_info=True,
                         )
                     self._update_attribute(record.attrid, value)
-                    success[orig_attribute] = value
+                    results[record.attrid] = (foundation.Status.SUCCESS, value)
                     self.remove_unsupported_attribute(record.attrid)
                 else:
                     if record.status == foundation.Status.UNSUPPORTED_ATTRIBUTE:
                         self.add_unsupported_attribute(record.attrid)
-                    failure[orig_attribute] = record.status
+                    results[record.attrid] = (record.status, None)
 
-        return success, failure
+        return results
 
     def _write_attr_records(
         self, attributes: dict[str | int, Any]
@@ -864,6 +1146,9 @@ class Cluster(util.ListenableMixin, util.CatchingTaskMixin):
             self.listener_event("attribute_updated", attrid, value, now)
 
     def log(self, lvl: int, msg: str, *args, **kwargs) -> None:
+        if not LOGGER.isEnabledFor(lvl):
+            return
+
         msg = "[%s:%s:0x%04x] " + msg
         args = (
             self._endpoint.device.name,
@@ -871,9 +1156,17 @@ class Cluster(util.ListenableMixin, util.CatchingTaskMixin):
             self.cluster_id,
             *args,
         )
-        return LOGGER.log(lvl, msg, *args, **kwargs)
+        LOGGER.log(lvl, msg, *args, **kwargs)
 
     def __getattr__(self, name: str) -> functools.partial:
+        # Attribute caches can be filled in from the database after first access
+        if (
+            name in ("_attr_cache", "_attr_last_updated")
+            and self._attr_cache_loader is not None
+        ):
+            self._attr_cache_loader.load(self)
+            return self.__dict__[name]
+
         try:
             cmd = getattr(self.ClientCommandDefs, name)
         except AttributeError:
@@ -1030,6 +1323,10 @@ class Cluster(util.ListenableMixin, util.CatchingTaskMixin):
                 self.remove_unsupported_attribute(attrdef.id, inhibit_events)
 
 
+# Subclasses compile their own tables in `__init_subclass__`
+Cluster._command_table = Cluster._compile_command_table()
+
+
 class ClusterPersistingListener:
     def __init__(self, applistener: PersistingListener, cluster: Cluster) -> None:
         self._applistener = applistener
@@ -109,12 +109,19 @@ class TypeValue:
         return self.type.to_bytes(1, "little") + self.value.serialize()
 
     @classmethod
-    def deserialize(cls, data: bytes) -> tuple[TypeValue, bytes]:
-        data_type, data = t.uint8_t.deserialize(data)
+    def deserialize_from(
+        cls, data: bytes | memoryview, offset: int = 0
+    ) -> tuple[TypeValue, int]:
+        data_type, offset = t.uint8_t.deserialize_from(data, offset)
         python_type = DataType.from_type_id(data_type).python_type
-        value, data = python_type.deserialize(data)
+        value, offset = t.deserialize_from(python_type, data, offset)
 
-        return cls(type=data_type, value=value), data
+        return cls(type=data_type, value=value), offset
+
+    @classmethod
+    def deserialize(cls, data: bytes) -> tuple[TypeValue, bytes]:
+        r, offset = cls.deserialize_from(data)
+        return r, data[offset:]
 
     def __repr__(self) -> str:
         return (
@@ -126,12 +133,14 @@ class TypeValue:
 
 class TypedCollection(TypeValue):
     @classmethod
-    def deserialize(cls, data):
-        data_type, data = t.uint8_t.deserialize(data)
+    def deserialize_from(cls, data, offset=0):
+        data_type, offset = t.uint8_t.deserialize_from(data, offset)
         python_type = DataType.from_type_id(data_type).python_type
-        values, data = t.LVList[python_type, t.uint16_t].deserialize(data)
+        values, offset = t.LVList[python_type, t.uint16_t].deserialize_from(
+            data, offset
+        )
 
-        return cls(type=data_type, value=values), data
+        return cls(type=data_type, value=values), offset
 
 
 class Array(TypedCollection):
@@ -665,23 +674,30 @@ class ReadAttributeRecord:
         self.value = value
 
     @classmethod
-    def deserialize(cls, data: bytes) -> tuple[Self, bytes]:
-        attrid, data = t.uint16_t.deserialize(data)
-        status, data = Status.deserialize(data)
+    def deserialize_from(
+        cls, data: bytes | memoryview, offset: int = 0
+    ) -> tuple[Self, int]:
+        attrid, offset = t.uint16_t.deserialize_from(data, offset)
+        status, offset = Status.deserialize_from(data, offset)
         value = None
 
         if status == Status.SUCCESS:
-            type_id, data = DataTypeId.deserialize(data)
+            type_id = DataTypeId(data[offset]) if offset < len(data) else None
 
             # Arrays, Sets, and Bags are treated differently
             if type_id in (DataTypeId.array, DataTypeId.set, DataTypeId.bag):
-                value, data = DataType.from_type_id(type_id).python_type.deserialize(
-                    data
+                value, offset = t.deserialize_from(
+                    DataType.from_type_id(type_id).python_type, data, offset + 1
                 )
             else:
-                value, data = TypeValue.deserialize(type_id.serialize() + data)
+                value, offset = TypeValue.deserialize_from(data, offset)
+
+        return cls(attrid=attrid, status=status, value=value), offset
 
-        return cls(attrid=attrid, status=status, value=value), data
+    @classmethod
+    def deserialize(cls, data: bytes) -> tuple[Self, bytes]:
+        r, offset = cls.deserialize_from(data)
+        return r, data[offset:]
 
     def serialize(self) -> bytes:
         data = self.attrid.serialize()
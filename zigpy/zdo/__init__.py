@@ -1,6 +1,6 @@
 from __future__ import annotations
 
-from collections.abc import Coroutine
+from collections.abc import Callable, Coroutine
 import functools
 import logging
 
@@ -16,6 +16,18 @@ LOGGER = logging.getLogger(__name__)
 
 ZDO_ENDPOINT = 0
 
+# Requests for descriptors are idempotent, concurrent identical ones share a response
+COALESCED_REQUESTS = frozenset(
+    {
+        types.ZDOCmd.Node_Desc_req,
+        types.ZDOCmd.Power_Desc_req,
+        types.ZDOCmd.Simple_Desc_req,
+        types.ZDOCmd.Active_EP_req,
+        types.ZDOCmd.Complex_Desc_req,
+        types.ZDOCmd.User_Desc_req,
+    }
+)
+
 
 class ZDO(zigpy.util.CatchingTaskMixin, zigpy.util.ListenableMixin):
     """The ZDO endpoint of a device"""
@@ -30,6 +42,7 @@ class ZDO(zigpy.util.CatchingTaskMixin, zigpy.util.ListenableMixin):
     def __init__(self, device):
         self._device = device
         self._listeners = {}
+        self._pending_requests: dict[tuple, zigpy.util.SharedRequest] = {}
 
     def _serialize(self, command, *args, **kwargs):
         keys, schema = types.CLUSTERS[command]
@@ -63,20 +76,44 @@ class ZDO(zigpy.util.CatchingTaskMixin, zigpy.util.ListenableMixin):
         **kwargs,
     ):
         data = self._serialize(command, *args, **kwargs)
-        tsn = self.device.get_sequence()
-        return self._device.request(
-            profile=0x0000,
-            cluster=command,
-            src_ep=ZDO_ENDPOINT,
-            dst_ep=ZDO_ENDPOINT,
-            sequence=tsn,
-            data=t.uint8_t(tsn).serialize() + data,
-            timeout=timeout,
-            expect_reply=expect_reply,
-            use_ieee=use_ieee,
-            ask_for_ack=ask_for_ack,
-            priority=priority,
-        )
+
+        def send_request() -> Coroutine:
+            tsn = self.device.get_sequence()
+            return self._device.request(
+                profile=0x0000,
+                cluster=command,
+                src_ep=ZDO_ENDPOINT,
+                dst_ep=ZDO_ENDPOINT,
+                sequence=tsn,
+                data=t.uint8_t(tsn).serialize() + data,
+                timeout=timeout,
+                expect_reply=expect_reply,
+                use_ieee=use_ieee,
+                ask_for_ack=ask_for_ack,
+                priority=priority,
+            )
+
+        if expect_reply and command in COALESCED_REQUESTS:
+            return self._join_request((command, data, use_ieee), send_request)
+
+        return send_request()
+
+    async def _join_request(
+        self, key: tuple, send_request: Callable[[], Coroutine]
+    ) -> list:
+        """Join an identical request that is in flight, or send a new one."""
+        request = self._pending_requests.get(key)
+
+        if request is not None:
+            self.debug("Joining in-flight request %s", key[0])
+            return await request.join(send_request)
+
+        request = self._pending_requests[key] = zigpy.util.SharedRequest()
+
+        try:
+            return await request.run(send_request())
+        finally:
+            del self._pending_requests[key]
 
     def reply(
         self,